@@ -0,0 +1,108 @@
+"""Shared plumbing for the hook benchmarks: measured runs, result tables and baselines.
+
+A result set is {"scenarios": {name: {"seconds", "peak_rss_mb", ...}}}
+plus the interpreter and platform it was measured on. --save writes it as
+JSON; --compare loads one and reports each scenario's time ratio against it.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+
+# A scenario this much slower than its baseline counts as a regression
+DEFAULT_MAX_RATIO = 1.25
+
+
+def measure(command: list, env: dict, cwd: "str | None" = None, stdin: str = "") -> dict:
+    """Run command once → {"seconds", "peak_rss_mb", "exit"}; peak RSS is the child's own (wait4)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env, cwd=cwd
+    )
+    proc.stdin.write(stdin.encode())
+    proc.stdin.close()
+    _, status, usage = os.wait4(proc.pid, 0)
+    seconds = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return {"seconds": seconds, "peak_rss_mb": rss_mb, "exit": proc.returncode}
+
+
+def summarize(runs: list) -> dict:
+    """Median time and worst peak RSS over repeated runs of one scenario."""
+    return {
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+        "runs": len(runs),
+    }
+
+
+def result_set(scenarios: dict) -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scenarios": scenarios,
+    }
+
+
+def format_table(scenarios: dict, columns: list) -> str:
+    """One row per scenario; columns are (key, header, format spec) for values in each scenario."""
+    width = max([len("scenario"), *(len(name) for name in scenarios)]) + 2
+    lines = [f"{'scenario':<{width}}" + "".join(f"{header:>14}" for _, header, _ in columns)]
+    for name, values in scenarios.items():
+        cells = [format(values[key], spec) if key in values else "-" for key, _, spec in columns]
+        lines.append(f"{name:<{width}}" + "".join(f"{cell:>14}" for cell in cells))
+    return "\n".join(lines)
+
+
+def save(path: Path, results: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
+
+
+def compare(results: dict, baseline: dict, max_ratio: float = DEFAULT_MAX_RATIO) -> "tuple[str, list]":
+    """Time ratio per scenario present in both → (report, names of scenarios over max_ratio)."""
+    lines = [f"baseline: python {baseline.get('python')} on {baseline.get('platform')}, {baseline.get('created')}"]
+    regressions = []
+    for name, values in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before or not before["seconds"]:
+            lines.append(f"  {name}: no baseline")
+            continue
+        ratio = values["seconds"] / before["seconds"]
+        flag = ""
+        if ratio > max_ratio:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(f"  {name}: {before['seconds'] * 1000:.1f} ms → {values['seconds'] * 1000:.1f} ms ({ratio:.2f}x){flag}")
+    return "\n".join(lines), regressions
+
+
+def add_baseline_arguments(parser) -> None:
+    parser.add_argument("--save", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="compare against a JSON file written by --save")
+    parser.add_argument(
+        "--max-ratio", type=float, default=DEFAULT_MAX_RATIO,
+        help=f"exit 1 if a scenario is this much slower than --compare's (default {DEFAULT_MAX_RATIO})",
+    )
+
+
+def finish(args, results: dict) -> None:
+    """Apply --save / --compare; exits 1 on a regression."""
+    if args.save:
+        save(args.save, results)
+        print(f"saved {args.save}")
+    if args.compare:
+        report, regressions = compare(results, json.loads(args.compare.read_text()), args.max_ratio)
+        print(report)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the learn hooks over synthetic transcripts.
+
+Usage: python3 bench_learn_hooks.py [--sizes 1000,10000,100000] [--repeat 3]
+                                    [--density 0.01] [--save FILE] [--compare FILE]
+
+For each transcript size, one scenario per flow runs stop_learn_reflect.py
+cold (no checkpoint, empty seen store) on a transcript whose trigger lines
+all belong to that flow: scan (no triggers — the scan and checkpoint only),
+f1 (corrections), fv (voluntary captures), f2 (self-discovered learnings).
+mark_voluntary_seen.py runs on the fv transcript. Each scenario reports the
+median wall time, lines/s, MB/s, the worst peak RSS and — for the Stop
+hook — the time its telemetry record attributes to transcript/state I/O.
+
+Transcripts are generated by transcripts.py into a temporary directory and
+deleted after their scenario; a 1,000,000-line transcript is about 1 GB.
+The hooks run as fresh interpreters with HOME in that directory and no
+hook daemon. --save / --compare keep baselines (see _bench.py).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from _bench import PLUGIN_ROOT, add_baseline_arguments, finish, format_table, measure, result_set, summarize
+from transcripts import write_transcript
+
+HOOKS_DIR = PLUGIN_ROOT / "skills" / "learn" / "hooks"
+
+# scenario → (hook script, transcript flow)
+SCENARIOS = {
+    "stop_learn_reflect/scan": ("stop_learn_reflect.py", None),
+    "stop_learn_reflect/f1": ("stop_learn_reflect.py", "f1"),
+    "stop_learn_reflect/fv": ("stop_learn_reflect.py", "fv"),
+    "stop_learn_reflect/f2": ("stop_learn_reflect.py", "f2"),
+    "mark_voluntary_seen/fv": ("mark_voluntary_seen.py", "fv"),
+}
+
+COLUMNS = [
+    ("lines", "lines", "d"),
+    ("mb", "MB", ".1f"),
+    ("ms", "median ms", ".1f"),
+    ("lines_per_s", "lines/s", ",.0f"),
+    ("mb_per_s", "MB/s", ".1f"),
+    ("peak_rss_mb", "peak RSS MB", ".1f"),
+    ("io_ms", "io ms", ".1f"),
+]
+
+
+def _reset_state(home: Path) -> None:
+    """Empty the learn state so every run is a cold scan; keep compaction from running."""
+    rules_dir = home / ".claude" / "rules"
+    shutil.rmtree(rules_dir, ignore_errors=True)
+    rules_dir.mkdir(parents=True)
+    (rules_dir / ".last-session-compaction").touch()
+
+
+def _io_ms(home: Path) -> "float | None":
+    """io phase of the hook's last timing record (see hooks/scripts/_telemetry.py)."""
+    timings = home / ".claude" / "vorbit-hooks" / "timings.jsonl"
+    try:
+        return json.loads(timings.read_text().splitlines()[-1])["phases"].get("io")
+    except (OSError, IndexError, ValueError, KeyError):
+        return None
+
+
+def run_scenario(work: Path, name: str, lines: int, density: float, repeat: int) -> dict:
+    script, flow = SCENARIOS[name]
+    home = work / "home"
+    project = (work / "project").resolve()
+    project.mkdir(parents=True, exist_ok=True)
+    sessions_dir = home / ".claude" / "projects" / str(project).replace("/", "-")
+    transcript = write_transcript(sessions_dir / f"bench-{flow or 'scan'}-{lines}.jsonl", lines, flow, density)
+    env = {
+        "PATH": os.environ.get("PATH", ""),
+        "HOME": str(home),
+        "CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT),
+        "CLAUDE_PROJECT_DIR": str(project),
+        "VORBIT_HOOK_SOCKET": str(work / "no-daemon.sock"),
+    }
+    payload = json.dumps({"transcript_path": str(transcript), "cwd": str(project)})
+
+    runs, io_times = [], []
+    try:
+        for _ in range(repeat):
+            _reset_state(home)
+            runs.append(measure([sys.executable, str(HOOKS_DIR / script)], env, cwd=str(project), stdin=payload))
+            io_ms = _io_ms(home)
+            if io_ms is not None:
+                io_times.append(io_ms)
+        size_mb = transcript.stat().st_size / 1e6
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+    summary = summarize(runs)
+    summary.update({
+        "lines": lines,
+        "mb": size_mb,
+        "ms": summary["seconds"] * 1000,
+        "lines_per_s": lines / summary["seconds"],
+        "mb_per_s": size_mb / summary["seconds"],
+    })
+    if io_times:
+        summary["io_ms"] = sorted(io_times)[len(io_times) // 2]
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated transcript line counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--density", type=float, default=0.01, help="fraction of lines that are flow triggers")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these")
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    scenarios = {}
+    with tempfile.TemporaryDirectory(prefix="vorbit-bench-") as work:
+        for lines in (int(size) for size in args.sizes.split(",")):
+            for name in args.scenario or SCENARIOS:
+                scenarios[f"{name}/{lines}"] = run_scenario(Path(work), name, lines, args.density, args.repeat)
+                print(f"{name}/{lines}: {scenarios[f'{name}/{lines}']['ms']:.1f} ms", file=sys.stderr)
+
+    print(format_table(scenarios, COLUMNS))
+    finish(args, result_set(scenarios))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Per-event overhead benchmark for the PreToolUse / PostToolUse hooks.
+
+Usage: python3 bench_tool_hooks.py [--repeat 10] [--scenario NAME ...]
+                                   [--save FILE] [--compare FILE]
+
+Replays representative TOOL_INPUT payloads against pre_push_warning.py,
+post_edit_format.py and post_edit_validate.py. The edit payloads target
+fixture projects, one per toolchain the hooks detect: biome, prettier,
+tsconfig, mypy, go.mod and none. Every external tool is a /bin/sh stub
+that answers like the real one (prettier/biome/tsc in the fixture's
+node_modules/.bin, mypy/dmypy/pyright/go on a PATH holding nothing else),
+so results are reproducible offline and measure the hooks, not the tools.
+
+Each scenario warms up once (the toolchain profile is detected and
+stored, as after a project's first edit), then rewrites the edited file
+before every run so no result cache replays. Reported per scenario:
+  total    - median wall time of a fresh interpreter running the hook
+  startup  - median `python -c pass` (the floor every hook pays)
+  import   - import time beyond a bare interpreter (best -X importtime run)
+  root, detect, syntax, subprocess, io - the hook's telemetry phases (median)
+Runs that exit on the hook's pre-check record no phases ("-"). Modules a
+phase imports lazily count towards both import and that phase.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from _bench import PLUGIN_ROOT, add_baseline_arguments, finish, format_table, measure, result_set, summarize
+
+SCRIPTS_DIR = PLUGIN_ROOT / "hooks" / "scripts"
+
+STUB_OK = "#!/bin/sh\nexit 0\n"
+STUBS = {
+    "mypy": '#!/bin/sh\necho "Success: no issues found in 1 source file"\n',
+    "dmypy": '#!/bin/sh\necho "Success: no issues found in 1 source file"\n',
+    "pyright": '#!/bin/sh\necho "0 errors, 0 warnings, 0 informations"\n',
+    # `go list` reports one dependency-free package in the current directory
+    "go": "#!/bin/sh\n[ \"$1\" = list ] && printf 'bench/app\\t%s\\t\\n' \"$PWD\"\nexit 0\n",
+}
+
+# fixture → (files, stubs in its node_modules/.bin)
+FIXTURES = {
+    "biome": ({"biome.json": "{}\n", "src/app.ts": ""}, ("biome",)),
+    "prettier": ({".prettierrc": "{}\n", "package.json": "{}\n", "src/app.ts": ""}, ("prettier",)),
+    "tsconfig": ({"tsconfig.json": "{}\n", "package.json": "{}\n", "src/app.ts": ""}, ("tsc",)),
+    "mypy": ({"pyproject.toml": "[tool.mypy]\n", "app.py": ""}, ()),
+    "go.mod": ({"go.mod": "module bench/app\n\ngo 1.21\n", "main.go": ""}, ()),
+    "none": ({"app.py": "", "notes.txt": "", "README.md": ""}, ()),
+}
+
+# scenario → (hook, fixture or None, edited file or Bash tool input)
+SCENARIOS = {
+    "pre_push_warning/other-command": ("pre_push_warning", None, {"command": "ls -la"}),
+    "pre_push_warning/git-status": ("pre_push_warning", None, {"command": "git status"}),
+    "pre_push_warning/git-push": ("pre_push_warning", None, {"command": "git push origin main"}),
+    "post_edit_format/biome": ("post_edit_format", "biome", "src/app.ts"),
+    "post_edit_format/prettier": ("post_edit_format", "prettier", "src/app.ts"),
+    "post_edit_format/none": ("post_edit_format", "none", "notes.txt"),
+    "post_edit_validate/tsconfig": ("post_edit_validate", "tsconfig", "src/app.ts"),
+    "post_edit_validate/mypy": ("post_edit_validate", "mypy", "app.py"),
+    "post_edit_validate/go.mod": ("post_edit_validate", "go.mod", "main.go"),
+    "post_edit_validate/none": ("post_edit_validate", "none", "app.py"),
+    "post_edit_validate/unvalidated": ("post_edit_validate", "none", "README.md"),
+}
+
+PHASES = ("root", "detect", "syntax", "subprocess", "io")
+
+# -X importtime runs per scenario; the fastest is reported
+IMPORT_RUNS = 3
+
+COLUMNS = [
+    ("total_ms", "total ms", ".1f"),
+    ("startup_ms", "startup ms", ".1f"),
+    ("import_ms", "import ms", ".1f"),
+    *((f"{phase}_ms", f"{phase} ms", ".2f") for phase in PHASES),
+    ("peak_rss_mb", "peak RSS MB", ".1f"),
+]
+
+
+def _write_stub(path: Path, body: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body)
+    path.chmod(0o755)
+
+
+def make_fixtures(work: Path) -> dict:
+    """Create the fixture projects and the stub PATH directory → {fixture: project dir, "PATH": stub dir}."""
+    stub_bin = work / "bin"
+    for name, body in STUBS.items():
+        _write_stub(stub_bin / name, body)
+    dirs = {"PATH": stub_bin}
+    for fixture, (files, local_stubs) in FIXTURES.items():
+        project = work / "projects" / fixture
+        for relative, content in files.items():
+            (project / relative).parent.mkdir(parents=True, exist_ok=True)
+            (project / relative).write_text(content)
+        for name in local_stubs:
+            _write_stub(project / "node_modules" / ".bin" / name, STUB_OK)
+        dirs[fixture] = project
+    return dirs
+
+
+def import_us(stderr: str) -> int:
+    """Total top-level cumulative import time (µs) from -X importtime output."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith(" ") and not name.startswith("  ") and cumulative.strip().isdigit():
+            total += int(cumulative)
+    return total
+
+
+def _importtime(command: list, env: dict, cwd: "str | None") -> int:
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]], env=env, cwd=cwd, capture_output=True, text=True, input=""
+    )
+    return import_us(result.stderr)
+
+
+def _last_phases(home: Path) -> "dict | None":
+    timings = home / ".claude" / "vorbit-hooks" / "timings.jsonl"
+    try:
+        return json.loads(timings.read_text().splitlines()[-1])["phases"]
+    except (OSError, IndexError, ValueError, KeyError):
+        return None
+
+
+def run_scenario(work: Path, dirs: dict, name: str, repeat: int, startup: dict) -> dict:
+    hook, fixture, target = SCENARIOS[name]
+    home = work / "home" / name.replace("/", "-")
+    env = {
+        "PATH": str(dirs["PATH"]),
+        "HOME": str(home),
+        "VORBIT_HOOK_SOCKET": str(work / "no-daemon.sock"),
+    }
+    cwd = None
+    if fixture is None:
+        env["TOOL_INPUT"] = json.dumps(target)
+    else:
+        project = dirs[fixture]
+        edited = project / target
+        env["CLAUDE_PROJECT_DIR"] = str(project)
+        env["TOOL_INPUT"] = json.dumps({"file_path": str(edited)})
+        cwd = str(project)
+    command = [sys.executable, str(SCRIPTS_DIR / f"{hook}.py")]
+
+    def edit(i):
+        """New content for every run, so the format/validate caches never replay."""
+        if fixture is not None:
+            edited.write_text(f"// edit {i}\n" if edited.suffix in (".ts", ".go") else f"# edit {i}\n")
+
+    runs, phases = [], {phase: [] for phase in PHASES}
+    for i in range(repeat + 1):
+        edit(i)
+        (home / ".claude" / "vorbit-hooks" / "timings.jsonl").unlink(missing_ok=True)
+        run = measure(command, env, cwd=cwd)
+        if i == 0:
+            continue  # warm-up: first detection of the fixture's toolchain
+        runs.append(run)
+        recorded = _last_phases(home) or {}
+        for phase in PHASES:
+            if phase in recorded:
+                phases[phase].append(recorded[phase])
+
+    import_times = []
+    for i in range(IMPORT_RUNS):
+        edit(repeat + 1 + i)
+        import_times.append(_importtime(command, env, cwd))
+    summary = summarize(runs)
+    summary.update({
+        "total_ms": summary["seconds"] * 1000,
+        "startup_ms": startup["ms"],
+        "import_ms": max(0, min(import_times) - startup["import_us"]) / 1000,
+        "exit": runs[-1]["exit"],
+    })
+    for phase, values in phases.items():
+        if values:
+            summary[f"{phase}_ms"] = statistics.median(values)
+    return summary
+
+
+def interpreter_startup(repeat: int) -> dict:
+    """Bare interpreter cost: median wall time and the imports every process pays."""
+    env = {"PATH": os.environ.get("PATH", "")}
+    runs = [measure([sys.executable, "-c", "pass"], env) for _ in range(repeat)]
+    return {
+        "ms": statistics.median(r["seconds"] for r in runs) * 1000,
+        "import_us": min(_importtime([sys.executable, "-c", "pass"], env, None) for _ in range(IMPORT_RUNS)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these")
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    startup = interpreter_startup(args.repeat)
+    scenarios = {}
+    with tempfile.TemporaryDirectory(prefix="vorbit-bench-") as work:
+        dirs = make_fixtures(Path(work))
+        for name in args.scenario or SCENARIOS:
+            scenarios[name] = run_scenario(Path(work), dirs, name, args.repeat, startup)
+
+    print(format_table(scenarios, COLUMNS))
+    finish(args, result_set(scenarios))
+
+
+if __name__ == "__main__":
+    main()
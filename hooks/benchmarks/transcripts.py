@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Synthetic Claude Code transcripts for benchmarking the learn hooks.
+
+Lines follow the real transcript shapes: user prompts (string content),
+assistant replies (text blocks, some with a tool_use block), and tool
+results (user entries with a tool_result block). Every LARGE_EVERY-th tool
+result carries a LARGE_BYTES payload (a file dump), the rest 200 B-4 KB.
+
+density controls the trigger lines exactly: floor(lines * density) lines,
+evenly spaced, are user prompts carrying a keyword of the given flow (f1
+correction, fv voluntary) or, for f2, assistant replies carrying the
+learning fields. Keywords and field names come from the rules file, so
+the transcript matches whatever the hooks are configured with. All other
+text is free of keywords; output depends only on the arguments.
+
+Usage: python3 transcripts.py OUT --lines N [--flow f1|fv|f2] [--density 0.01] [--seed 0]
+"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+RULES_SOURCE = PLUGIN_ROOT / "skills" / "learn" / "vorbit-learning-rules.md"
+
+sys.path.insert(0, str(PLUGIN_ROOT / "skills" / "learn" / "hooks"))
+
+from _learn_utils import read_comment  # noqa: E402
+
+FLOW_COMMENTS = {"f1": "correction-keywords", "fv": "voluntary-keywords"}
+
+LARGE_EVERY = 50
+LARGE_BYTES = 64 * 1024
+
+PROMPTS = [
+    "Add a retry with backoff to the upload client.",
+    "Can you split this module into smaller files?",
+    "Run the tests and show me the failures.",
+    "Rename the config loader and update the callers.",
+    "Why does the build take so long on CI?",
+    "Looks good, ship it.",
+    "Use the existing helper instead of a new one.",
+    "Add type hints to the public functions.",
+]
+REPLIES = [
+    "I'll read the module first to see how it is structured.",
+    "The failing test expects the old return type; updating it now.",
+    "Done. The loader is renamed and all four callers are updated.",
+    "The slow step is dependency installation; caching it should help.",
+    "I'll add the retry around the request and keep the timeout as is.",
+]
+TOOLS = [
+    ("Read", "file_path", "/work/app/src/client.py"),
+    ("Bash", "command", "python -m pytest -q"),
+    ("Edit", "file_path", "/work/app/src/config.py"),
+    ("Grep", "pattern", "def load_config"),
+]
+
+# Filler for tool results: code-like text with no keyword in it
+_CODE = (
+    "def handle(request, timeout=30):\n"
+    "    response = client.send(request, timeout=timeout)\n"
+    "    if response.status >= 500:\n"
+    "        raise ServerError(response.status)\n"
+    "    return response.json()\n\n"
+)
+CORPUS = _CODE * (LARGE_BYTES // len(_CODE) + 2)
+
+
+def _keywords(rules_text: str, flow: str) -> list:
+    return [p.strip() for p in read_comment(rules_text, FLOW_COMMENTS[flow]).split(",") if p.strip()]
+
+
+def _entry(kind: str, content, session_id: str, index: int, **extra) -> str:
+    return json.dumps({
+        "type": kind,
+        "message": {"role": kind, "content": content},
+        "uuid": f"{session_id}-{index}",
+        "parentUuid": f"{session_id}-{index - 1}" if index else None,
+        "sessionId": session_id,
+        "timestamp": f"2026-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z",
+        "cwd": "/work/app",
+        **extra,
+    })
+
+
+def _trigger(rng: random.Random, flow: str, keywords: list, labels: list, session_id: str, index: int) -> str:
+    if flow == "f2":
+        root_cause, rule, dest = labels
+        text = (
+            f"Fixed the flaky test.\n{root_cause}: the fixture shared a temp dir between tests.\n"
+            f"{rule}: give every test its own tmp_path.\n{dest}: /work/app/CLAUDE.md"
+        )
+        return _entry("assistant", [{"type": "text", "text": text}], session_id, index)
+    return _entry("user", f"{rng.choice(keywords).capitalize()}, {rng.choice(PROMPTS).lower()}", session_id, index)
+
+
+def _filler(rng: random.Random, session_id: str, index: int, tool_results: list) -> str:
+    roll = rng.random()
+    if roll < 0.2:
+        return _entry("user", rng.choice(PROMPTS), session_id, index)
+    if roll < 0.5:
+        return _entry("assistant", [{"type": "text", "text": rng.choice(REPLIES)}], session_id, index)
+    if roll < 0.75:
+        name, key, value = rng.choice(TOOLS)
+        content = [
+            {"type": "text", "text": rng.choice(REPLIES)},
+            {"type": "tool_use", "id": f"toolu_{index}", "name": name, "input": {key: value}},
+        ]
+        return _entry("assistant", content, session_id, index)
+    tool_results.append(index)
+    size = LARGE_BYTES if len(tool_results) % LARGE_EVERY == 0 else rng.randint(200, 4096)
+    start = rng.randrange(len(_CODE))
+    payload = CORPUS[start:start + size]
+    content = [{"type": "tool_result", "tool_use_id": f"toolu_{index - 1}", "content": payload}]
+    return _entry("user", content, session_id, index, toolUseResult={"stdout": payload[:200], "interrupted": False})
+
+
+def write_transcript(
+    path: Path, lines: int, flow: "str | None" = None, density: float = 0.01, seed: int = 0
+) -> Path:
+    """Write a synthetic transcript of exactly `lines` entries to path (session id = path stem)."""
+    rules_text = RULES_SOURCE.read_text()
+    keywords = _keywords(rules_text, flow) if flow in FLOW_COMMENTS else []
+    labels = [name.strip() for name in read_comment(rules_text, "learning-fields").split(",")][:3]
+    rng = random.Random(seed)
+    tool_results: list = []
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for index in range(lines):
+            is_trigger = flow is not None and int((index + 1) * density) > int(index * density)
+            if is_trigger:
+                f.write(_trigger(rng, flow, keywords, labels, path.stem, index) + "\n")
+            else:
+                f.write(_filler(rng, path.stem, index, tool_results) + "\n")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", type=Path)
+    parser.add_argument("--lines", type=int, required=True)
+    parser.add_argument("--flow", choices=["f1", "fv", "f2"])
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    write_transcript(args.out, args.lines, args.flow, args.density, args.seed)
+    print(f"{args.out}: {args.lines} lines, {args.out.stat().st_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Thin client for the optional hook daemon (hook_daemon.py).
+
+socket and json are imported only once a daemon socket exists, so hooks
+pay nothing extra when no daemon is running.
+If no daemon answers on the socket, forward_to_daemon() returns and the
+caller runs its hook in-process as usual.
+"""
+
+import os
+import sys
+
+# Seconds to wait for the daemon to accept; a stale socket fails immediately
+CONNECT_TIMEOUT = 0.2
+
+
+def socket_path() -> str:
+    """Daemon socket: $VORBIT_HOOK_SOCKET or ~/.claude/vorbit-hooks.sock."""
+    return os.environ.get("VORBIT_HOOK_SOCKET") or os.path.join(
+        os.path.expanduser("~"), ".claude", "vorbit-hooks.sock"
+    )
+
+
+def forward_to_daemon(hook_name: str) -> None:
+    """Run hook_name in the daemon and exit with its result. Returns if no daemon is reachable."""
+    path = socket_path()
+    if not os.path.exists(path):
+        return
+    import io
+    import json
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return
+
+    stdin = "" if sys.stdin is None or sys.stdin.isatty() else sys.stdin.read()
+    request = {
+        "hook": hook_name,
+        "argv": sys.argv[1:],
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "stdin": stdin,
+    }
+    try:
+        # No timeout once connected — validators may legitimately run long
+        sock.settimeout(None)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        response = json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        # Daemon died mid-request: stdin is already consumed, so fail open
+        sys.exit(0)
+    finally:
+        sock.close()
+
+    if "exit_code" not in response:
+        # Daemon cannot run this hook (e.g. older daemon): run it in-process
+        sys.stdin = io.StringIO(stdin)
+        return
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.exit(response["exit_code"])
@@ -0,0 +1,127 @@
+"""Time budgets for the commands a hook stage runs.
+
+Each stage gets one budget, shared by every command it starts:
+VORBIT_<STAGE>_TIMEOUT seconds (e.g. VORBIT_VALIDATE_TIMEOUT=90), else the
+default in STAGES. Commands run in their own process group, so when the
+budget runs out the whole group is killed — tsc, go build and friends fork
+helpers that would otherwise outlive the hook. The timeout is appended to
+~/.claude/vorbit-hooks/timeouts.jsonl for tuning, and DeadlineExceeded
+tells the stage to give up without blocking the edit.
+"""
+
+import os
+import time
+
+from _telemetry import timed
+
+# stage → (what gets skipped, default budget in seconds). The post-edit
+# stages together stay under the 60 s Claude Code allows a hook by default.
+STAGES = {
+    "format": ("formatting", 15.0),
+    "validate": ("validation", 40.0),
+    "format_batch": ("batch formatting", 45.0),
+}
+
+
+# Process groups of the commands running right now, for callers that must stop them early
+RUNNING: set = set()
+
+# A command being started is not in RUNNING yet, so stop_running() waits until it is
+_SPAWN = {"starting": False, "stop_requested": False}
+
+
+def stop_running(*_) -> None:
+    """Kill every running command's process group and exit; usable as a signal handler.
+
+    Called while a command is being started, it takes effect as soon as that
+    command is in RUNNING, so the command never outlives the process.
+    """
+    import signal
+
+    if _SPAWN["starting"]:
+        _SPAWN["stop_requested"] = True
+        return
+    for pgid in list(RUNNING):
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    os._exit(0)
+
+
+class DeadlineExceeded(Exception):
+    """A stage's budget ran out; str() is the "<stage> skipped: timed out" report."""
+
+
+def timeouts_log_path() -> str:
+    return os.path.join(os.path.expanduser("~"), ".claude", "vorbit-hooks", "timeouts.jsonl")
+
+
+class Deadline:
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.label, self.seconds = STAGES[stage]
+        try:
+            self.seconds = float(os.environ.get(f"VORBIT_{stage.upper()}_TIMEOUT", self.seconds))
+        except ValueError:
+            pass
+        self.expires = time.monotonic() + self.seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    @timed("subprocess")
+    def run(self, command: list, cwd: "str | None" = None, text: bool = False):
+        """subprocess.run(command, capture_output=True) within the remaining budget.
+
+        Raises FileNotFoundError if the command is not installed, and
+        DeadlineExceeded (after killing its process group) if it overruns.
+        """
+        import signal
+        import subprocess
+
+        _SPAWN["starting"] = True
+        try:
+            proc = subprocess.Popen(
+                command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text, start_new_session=True
+            )
+            RUNNING.add(proc.pid)
+        finally:
+            _SPAWN["starting"] = False
+            if _SPAWN["stop_requested"]:
+                stop_running()
+        try:
+            stdout, stderr = proc.communicate(timeout=self.remaining())
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            # Don't wait for EOF: anything that escaped the group may still hold the pipes
+            proc.stdout.close()
+            proc.stderr.close()
+            proc.wait()
+            self._record(command, cwd)
+            shown = " ".join([os.path.basename(command[0]), *command[1:3]])
+            raise DeadlineExceeded(f"{self.label} skipped: timed out after {self.seconds:g}s ({shown})") from None
+        finally:
+            RUNNING.discard(proc.pid)
+        return subprocess.CompletedProcess(command, proc.returncode, stdout, stderr)
+
+    def _record(self, command: list, cwd: "str | None") -> None:
+        import json
+
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "stage": self.stage,
+            "timeout": self.seconds,
+            "command": os.path.basename(command[0]),
+            "cwd": os.path.abspath(cwd or "."),
+        }
+        path = timeouts_log_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
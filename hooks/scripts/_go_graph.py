@@ -0,0 +1,112 @@
+"""Package graph of a Go module, for package-scoped validation in post_edit_validate.
+
+The whole module is listed once and cached under ~/.claude/vorbit-workers/
+with each package's direct imports. The listing is redone when go.mod or
+go.sum change, or when any directory holding or enclosing a package changes
+(a file or package added, removed or renamed); the edited package's own
+directory is left out of that check, since each edit re-lists it anyway.
+Dependents are the reverse closure of the direct imports, so an import
+gained by one package is followed through every package above it.
+"""
+
+import json
+import os
+import subprocess
+
+from _deadline import Deadline
+from _utils import project_state_path, stat_key
+
+# Bump when the cached entry layout changes
+GRAPH_VERSION = 2
+
+# One line per package: import path, directory, direct imports (space-separated)
+LIST_FORMAT = '{{.ImportPath}}\t{{.Dir}}\t{{join .Imports " "}}'
+
+
+def _module_key(project_root: str) -> list:
+    """Identity of go.mod/go.sum; the cached graph is only valid while this matches."""
+    return [stat_key(os.path.join(project_root, name)) for name in ("go.mod", "go.sum")]
+
+
+def _watched_dirs(project_root: str, packages: dict) -> list:
+    """Package directories under project_root and every directory between them and project_root."""
+    root = os.path.realpath(project_root)
+    dirs = set()
+    for info in packages.values():
+        current = os.path.realpath(info["dir"])
+        while (current == root or current.startswith(root + os.sep)) and current not in dirs:
+            dirs.add(current)
+            current = os.path.dirname(current)
+    return sorted(dirs)
+
+
+def _go_list(go: str, project_root: str, pattern: str, deadline: Deadline) -> dict:
+    """import path → {"dir", "imports"} for a package pattern. -e keeps packages that fail to compile."""
+    command = [go, "list", "-e", "-f", LIST_FORMAT, pattern]
+    result = deadline.run(command, cwd=project_root, text=True)
+    if result.returncode:
+        raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+    packages = {}
+    for line in result.stdout.splitlines():
+        import_path, directory, imports = line.split("\t")
+        packages[import_path] = {"dir": directory, "imports": imports.split()}
+    return packages
+
+
+def _save(cache_file: str, key: list, dirs: dict, packages: dict) -> None:
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp = cache_file + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"version": GRAPH_VERSION, "key": key, "dirs": dirs, "packages": packages}, f)
+    os.replace(tmp, cache_file)
+
+
+def _dependents(packages: dict, target: str) -> list:
+    """Module packages importing target directly or through other module packages, sorted."""
+    importers: dict = {}
+    for path, info in packages.items():
+        for imported in info["imports"]:
+            importers.setdefault(imported, []).append(path)
+    found, pending = set(), [target]
+    while pending:
+        for path in importers.get(pending.pop(), []):
+            if path not in found and path != target:
+                found.add(path)
+                pending.append(path)
+    return sorted(path for path in found if os.path.isdir(packages[path]["dir"]))
+
+
+def packages_to_check(go: str, project_root: str, file_path: str, deadline: Deadline) -> list:
+    """The edited file's package first, then every module package depending on it.
+
+    go is the toolchain binary resolved for the project (see _toolchain.binary).
+    Empty if the file belongs to no package (testdata, ignored dirs). Raises
+    OSError / CalledProcessError / ValueError if go cannot list the module,
+    DeadlineExceeded if listing overruns the stage's budget.
+    """
+    cache_file = project_state_path("golist", project_root, ".json")
+    key = _module_key(project_root)
+    edited_dir = os.path.dirname(os.path.realpath(file_path))
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        packages = cached["packages"]
+        stale = cached["version"] != GRAPH_VERSION or cached["key"] != key or any(
+            stat_key(directory) != stat for directory, stat in cached["dirs"].items() if directory != edited_dir
+        )
+        if stale:
+            packages = None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        packages = None
+    if packages is None:
+        packages = _go_list(go, project_root, "./...", deadline)
+
+    package_dir = os.path.relpath(os.path.dirname(os.path.abspath(file_path)), project_root)
+    edited = _go_list(go, project_root, "./" + package_dir, deadline)
+    packages.update(edited)
+    _save(cache_file, key, {d: stat_key(d) for d in _watched_dirs(project_root, packages)}, packages)
+
+    if not edited:
+        return []
+    target = next(iter(edited))
+    return [target, *_dependents(packages, target)]
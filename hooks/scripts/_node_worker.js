@@ -0,0 +1,57 @@
+// Shared socket server for the resident Node workers (see _node_worker.py).
+//
+// serve(socketPath, idleMs, handle): one JSON line in, one JSON line out
+// per connection. handle(request) may return a value or a promise; a thrown
+// error becomes {"error": "..."}. The worker exits after idleMs without
+// requests and removes its socket.
+
+"use strict";
+
+const fs = require("fs");
+const net = require("net");
+
+function serve(socketPath, idleMs, handle) {
+  let idleTimer;
+  const armIdleTimer = () => {
+    clearTimeout(idleTimer);
+    idleTimer = setTimeout(() => server.close(), Number(idleMs));
+  };
+
+  const server = net.createServer((conn) => {
+    armIdleTimer();
+    let buffer = "";
+    conn.setEncoding("utf8");
+    conn.on("data", (chunk) => {
+      buffer += chunk;
+      const newline = buffer.indexOf("\n");
+      if (newline === -1) return;
+      const reply = (response) => conn.end(JSON.stringify(response) + "\n");
+      let request;
+      try {
+        request = JSON.parse(buffer.slice(0, newline));
+      } catch (err) {
+        reply({ error: "invalid request" });
+        return;
+      }
+      Promise.resolve()
+        .then(() => handle(request))
+        .then(reply, (err) => reply({ error: String((err && err.message) || err) }));
+    });
+    conn.on("error", () => {});
+  });
+
+  server.on("error", () => process.exit(1)); // e.g. another worker won the start race
+  server.on("close", () => {
+    try {
+      fs.unlinkSync(socketPath);
+    } catch (err) {}
+    process.exit(0);
+  });
+  server.listen(socketPath, () => {
+    fs.chmodSync(socketPath, 0o600);
+    armIdleTimer();
+  });
+  return server;
+}
+
+module.exports = { serve };
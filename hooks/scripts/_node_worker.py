@@ -0,0 +1,113 @@
+"""Client for the resident Node workers (prettier/typescript/pyright_server.js).
+
+One worker per (kind, project root) keeps a Node tool loaded between hook
+runs, so a request costs a socket round trip instead of a Node cold start
+plus config and plugin resolution. Protocol: one JSON line in, one JSON
+line out. call_worker() returns None whenever no worker can be reached or
+started, or the worker does not answer in time; callers then run the
+one-shot command as before. A worker is only started when nothing listens
+on its socket: a busy worker that times out is left alone.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import time
+
+from _telemetry import timed
+from _utils import WORKER_IDLE_SECONDS, project_state_path
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Workers exit after this long without a request
+IDLE_TIMEOUT_MS = WORKER_IDLE_SECONDS * 1000
+
+# Most seconds to wait for a fresh worker to load its tool and listen
+STARTUP_TIMEOUT = 5.0
+
+
+def worker_socket(kind: str, project_root: str) -> str:
+    """Unix socket of the project's `kind` worker."""
+    return project_state_path(kind, project_root, ".sock")
+
+
+def _request(path: str, payload: dict, timeout: float) -> dict:
+    """Send one request; raises OSError/ValueError if no worker answers.
+
+    ConnectionRefusedError/FileNotFoundError mean nothing listens on path;
+    socket.timeout means a worker is there but did not answer in time.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def _start_worker(kind: str, path: str, project_root: str, end: float) -> bool:
+    """Start a detached worker; True once its socket exists before monotonic time end."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.unlink(path)  # only reached after connect was refused: stale socket
+    try:
+        proc = subprocess.Popen(
+            ["node", os.path.join(SCRIPTS_DIR, f"{kind}_server.js"), path, project_root, str(IDLE_TIMEOUT_MS)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        return False
+    end = min(end, time.monotonic() + STARTUP_TIMEOUT)
+    while time.monotonic() < end:
+        if os.path.exists(path):
+            return True
+        if proc.poll() is not None:
+            # Tool not installed in the project, or another hook's worker won the race
+            return os.path.exists(path)
+        time.sleep(0.02)
+    return False
+
+
+@timed("subprocess")
+def call_worker(kind: str, project_root: str, payload: dict, timeout: float) -> "dict | None":
+    """Send payload to the project's `kind` worker, starting it if needed.
+
+    timeout bounds the whole call, a worker start and retry included.
+    Returns the worker's response, or None if the caller should fall back
+    to the one-shot command.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = worker_socket(kind, project_root)
+    end = time.monotonic() + timeout
+    for attempt in range(2):
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            return None
+        try:
+            return _request(path, payload, remaining)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if attempt or not _start_worker(kind, path, project_root, end):
+                return None
+        except (OSError, ValueError):
+            # Timed out or dropped mid-request: the worker is alive, a second one would not help
+            return None
+    return None
+
+
+def format_with_server(project_root: str, file_path: str, timeout: float) -> bool:
+    """Format file_path in place via the project's prettier worker.
+
+    True once a worker handled the request (including prettier reporting a
+    syntax error, which a one-shot run would hit too); False if the caller
+    should fall back to `prettier --write`.
+    """
+    response = call_worker("prettier", project_root, {"file": os.path.abspath(file_path)}, timeout=timeout)
+    return response is not None
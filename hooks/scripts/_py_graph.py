@@ -0,0 +1,133 @@
+"""Import graph of a Python project, for importer-scoped mypy runs in post_edit_validate.
+
+Every .py file under the project root is parsed with ast once and its
+imports are cached under ~/.claude/vorbit-workers/ next to the file's
+(mtime, size). Later edits re-stat the tree and re-parse only the files
+whose stat changed, appeared or disappeared. Module names are worked out
+the way mypy does for files given on its command line: the file's stem,
+prefixed by every enclosing directory holding an __init__.py.
+"""
+
+import json
+import os
+
+from _telemetry import timed
+from _utils import project_state_path, stat_key
+
+# Bump when the cached entry layout changes
+GRAPH_VERSION = 1
+
+# Directories never holding project sources
+SKIPPED_DIRS = ("node_modules", "__pycache__", "site-packages", "venv", "build", "dist")
+
+
+def _source_files(project_root: str) -> tuple:
+    """(relative .py paths, relative dirs holding an __init__.py) under project_root."""
+    files, packages = [], set()
+    for directory, dirs, names in os.walk(project_root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in SKIPPED_DIRS)
+        relative = os.path.relpath(directory, project_root)
+        if "__init__.py" in names:
+            packages.add(relative)
+        files.extend(os.path.normpath(os.path.join(relative, n)) for n in sorted(names) if n.endswith(".py"))
+    return files, packages
+
+
+def module_name(relative_path: str, packages: set) -> str:
+    """Dotted module name of a source file given the directories that are packages."""
+    directory, name = os.path.split(relative_path)
+    parts = [] if name == "__init__.py" else [name[:-3]]
+    while directory and directory in packages:
+        directory, package = os.path.split(directory)
+        parts.insert(0, package)
+    return ".".join(parts)
+
+
+def parse_imports(path: str) -> list:
+    """[name, level] per module an import statement may refer to; [] if the file does not parse.
+
+    `from X import a` yields X and X.a (a may be a submodule); level is the
+    number of leading dots of a relative import.
+    """
+    import ast
+
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return []
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend([alias.name, 0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if base:
+                imports.append([base, node.level])
+            imports.extend(
+                [f"{base}.{alias.name}" if base else alias.name, node.level]
+                for alias in node.names if alias.name != "*"
+            )
+    return imports
+
+
+def _resolve(name: str, level: int, importer: str, is_package: bool) -> "str | None":
+    """Absolute module name of an import as seen from the importing module."""
+    if not level:
+        return name
+    parts = importer.split(".") if is_package else importer.split(".")[:-1]
+    if level - 1 > len(parts):
+        return None
+    base = parts[: len(parts) - (level - 1)]
+    return ".".join([*base, name] if name else base) or None
+
+
+@timed("io")
+def importers_of(project_root: str, file_path: str) -> list:
+    """Absolute paths of the project files importing file_path's module directly, sorted.
+
+    Files sharing a module name with another file (mypy would reject the
+    pair) are left out. Raises OSError if the tree cannot be walked.
+    """
+    cache_file = project_state_path("pyimports", project_root, ".json")
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        entries = cached["files"] if cached["version"] == GRAPH_VERSION else {}
+    except (OSError, ValueError, KeyError, TypeError):
+        entries = {}
+
+    files, packages = _source_files(project_root)
+    changed = set(entries) != set(files)
+    graph = {}
+    for relative in files:
+        path = os.path.join(project_root, relative)
+        stat = stat_key(path)
+        entry = entries.get(relative)
+        if entry is None or entry["stat"] != stat:
+            entry = {"stat": stat, "imports": parse_imports(path)}
+            changed = True
+        graph[relative] = entry
+    if changed:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": GRAPH_VERSION, "files": graph}, f)
+        os.replace(tmp, cache_file)
+
+    modules: dict = {}
+    for relative in graph:
+        modules.setdefault(module_name(relative, packages), []).append(relative)
+    edited = os.path.relpath(os.path.abspath(file_path), os.path.abspath(project_root))
+    target = module_name(edited, packages)
+    importers = []
+    for name, (relative, *duplicates) in modules.items():
+        if duplicates or name == target:
+            continue
+        is_package = os.path.basename(relative) == "__init__.py"
+        if any(
+            _resolve(imported, level, name, is_package) == target
+            for imported, level in graph[relative]["imports"]
+        ):
+            importers.append(os.path.join(os.path.abspath(project_root), relative))
+    return sorted(importers)
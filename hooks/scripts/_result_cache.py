@@ -0,0 +1,112 @@
+"""Per-project cache of format/validate results, keyed by file content.
+
+An edit that leaves a file byte-identical to a version already formatted or
+validated (a revert, a no-op edit) replays the stored result instead of
+starting the toolchain again. Entries are keyed by tool, path and sha256 of
+the content, and a tool's entries are dropped as soon as its config files
+or executables change (_toolchain.tool_fingerprint). The file keeps the
+MAX_ENTRIES most recently used entries.
+
+Type checkers also read the rest of the project, so a validate cache is
+given the source extensions its checker reads: each entry records the stat
+of every other such file under the project root, taken before the checker
+ran, and is only replayed while none of them has changed, appeared or gone.
+"""
+
+import hashlib
+import json
+import os
+
+from _py_graph import SKIPPED_DIRS
+from _telemetry import timed
+from _toolchain import tool_fingerprint
+from _utils import project_state_path, stat_key
+
+# Most recently used entries kept per project and kind
+MAX_ENTRIES = 256
+
+
+def content_hash(file_path: str) -> str:
+    """sha256 of file_path's current content."""
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ResultCache:
+    """Results of one tool in one project, stored under ~/.claude/vorbit-workers/."""
+
+    @timed("io")
+    def __init__(self, kind: str, project_root: str, tool: str, fingerprint: str, sources: tuple = ()):
+        self.path = project_state_path(f"{kind}-cache", project_root, ".json")
+        self.project_root = project_root
+        self.tool = tool
+        self.sources = sources
+        # file path → context, taken once per process so put records the state get saw
+        self.contexts: dict = {}
+        # tools: tool → fingerprint; entries: key → result, least recently used first
+        self.data = {"tools": {}, "entries": {}}
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+            if all(isinstance(stored.get(name), dict) for name in self.data):
+                self.data = stored
+        except (OSError, ValueError, AttributeError):
+            pass
+        if self.data["tools"].get(tool) != fingerprint:
+            self.data["tools"][tool] = fingerprint
+            self.data["entries"] = {
+                key: entry for key, entry in self.data["entries"].items() if entry["tool"] != tool
+            }
+
+    @timed("io")
+    def key(self, file_path: str) -> str:
+        """Cache key for file_path's current content."""
+        return f"{self.tool}:{content_hash(file_path)}:{os.path.abspath(file_path)}"
+
+    @timed("io")
+    def _context(self, file_path: str) -> "str | None":
+        """Stat of every other file with a sources extension under the project root."""
+        if not self.sources:
+            return None
+        if file_path not in self.contexts:
+            state = []
+            for directory, dirs, names in os.walk(self.project_root):
+                dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in SKIPPED_DIRS)
+                for name in sorted(names):
+                    path = os.path.abspath(os.path.join(directory, name))
+                    if name.endswith(self.sources) and path != file_path:
+                        state.append([path, stat_key(path)])
+            self.contexts[file_path] = hashlib.sha1(json.dumps(state).encode()).hexdigest()
+        return self.contexts[file_path]
+
+    def get(self, key: str) -> "dict | None":
+        """Stored result for key, marked most recently used (persisted by save/put)."""
+        entry = self.data["entries"].pop(key, None)
+        if entry is None:
+            return None
+        self.data["entries"][key] = entry
+        if entry["context"] != self._context(key.split(":", 2)[2]):
+            return None
+        return entry["result"]
+
+    def put(self, key: str, result: dict) -> None:
+        """Store result for key, evicting the least recently used entries, and save."""
+        entries = self.data["entries"]
+        entries.pop(key, None)
+        entries[key] = {"tool": self.tool, "context": self._context(key.split(":", 2)[2]), "result": result}
+        while len(entries) > MAX_ENTRIES:
+            del entries[next(iter(entries))]
+        self.save()
+
+    @timed("io")
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.data, f)
+        os.replace(tmp, self.path)
+
+
+def format_cache(project_root: str, profile: dict) -> ResultCache:
+    """Files already in the profile formatter's output form; any formatter config change empties it."""
+    return ResultCache("format", project_root, profile["formatter"], tool_fingerprint(profile, "format"))
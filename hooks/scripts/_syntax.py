@@ -0,0 +1,226 @@
+"""In-process syntax tier of the validate stage: catch a broken file before any checker starts.
+
+check_syntax() parses the edited file inside the hook process:
+  .json/.jsonc - json.loads; comments and trailing commas are blanked out
+                 first, except in files read by strict JSON parsers
+                 (package.json and npm lockfiles)
+  .go          - a tokenizer pass: unterminated strings, runes and comments,
+                 and unbalanced (), [], {}
+TypeScript gets no tier: telling regex literals and JSX from division and
+comparison needs a real parser, so tsc stays the only check there.
+
+A syntax error comes back as a checker-style result (exit 2, diagnostics on
+stderr as FILE:LINE:COL: error: MESSAGE plus the offending line and a
+caret), and the external checker is not run. Outside the strict files, what
+a tool accepts as JSON varies (JSON5, unquoted keys), so a JSON file that
+still does not parse gets a warning with exit 1, which does not block the
+edit. Files are read as UTF-8 with an optional BOM.
+
+check_python_syntax() compiles a .py file with the interpreter running the
+hook, whose grammar may be older than the project's: its SyntaxError is a
+verdict only when that interpreter is at least the project's target
+version (see _toolchain.PYTHON_TARGET_PATTERNS). Otherwise the checker
+decides, and python_parses() only tells it whether the edited file's
+importers are worth checking along with it.
+"""
+
+import os
+import sys
+
+from _telemetry import timed
+
+# JSON files read by strict parsers: no comments, no trailing commas
+STRICT_JSON_NAMES = ("package.json", "package-lock.json", "npm-shrinkwrap.json")
+
+GO_PAIRS = {")": "(", "]": "[", "}": "{"}
+
+
+class _SyntaxIssue(Exception):
+    def __init__(self, line: int, col: int, message: str, severity: str = "error"):
+        super().__init__(message)
+        self.line = line
+        self.col = col
+        self.message = message
+        self.severity = severity
+
+
+def _diagnostic(file_path: str, source: str, issue: _SyntaxIssue) -> str:
+    lines = source.splitlines()
+    text = lines[issue.line - 1] if 0 < issue.line <= len(lines) else ""
+    caret = " " * (max(issue.col, 1) - 1) + "^"
+    return f"{file_path}:{issue.line}:{issue.col}: {issue.severity}: {issue.message}\n    {text}\n    {caret}\n"
+
+
+def _check_python(source: bytes, file_path: str) -> None:
+    import warnings
+
+    try:
+        with warnings.catch_warnings():
+            # Warnings (invalid escapes, `is` with a literal) are the checker's business
+            warnings.simplefilter("ignore")
+            compile(source, file_path, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        raise _SyntaxIssue(e.lineno or 1, e.offset or 1, e.msg) from None
+    except ValueError as e:  # source code string cannot contain null bytes
+        raise _SyntaxIssue(1, 1, str(e)) from None
+
+
+def _read_bytes(file_path: str) -> "bytes | None":
+    try:
+        with open(file_path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+@timed("syntax")
+def check_python_syntax(file_path: str, target: "list | None") -> "dict | None":
+    """A failing result for a .py file that does not compile, if this interpreter knows target's grammar; else None."""
+    if target is None or sys.version_info[:2] < tuple(target):
+        return None
+    source = _read_bytes(file_path)
+    if source is None:
+        return None
+    try:
+        _check_python(source, file_path)
+    except _SyntaxIssue as issue:
+        text = source.decode("utf-8-sig", errors="replace")
+        return {"returncode": 2, "stdout": "", "stderr": _diagnostic(file_path, text, issue)}
+    return None
+
+
+@timed("syntax")
+def python_parses(file_path: str) -> bool:
+    """False if file_path does not compile under this interpreter; True if it does or cannot be read."""
+    source = _read_bytes(file_path)
+    try:
+        if source is not None:
+            _check_python(source, file_path)
+    except _SyntaxIssue:
+        return False
+    return True
+
+
+def is_strict_json(file_path: str) -> bool:
+    return os.path.basename(file_path) in STRICT_JSON_NAMES
+
+
+def strip_jsonc(source: str) -> str:
+    """Blank out comments and trailing commas, keeping every other character where it was."""
+    out = list(source)
+    i, n = 0, len(source)
+    last_comma = None  # index of a comma that only whitespace/comments have followed so far
+    while i < n:
+        ch = source[i]
+        if ch == '"':
+            last_comma = None
+            i += 1
+            while i < n and source[i] not in '"\n':
+                i += 2 if source[i] == "\\" else 1
+            i += 1
+        elif source.startswith("//", i):
+            while i < n and source[i] != "\n":
+                out[i] = " "
+                i += 1
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            for j in range(i, end):
+                if source[j] != "\n":
+                    out[j] = " "
+            i = end
+        else:
+            if ch in "]}" and last_comma is not None:
+                out[last_comma] = " "
+            if ch == ",":
+                last_comma = i
+            elif not ch.isspace():
+                last_comma = None
+            i += 1
+    return "".join(out)
+
+
+def _check_json(source: str, file_path: str) -> None:
+    import json
+
+    strict = is_strict_json(file_path)
+    try:
+        json.loads(source if strict else strip_jsonc(source))
+    except json.JSONDecodeError as e:
+        raise _SyntaxIssue(e.lineno, e.colno, e.msg, "error" if strict else "warning") from None
+
+
+def _check_go(source: str, file_path: str) -> None:
+    stack = []  # (bracket, line, col)
+    i, n = 0, len(source)
+    line, line_start = 1, 0
+
+    def at(index):
+        return line, index - line_start + 1
+
+    while i < n:
+        ch = source[i]
+        if ch == "\n":
+            line, line_start = line + 1, i + 1
+            i += 1
+        elif source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end == -1 else end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            if end == -1:
+                raise _SyntaxIssue(*at(i), "comment not terminated")
+            newlines = source.count("\n", i, end)
+            if newlines:
+                line, line_start = line + newlines, source.rfind("\n", i, end) + 1
+            i = end + 2
+        elif ch == "`":
+            end = source.find("`", i + 1)
+            if end == -1:
+                raise _SyntaxIssue(*at(i), "raw string literal not terminated")
+            newlines = source.count("\n", i, end)
+            if newlines:
+                line, line_start = line + newlines, source.rfind("\n", i, end) + 1
+            i = end + 1
+        elif ch in "\"'":
+            start = i
+            i += 1
+            while i < n and source[i] not in (ch, "\n"):
+                i += 2 if source[i] == "\\" else 1
+            if i >= n or source[i] != ch:
+                kind = "string" if ch == '"' else "rune"
+                raise _SyntaxIssue(*at(start), f"{kind} literal not terminated")
+            i += 1
+        else:
+            if ch in "([{":
+                stack.append((ch, *at(i)))
+            elif ch in GO_PAIRS:
+                if not stack or stack[-1][0] != GO_PAIRS[ch]:
+                    raise _SyntaxIssue(*at(i), f"unexpected {ch}")
+                stack.pop()
+            i += 1
+    if stack:
+        bracket, open_line, open_col = stack[-1]
+        raise _SyntaxIssue(open_line, open_col, f"{bracket} is never closed")
+
+
+CHECKS = {"json": _check_json, "jsonc": _check_json, "go": _check_go}
+
+
+@timed("syntax")
+def check_syntax(file_path: str) -> "dict | None":
+    """A failing result for a file that does not parse; None if it parses or cannot be read."""
+    check = CHECKS.get(os.path.splitext(file_path)[1].lstrip("."))
+    if check is None:
+        return None
+    try:
+        with open(file_path, encoding="utf-8-sig") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    try:
+        check(source, file_path)
+    except _SyntaxIssue as issue:
+        returncode = 2 if issue.severity == "error" else 1
+        return {"returncode": returncode, "stdout": "", "stderr": _diagnostic(file_path, source, issue)}
+    return None
@@ -0,0 +1,105 @@
+"""Hook latency telemetry: one JSON line per hook run in ~/.claude/vorbit-hooks/timings.jsonl.
+
+A record holds the hook, its event, the project, the exit code, the total
+wall time and the time spent per phase (root lookup, toolchain detection,
+in-process syntax checks, subprocesses and worker calls, state/transcript
+I/O), all in milliseconds.
+Phases are collected by the @timed functions that do that work. Runs that
+exit on a tool hook's pre-check (before any module beyond os/sys loads)
+are not recorded. The file is rotated to timings.jsonl.1 past MAX_BYTES.
+`vorbit_hooks.py stats` reports percentiles. Only os and time are
+imported at module level.
+"""
+
+import os
+import time
+
+# Rotate the log once it grows past this
+MAX_BYTES = 1024 * 1024
+
+HOOK_EVENTS = {
+    "pre_push_warning": "PreToolUse",
+    "post_edit": "PostToolUse",
+    "post_edit_format": "PostToolUse",
+    "post_edit_validate": "PostToolUse",
+    "format_dirty_files": "Stop",
+    "report_validation": "Stop",
+    "loop_controller": "Stop",
+    "stop_learn_reflect": "Stop",
+}
+
+# phase → seconds spent in this process
+_PHASES: dict = {}
+
+
+def timings_path() -> str:
+    return os.path.join(os.path.expanduser("~"), ".claude", "vorbit-hooks", "timings.jsonl")
+
+
+def timed(phase: str):
+    """Decorator: add the function's wall time to `phase` of the current hook run."""
+    def decorate(fn):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _PHASES[phase] = _PHASES.get(phase, 0.0) + time.perf_counter() - start
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return decorate
+
+
+def _append(record: dict) -> None:
+    import json
+
+    path = timings_path()
+    try:
+        if os.path.getsize(path) > MAX_BYTES:
+            os.replace(path, path + ".1")
+    except OSError:
+        pass
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    except OSError:
+        pass
+
+
+class HookTimer:
+    """Times the block running a hook's main() and appends its record on the way out.
+
+    SystemExit carries the exit code; any other exception is recorded as
+    exit 0 (what the hook's guard turns it into). Nothing is swallowed.
+    """
+
+    def __init__(self, hook: str):
+        self.hook = hook
+
+    def __enter__(self):
+        _PHASES.clear()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        total = time.perf_counter() - self.start
+        if isinstance(exc, SystemExit):
+            exit_code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+        else:
+            exit_code = 0
+        record = {
+            "ts": int(time.time()),
+            "hook": self.hook,
+            "event": HOOK_EVENTS.get(self.hook, ""),
+            "project": os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd(),
+            "exit": exit_code,
+            "ms": round(total * 1000, 2),
+            "phases": {phase: round(seconds * 1000, 2) for phase, seconds in _PHASES.items()},
+        }
+        if exc_type is not None and not isinstance(exc, SystemExit):
+            record["error"] = exc_type.__name__
+        _append(record)
+        return False
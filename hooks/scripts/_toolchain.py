@@ -0,0 +1,244 @@
+"""Per-project toolchain profile: which formatter and checkers apply, and which binaries run them.
+
+Detection lists the project root, parses package.json / pyproject.toml and
+resolves every binary (the nearest node_modules/.bin at or above the root,
+then PATH). The result is persisted under ~/.claude/vorbit-workers/ together with the stat
+of everything it was derived from — the root directory (a config file
+created or deleted), node_modules/.bin, each config file present, each
+resolved binary — and $PATH. Later edits re-stat that list and reuse the
+profile while nothing moved.
+
+In a monorepo the root a tool runs from is the edited file's nearest
+enclosing package that configures it: package_profile() walks up from the
+file to the project root and returns the first directory whose profile
+sets up the formatter or the checker.
+"""
+
+import os
+
+from _telemetry import timed
+from _utils import project_state_path, stat_key
+
+# Config files that can change what the formatter writes
+FORMAT_CONFIG_FILES = ("biome.json", "biome.jsonc", "package.json", ".prettierignore", ".editorconfig")
+PRETTIER_CONFIG_PREFIXES = (".prettierrc", "prettier.config.")
+
+# Per checker: config files that can change its verdict, and the binaries it may run
+CHECKER_INPUTS = {
+    "typescript": (("tsconfig.json", "package.json"), ("tsc",)),
+    "python": (("pyproject.toml", "mypy.ini", "setup.cfg", "pyrightconfig.json"), ("mypy", "dmypy", "pyright")),
+    "go": (("go.mod", "go.sum"), ("go",)),
+}
+
+# Per checker: extensions of the project files it reads besides the one it is given
+CHECKER_SOURCES = {
+    "typescript": (".ts", ".tsx", ".mts", ".cts", ".js", ".jsx", ".mjs", ".cjs"),
+    "python": (".py", ".pyi"),
+    "go": (".go",),
+}
+
+CONFIG_FILES = set(FORMAT_CONFIG_FILES).union(*(files for files, _ in CHECKER_INPUTS.values()))
+# A directory holding one of these may be a package with its own toolchain
+PACKAGE_MARKERS = (
+    "package.json", "biome.json", "biome.jsonc", "tsconfig.json",
+    "pyproject.toml", "mypy.ini", "setup.cfg", "pyrightconfig.json", "go.mod",
+)
+BINARIES = ("biome", "prettier", *(name for _, names in CHECKER_INPUTS.values() for name in names))
+
+# Python grammar the project targets: mypy's python_version, else the floor of requires-python
+PYTHON_TARGET_PATTERNS = (
+    r"""^\s*python_version\s*=\s*["']?(\d+)\.(\d+)""",
+    r"""^\s*requires-python\s*=\s*["']\s*(?:>=|~=|==)\s*(\d+)\.(\d+)""",
+)
+
+# Bump when the persisted profile layout changes
+PROFILE_VERSION = 2
+
+# Profiles resolved in this process (the post-edit pipeline asks once per stage)
+_PROFILES: dict = {}
+
+# (project root, directory, tool) → nearest package root configuring tool (None: none does), per process
+_PACKAGE_ROOTS: dict = {}
+
+
+def _watch_key(project_root: str, watched: list) -> list:
+    """Stat batch a profile stays valid for (relative paths are under project_root)."""
+    bin_dir = os.path.join(project_root, "node_modules", ".bin")
+    paths = [project_root, bin_dir, *(os.path.join(project_root, p) for p in watched)]
+    return [os.environ.get("PATH", ""), *(stat_key(p) for p in paths)]
+
+
+def _resolve_binary(project_root: str, name: str) -> "str | None":
+    """node_modules/.bin of project_root or its nearest ancestor that has name (hoisted workspaces), else PATH."""
+    import shutil
+
+    current = os.path.abspath(project_root)
+    while True:
+        local = os.path.join(current, "node_modules", ".bin", name)
+        if os.access(local, os.X_OK):
+            return local
+        parent = os.path.dirname(current)
+        if parent == current:
+            return shutil.which(name)
+        current = parent
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def _python_target(*texts: str) -> "list | None":
+    """[major, minor] of the Python grammar the config texts target, None if they name none."""
+    import re
+
+    for pattern in PYTHON_TARGET_PATTERNS:
+        for text in texts:
+            match = re.search(pattern, text, re.MULTILINE)
+            if match:
+                return [int(match.group(1)), int(match.group(2))]
+    return None
+
+
+def _detect(project_root: str) -> dict:
+    import json
+
+    entries = set(os.listdir(project_root))
+    prettier_configs = sorted(n for n in entries if n.startswith(PRETTIER_CONFIG_PREFIXES))
+    configs = sorted(n for n in entries if n in CONFIG_FILES) + prettier_configs
+
+    formatter = None
+    if "biome.json" in entries or "biome.jsonc" in entries:
+        formatter = "biome"
+    elif prettier_configs:
+        formatter = "prettier"
+    elif "package.json" in entries:
+        try:
+            if "prettier" in json.loads(_read_text(os.path.join(project_root, "package.json"))):
+                formatter = "prettier"
+        except (ValueError, TypeError):
+            pass
+
+    pyproject = _read_text(os.path.join(project_root, "pyproject.toml"))
+    binaries = {name: _resolve_binary(project_root, name) for name in BINARIES}
+    return {
+        "formatter": formatter,
+        "typescript": "tsconfig.json" in entries,
+        "mypy": "[tool.mypy]" in pyproject,
+        "pyright": "[tool.pyright]" in pyproject,
+        "go": "go.mod" in entries,
+        "python_target": _python_target(pyproject, _read_text(os.path.join(project_root, "mypy.ini"))),
+        "configs": configs,
+        "binaries": binaries,
+        "watched": configs + sorted(p for p in binaries.values() if p),
+    }
+
+
+@timed("detect")
+def toolchain_profile(project_root: str) -> dict:
+    """The project's profile, re-detected only when a watched stat or $PATH changed.
+
+    Keys: formatter ("biome" / "prettier" / None); typescript, mypy,
+    pyright, go (bools: the project is set up for that checker);
+    python_target ([major, minor] or None); configs (config file names
+    present); binaries (name → path or None).
+    """
+    import json
+
+    if project_root in _PROFILES:
+        return _PROFILES[project_root]
+    profile_file = project_state_path("toolchain", project_root, ".json")
+    try:
+        with open(profile_file) as f:
+            profile = json.load(f)
+        if profile["version"] != PROFILE_VERSION or profile["key"] != _watch_key(project_root, profile["watched"]):
+            profile = None
+    except (OSError, ValueError, KeyError, TypeError):
+        profile = None
+
+    if profile is None:
+        profile = _detect(project_root)
+        profile["version"] = PROFILE_VERSION
+        profile["key"] = _watch_key(project_root, profile["watched"])
+        os.makedirs(os.path.dirname(profile_file), exist_ok=True)
+        tmp = f"{profile_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(profile, f)
+        os.replace(tmp, profile_file)
+    _PROFILES[project_root] = profile
+    return profile
+
+
+def configures(profile: dict, tool: str) -> bool:
+    """Whether the profile sets up tool: "format" or a CHECKER_INPUTS key."""
+    if tool == "format":
+        return profile["formatter"] is not None
+    if tool == "python":
+        return profile["mypy"] or profile["pyright"]
+    return profile[tool]
+
+
+def package_profile(project_root: str, file_path: str, tool: str) -> "tuple[str, dict] | None":
+    """(root, profile) of file_path's nearest enclosing package that configures tool; None if none does.
+
+    Candidates are the directories from the file's up to project_root that
+    hold a PACKAGE_MARKERS file, plus project_root itself; the walk is
+    memoized per process.
+    """
+    root = os.path.abspath(project_root)
+    directory = os.path.dirname(os.path.abspath(file_path))
+    if directory != root and not directory.startswith(root.rstrip(os.sep) + os.sep):
+        directory = root
+    key = (root, directory, tool)
+    if key not in _PACKAGE_ROOTS:
+        _PACKAGE_ROOTS[key] = None
+        current = directory
+        while current != root:
+            if any(os.path.exists(os.path.join(current, marker)) for marker in PACKAGE_MARKERS):
+                if configures(toolchain_profile(current), tool):
+                    _PACKAGE_ROOTS[key] = current
+                    break
+            current = os.path.dirname(current)
+        else:
+            if configures(toolchain_profile(project_root), tool):
+                _PACKAGE_ROOTS[key] = project_root
+    package_root = _PACKAGE_ROOTS[key]
+    return None if package_root is None else (package_root, toolchain_profile(package_root))
+
+
+def binary(profile: dict, name: str) -> str:
+    """Path to run name with: the resolved binary, else the bare name (fails as not installed)."""
+    return profile["binaries"].get(name) or name
+
+
+def formatter_command(profile: dict, files: list) -> list:
+    """Write-in-place command line for the profile's formatter over files."""
+    if profile["formatter"] == "biome":
+        return [binary(profile, "biome"), "format", "--write", *files]
+    return [binary(profile, "prettier"), "--write", *files]
+
+
+def tool_fingerprint(profile: dict, tool: str) -> str:
+    """Identity of a tool's setup ("format" or a CHECKER_INPUTS key): its config files and binaries.
+
+    Built from the profile's watch key, so any change that re-detects the
+    profile and touches one of these changes the fingerprint.
+    """
+    import hashlib
+    import json
+
+    if tool == "format":
+        config_files = [
+            name for name in profile["configs"]
+            if name in FORMAT_CONFIG_FILES or name.startswith(PRETTIER_CONFIG_PREFIXES)
+        ]
+        executables = [profile["formatter"]]
+    else:
+        config_files, executables = CHECKER_INPUTS[tool]
+    stats = dict(zip(["PATH", ".", "node_modules/.bin", *profile["watched"]], profile["key"]))
+    paths = [p for p in (profile["binaries"].get(name) for name in executables) if p]
+    parts = [[name, stats.get(name)] for name in [*config_files, *paths]]
+    return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
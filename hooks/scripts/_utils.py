@@ -1,29 +1,97 @@
-"""Shared utilities for hook scripts."""
+"""Shared utilities for hook scripts.
+
+Only os and sys (plus _telemetry, which needs only time) are imported at
+module level; everything heavier is imported inside the function that needs
+it, so a hook's "nothing to do" path exits before paying for json, re or
+pathlib.
+"""
 
-import json
 import os
-import subprocess
 import sys
-from pathlib import Path
 
+from _telemetry import timed
 
-def find_project_root(file_path: str) -> str:
-    """Find git root, falling back to file's parent directory."""
+
+def tool_input_mentions(*needles: str) -> bool:
+    """Cheap pre-check on raw TOOL_INPUT before parsing it: does any needle appear?"""
+    tool_input_str = os.environ.get("TOOL_INPUT", "")
+    return any(needle in tool_input_str for needle in needles)
+
+
+def has_ancestor_path(start: str, relative: str) -> bool:
+    """True if start or any of its parent directories contains relative."""
+    current = os.path.abspath(start)
+    while True:
+        if os.path.exists(os.path.join(current, relative)):
+            return True
+        parent = os.path.dirname(current)
+        if parent == current:
+            return False
+        current = parent
+
+
+# Directory → enclosing git work tree root (None if outside any repo), per process
+_GIT_ROOT_CACHE: dict = {}
+
+
+def _is_git_marker(path: str) -> bool:
+    """A .git directory, or a gitfile ("gitdir: ...") as in worktrees and submodules."""
+    if os.path.isdir(path):
+        return True
     try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True, text=True,
-            cwd=str(Path(file_path).parent)
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return str(Path(file_path).parent)
+        with open(path, "rb") as f:
+            return f.read(8) == b"gitdir: "
+    except OSError:
+        return False
+
+
+def find_git_root(directory: str) -> "str | None":
+    """Nearest ancestor of directory (symlinks resolved) holding a .git marker.
+
+    Pure-Python equivalent of `git rev-parse --show-toplevel`. Every directory
+    visited on the way up is memoized, so repeat lookups cost a dict hit.
+    """
+    start = os.path.realpath(directory)
+    current = start
+    visited = []
+    while current not in _GIT_ROOT_CACHE:
+        visited.append(current)
+        if _is_git_marker(os.path.join(current, ".git")):
+            _GIT_ROOT_CACHE[current] = current
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            _GIT_ROOT_CACHE[current] = None
+            break
+        current = parent
+    root = _GIT_ROOT_CACHE[current]
+    for path in visited:
+        _GIT_ROOT_CACHE[path] = root
+    return root
+
+
+@timed("root")
+def resolve_project_root(directory: str) -> str:
+    """Project root for directory: $CLAUDE_PROJECT_DIR if directory is inside it,
+    else the enclosing git root, else directory itself."""
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", "")
+    if project_dir:
+        real_project = os.path.realpath(project_dir)
+        real_dir = os.path.realpath(directory)
+        if real_dir == real_project or real_dir.startswith(real_project.rstrip(os.sep) + os.sep):
+            return project_dir
+    return find_git_root(directory) or directory
+
+
+def find_project_root(file_path: str) -> str:
+    """Project root for an edited file, falling back to the file's parent directory."""
+    return resolve_project_root(os.path.dirname(file_path) or ".")
 
 
 def parse_tool_input() -> dict:
     """Parse TOOL_INPUT from environment. Returns empty dict on failure."""
+    import json
+
     tool_input_str = os.environ.get("TOOL_INPUT", "")
     try:
         return json.loads(tool_input_str) if tool_input_str else {}
@@ -31,9 +99,60 @@ def parse_tool_input() -> dict:
         return {}
 
 
+def parse_hook_payload(raw: str) -> dict:
+    """Parse a hook's JSON stdin payload. Returns {} if absent or invalid."""
+    import json
+
+    try:
+        payload = json.loads(raw) if raw.strip() else {}
+    except json.JSONDecodeError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
 def get_file_path_or_exit(tool_input: dict) -> str:
     """Extract file_path from tool input. Exits 0 if missing or invalid."""
     file_path = tool_input.get("file_path", "")
-    if not file_path or not Path(file_path).is_file():
+    if not file_path or not os.path.isfile(file_path):
         sys.exit(0)
     return file_path
+
+
+def stat_key(path: str) -> "list | None":
+    """(mtime_ns, size) of path as a JSON-friendly list; None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+# Resident workers and daemons (prettier, TypeScript, pyright, dmypy) exit after this idle time
+WORKER_IDLE_SECONDS = 10 * 60
+
+
+def project_state_path(kind: str, project_root: str, suffix: str) -> str:
+    """Per-project state file for a worker/daemon (hashed — Unix socket paths are short)."""
+    import hashlib
+
+    digest = hashlib.sha1(os.path.realpath(project_root).encode()).hexdigest()[:16]
+    return os.path.join(os.path.expanduser("~"), ".claude", "vorbit-workers", f"{kind}-{digest}{suffix}")
+
+
+def dirty_files_dir() -> str:
+    """Per-session sets of files awaiting deferred formatting (VORBIT_FORMAT_DEFERRED=1)."""
+    return os.path.join(os.path.expanduser("~"), ".claude", "vorbit-format", "dirty")
+
+
+def dirty_set_path(session_id: "str | None") -> str:
+    """Dirty set for one session: one absolute path per line, appended per edit."""
+    return os.path.join(dirty_files_dir(), os.path.basename(session_id or "unknown-session") + ".txt")
+
+
+@timed("io")
+def record_dirty_file(session_id: "str | None", file_path: str) -> None:
+    """Append file_path to the session's dirty set (O_APPEND: safe across concurrent hooks)."""
+    path = dirty_set_path(session_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(os.path.abspath(file_path) + "\n")
@@ -0,0 +1,216 @@
+"""Background validation (VORBIT_VALIDATE_ASYNC=1): one job per edited file, failures in a mailbox.
+
+start_job() cancels the file's previous job and runs this module detached:
+`python3 _validation_jobs.py PROJECT_ROOT FILE TOKEN SESSION_ROOT`, where
+SESSION_ROOT is the root of the directory the editing hook ran in. The job
+runs the regular validate stage (post_edit_validate.validate_edited_file,
+so the verdict also lands in the result cache), then — unless a newer job
+for the file took over meanwhile — leaves a failure in the mailbox, one
+file per project and edited file under ~/.claude/vorbit-validate/mailbox/,
+or clears the file's old one. A cancelled job (SIGTERM) kills its checker's
+process group first. Each job inherits an flock on jobs/<name>-<token>.lock,
+taken before it is spawned and released by the kernel when it exits, so a
+job is only signalled while it still runs, never a later process reusing
+its pid.
+
+finished_failures() hands a root's failures to the next post-edit hook or
+to report_validation.py at Stop: those of files under that project root,
+and those of edits made from it (a nested repo, a submodule, a file outside
+the tree), dropping failures for content that has since been edited again.
+"""
+
+import os
+
+
+def validate_dir() -> str:
+    return os.path.join(os.path.expanduser("~"), ".claude", "vorbit-validate")
+
+
+def mailbox_dir() -> str:
+    """Finished failures, one JSON file per project and edited file."""
+    return os.path.join(validate_dir(), "mailbox")
+
+
+def _jobs_dir() -> str:
+    """Latest job per project and edited file: {"token", "pid"}, and the running jobs' locks."""
+    return os.path.join(validate_dir(), "jobs")
+
+
+def _lock_path(name: str, token: str) -> str:
+    return os.path.join(_jobs_dir(), f"{name}-{token}.lock")
+
+
+def _digest(path: str) -> str:
+    import hashlib
+
+    return hashlib.sha1(path.encode()).hexdigest()[:16]
+
+
+def job_name(project_root: str, file_path: str) -> str:
+    """<project digest>-<file digest>: names the file's job and mailbox entry."""
+    return f"{_digest(os.path.realpath(project_root))}-{_digest(os.path.abspath(file_path))}"
+
+
+def _read_json(path: str) -> dict:
+    import json
+
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_json(path: str, data: dict) -> None:
+    import json
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _stop_job(name: str, job: dict) -> None:
+    """SIGTERM a previous job if its lock is still held, then drop the lock file."""
+    import fcntl
+    import signal
+
+    token, pid = job.get("token"), job.get("pid")
+    if not isinstance(token, str):
+        return
+    lock = _lock_path(name, token)
+    try:
+        fd = os.open(lock, os.O_WRONLY)
+    except OSError:
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        if isinstance(pid, int):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                pass
+    finally:
+        os.close(fd)
+    try:
+        os.unlink(lock)
+    except FileNotFoundError:
+        pass
+
+
+def start_job(project_root: str, file_path: str) -> None:
+    """Validate file_path in the background, cancelling a still-running job for the same file."""
+    import fcntl
+    import subprocess
+    import sys
+    import time
+
+    from _utils import resolve_project_root
+
+    name = job_name(project_root, file_path)
+    job_file = os.path.join(_jobs_dir(), name + ".json")
+    _stop_job(name, _read_json(job_file))
+
+    # The token is written before the job starts, so even a job finishing at once finds itself current
+    token = f"{os.getpid()}-{time.time_ns()}"
+    _write_json(job_file, {"token": token})
+    env = {k: v for k, v in os.environ.items() if k != "VORBIT_VALIDATE_ASYNC"}
+    fd = os.open(_lock_path(name, token), os.O_CREAT | os.O_WRONLY, 0o600)
+    try:
+        # The job inherits the locked descriptor; closing ours leaves the lock with the job alone
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        proc = subprocess.Popen(
+            [
+                sys.executable, os.path.abspath(__file__),
+                project_root, os.path.abspath(file_path), token, resolve_project_root(os.getcwd()),
+            ],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            cwd=project_root, env=env, start_new_session=True, pass_fds=(fd,),
+        )
+    finally:
+        os.close(fd)
+    _write_json(job_file, {"token": token, "pid": proc.pid})
+
+
+def run_job(project_root: str, file_path: str, token: str, session_root: str) -> None:
+    import signal
+
+    from _deadline import stop_running
+    from _result_cache import content_hash
+    from post_edit_validate import validate_edited_file
+
+    # SIGTERM from a newer edit: stop the checker's process group and exit without reporting
+    signal.signal(signal.SIGTERM, stop_running)
+    content = content_hash(file_path)
+    result = validate_edited_file(project_root, file_path)
+    # Past this point the verdict is settled; a newer job simply finds the token replaced
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    name = job_name(project_root, file_path)
+    job_file = os.path.join(_jobs_dir(), name + ".json")
+    if _read_json(job_file).get("token") != token:
+        return
+    entry = os.path.join(mailbox_dir(), name + ".json")
+    if result is not None and result["returncode"]:
+        _write_json(entry, {
+            "project": project_root, "session": session_root,
+            "file": file_path, "content": content, "result": result,
+        })
+    else:
+        try:
+            os.unlink(entry)
+        except FileNotFoundError:
+            pass
+    for path in (job_file, _lock_path(name, token)):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def finished_failures(root: str) -> "dict | None":
+    """Take root's finished failures out of the mailbox → one result (exit 2), None if none.
+
+    root's failures are those of files under project root `root` and of
+    edits made from it. A failure is dropped unreported once its file
+    changed: the job for the newer content reports that.
+    """
+    from _result_cache import content_hash
+
+    try:
+        names = sorted(os.listdir(mailbox_dir()))
+    except FileNotFoundError:
+        return None
+    root = os.path.realpath(root)
+    reports = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(mailbox_dir(), name)
+        entry = _read_json(path)
+        roots = {os.path.realpath(entry[key]) for key in ("project", "session") if isinstance(entry.get(key), str)}
+        if roots and root not in roots:
+            continue
+        try:
+            os.unlink(path)  # whoever unlinks it reports it
+        except FileNotFoundError:
+            continue
+        try:
+            if content_hash(entry["file"]) != entry["content"]:
+                continue
+            result = entry["result"]
+            reports.append(f"Background validation of {entry['file']} failed:\n{result['stdout']}{result['stderr']}")
+        except (OSError, KeyError, TypeError):
+            continue
+    if not reports:
+        return None
+    return {"returncode": 2, "stdout": "", "stderr": "\n".join(reports)}
+
+
+if __name__ == "__main__":
+    import sys
+
+    run_job(*sys.argv[1:5])
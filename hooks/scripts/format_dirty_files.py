@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Stop hook - formats the session's edited files in one batch (VORBIT_FORMAT_DEFERRED=1).
+
+post_edit_format records each edited path in a per-session dirty set instead
+of starting a formatter per edit; this runs one `biome format --write f1 f2
+...` / `prettier --write ...` per package over the unique set, leaving out
+files whose content is already formatted (see _result_cache.py). A file's
+package is its nearest enclosing one with a formatter set up (see
+_toolchain.package_profile). All batches share VORBIT_FORMAT_BATCH_TIMEOUT
+seconds (see _deadline.py).
+Exit code: always 0 (never blocks).
+"""
+
+import os
+import sys
+import time
+
+from _daemon_client import forward_to_daemon
+from _deadline import Deadline, DeadlineExceeded
+from _telemetry import HookTimer
+from _toolchain import formatter_command, package_profile, toolchain_profile
+from _utils import dirty_files_dir, dirty_set_path, find_project_root, parse_hook_payload
+
+# Dirty sets of sessions that never reached Stop are dropped after this long
+DIRTY_SET_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+
+def prune_stale_dirty_sets(directory: str) -> None:
+    cutoff = time.time() - DIRTY_SET_MAX_AGE_SECONDS
+    for entry in os.scandir(directory):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def claim_dirty_set(dirty: str, claimed: str) -> None:
+    """Move the dirty set to claimed, appending it to a claimed set left by an interrupted run."""
+    if not os.path.exists(claimed):
+        os.replace(dirty, claimed)
+        return
+    moving = f"{claimed}.{os.getpid()}"
+    try:
+        os.replace(dirty, moving)
+    except FileNotFoundError:
+        return
+    with open(moving) as src, open(claimed, "a") as dst:
+        dst.write("\n" + src.read())
+    os.unlink(moving)
+
+
+def read_dirty_set(path: str) -> list:
+    try:
+        with open(path) as f:
+            return [line.strip() for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def main():
+    payload = parse_hook_payload(sys.stdin.read())
+    dirty = dirty_set_path(payload.get("session_id"))
+    dry_run = os.environ.get("DRY_RUN") == "1"
+
+    # Claim the set so edits made while formatting start a fresh one; a dry run reads both in place
+    claimed = dirty + ".formatting"
+    try:
+        if not dry_run:
+            claim_dirty_set(dirty, claimed)
+        paths = list(dict.fromkeys(read_dirty_set(claimed) + (read_dirty_set(dirty) if dry_run else [])))
+    except OSError:
+        sys.exit(0)
+    finally:
+        prune_stale_dirty_sets(dirty_files_dir())
+
+    by_root: dict[str, list[str]] = {}
+    for path in paths:
+        package = package_profile(find_project_root(path), path, "format") if os.path.isfile(path) else None
+        if package is not None:
+            by_root.setdefault(package[0], []).append(path)
+
+    from _result_cache import format_cache
+
+    use_server = os.environ.get("VORBIT_FORMAT_SERVER") == "1"
+    deadline = Deadline("format_batch")
+    for project_root, files in by_root.items():
+        profile = toolchain_profile(project_root)
+        cache = format_cache(project_root, profile)
+        files = [path for path in files if cache.get(cache.key(path)) is None]
+        if not files:
+            continue
+        if dry_run:
+            print(f"[DRY_RUN] Would run: {' '.join(formatter_command(profile, files))}")
+            continue
+        formatted = []
+        if profile["formatter"] == "prettier" and use_server:
+            from _node_worker import format_with_server
+
+            formatted = [path for path in files if format_with_server(project_root, path, deadline.remaining())]
+            files = [path for path in files if path not in formatted]
+
+        try:
+            if files:
+                result = deadline.run(formatter_command(profile, files), cwd=project_root)
+                formatted += files if result.returncode == 0 else []
+        except FileNotFoundError:
+            pass
+        except DeadlineExceeded as e:
+            print(e, file=sys.stderr)
+            break
+        for path in formatted:
+            cache.put(cache.key(path), {"formatted": True})
+
+    if not dry_run:
+        os.unlink(claimed)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    # Fast path: deferred mode off or nothing edited — no dirty sets at all
+    if not os.path.isdir(dirty_files_dir()) or not os.listdir(dirty_files_dir()):
+        sys.exit(0)
+    forward_to_daemon("format_dirty_files")
+    with HookTimer("format_dirty_files"):
+        try:
+            main()
+        except Exception:
+            sys.exit(0)
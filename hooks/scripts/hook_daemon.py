@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Optional hook daemon - serves hook events over a Unix socket without interpreter startup.
+
+Usage: python3 hook_daemon.py start | serve | stop | status
+  start  - run in the background (detached)
+  serve  - run in the foreground
+  stop   - SIGTERM the running daemon
+  status - print whether it is running
+
+Hook modules are imported once and kept warm (including the learn hooks'
+compiled keyword matcher). Each request is served in a forked child that
+takes the client's env, cwd, argv and stdin, runs the hook's main(), and
+returns its exit code plus everything written to fd 1/2 — so a long tsc
+run never blocks other sessions' hooks. Modules are re-imported when any
+hook source file changes.
+
+Only imports and the keyword matcher stay warm. Project-root lookups and
+toolchain/package detection are memoized in the child and discarded when
+it exits: those memos have no invalidation (they assume a short-lived
+hook process), and their persisted layers (the toolchain profile under
+~/.claude/vorbit-workers/) already make a cold lookup a handful of
+stat calls. Exits after --idle-timeout seconds without
+requests. Hook scripts fall back to in-process runs when it is not running.
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from _daemon_client import socket_path
+
+# Plugin root: hook_daemon.py → scripts/ → hooks/ → plugin root
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent.parent
+
+HOOKS = {
+    "pre_push_warning": PLUGIN_ROOT / "hooks" / "scripts" / "pre_push_warning.py",
+    "post_edit": PLUGIN_ROOT / "hooks" / "scripts" / "post_edit.py",
+    "post_edit_format": PLUGIN_ROOT / "hooks" / "scripts" / "post_edit_format.py",
+    "post_edit_validate": PLUGIN_ROOT / "hooks" / "scripts" / "post_edit_validate.py",
+    "format_dirty_files": PLUGIN_ROOT / "hooks" / "scripts" / "format_dirty_files.py",
+    "report_validation": PLUGIN_ROOT / "hooks" / "scripts" / "report_validation.py",
+    "loop_controller": PLUGIN_ROOT / "skills" / "implement-loop" / "hooks" / "loop_controller.py",
+    "stop_learn_reflect": PLUGIN_ROOT / "skills" / "learn" / "hooks" / "stop_learn_reflect.py",
+}
+
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+
+def _source_files() -> list[Path]:
+    """Hook scripts plus the shared helper modules they import."""
+    dirs = {path.parent for path in HOOKS.values()}
+    return sorted(p for d in dirs for p in d.glob("*.py"))
+
+
+def _source_signature() -> tuple:
+    return tuple((str(p), p.stat().st_mtime_ns) for p in _source_files())
+
+
+def load_hook_modules() -> dict[str, Any]:
+    """(Re-)import every hook module and its helpers; warm the learn keyword matcher."""
+    for path in _source_files():
+        sys.modules.pop(path.stem, None)
+    for directory in {str(path.parent) for path in HOOKS.values()}:
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+
+    modules = {}
+    for name, path in HOOKS.items():
+        spec = importlib.util.spec_from_file_location(f"vorbit_hook_{name}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        modules[name] = module
+
+    try:
+        learn_utils = sys.modules["_learn_utils"]
+        rules_source = PLUGIN_ROOT / "skills" / "learn" / "vorbit-learning-rules.md"
+        learn_utils.build_keyword_matcher(rules_source.read_text())
+    except Exception:
+        pass
+    return modules
+
+
+def run_hook_in_child(module: Any, request: dict[str, Any]) -> dict[str, Any]:
+    """Run module.main() as if it were the hook process described by request.
+
+    Only called in a forked child: it replaces the process env, cwd, argv
+    and stdin, and points fd 1/2 at temp files so output from the hook and
+    any subprocess it spawns is captured.
+    """
+    os.environ.clear()
+    os.environ.update(request.get("env", {}))
+    os.chdir(request.get("cwd") or "/")
+    sys.argv = [module.__file__, *request.get("argv", [])]
+    sys.stdin = io.StringIO(request.get("stdin", ""))
+
+    captured = {}
+    saved = {}
+    for fd, name in ((1, "stdout"), (2, "stderr")):
+        getattr(sys, name).flush()
+        saved[fd] = os.dup(fd)
+        captured[fd] = tempfile.TemporaryFile()
+        os.dup2(captured[fd].fileno(), fd)
+
+    try:
+        # The copy of _telemetry the hook's helpers were loaded with, so their phases land in this record
+        with sys.modules["_telemetry"].HookTimer(request["hook"]):
+            module.main()
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        # Same contract as every hook's __main__ guard: unexpected errors never block
+        exit_code = 0
+
+    output = {}
+    for fd, name in ((1, "stdout"), (2, "stderr")):
+        getattr(sys, name).flush()
+        os.dup2(saved[fd], fd)
+        os.close(saved[fd])
+        captured[fd].seek(0)
+        output[name] = captured[fd].read().decode(errors="replace")
+        captured[fd].close()
+    return {"exit_code": exit_code, **output}
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            module = self.server.modules[request["hook"]]
+        except (ValueError, KeyError, TypeError):
+            self.wfile.write(json.dumps({"error": "unknown request"}).encode())
+            return
+        response = run_hook_in_child(module, request)
+        self.wfile.write(json.dumps(response).encode())
+
+
+class HookDaemon(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    def __init__(self, path: str, idle_timeout: float):
+        self.modules = load_hook_modules()
+        self.signature = _source_signature()
+        self.timeout = idle_timeout
+        self.idle = False
+        # Bind with the socket already owner-only: no window where other users can connect
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(path, HookRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def process_request(self, request, client_address):
+        # Reload in the parent so every later child inherits fresh modules
+        signature = _source_signature()
+        if signature != self.signature:
+            self.modules = load_hook_modules()
+            self.signature = signature
+        super().process_request(request, client_address)
+
+    def handle_timeout(self):
+        super().handle_timeout()
+        self.idle = True
+
+
+def _pid_file(path: str) -> Path:
+    return Path(path + ".pid")
+
+
+def _running_pid(path: str):
+    """PID of a live daemon for this socket, or None."""
+    try:
+        pid = int(_pid_file(path).read_text())
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        return None
+    return pid
+
+
+def serve(path: str, idle_timeout: float) -> None:
+    if _running_pid(path):
+        print(f"hook daemon already running on {path}")
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket from a daemon that did not clean up
+
+    server = HookDaemon(path, idle_timeout)
+    _pid_file(path).write_text(str(os.getpid()))
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while not server.idle:
+            server.handle_request()
+    finally:
+        server.server_close()
+        for leftover in (Path(path), _pid_file(path)):
+            leftover.unlink(missing_ok=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="vorbit hook daemon")
+    parser.add_argument("command", choices=["start", "serve", "stop", "status"])
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    args = parser.parse_args(argv)
+    path = socket_path()
+    pid = _running_pid(path)
+
+    if args.command == "status":
+        print(f"running (pid {pid}) on {path}" if pid else "not running")
+    elif args.command == "stop":
+        if pid:
+            os.kill(pid, signal.SIGTERM)
+        print("stopped" if pid else "not running")
+    elif args.command == "start":
+        if pid:
+            print(f"already running (pid {pid}) on {path}")
+            return
+        subprocess.Popen(
+            [sys.executable, __file__, "serve", "--idle-timeout", str(args.idle_timeout)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        print(f"started on {path}")
+    else:
+        if not hasattr(socket, "AF_UNIX"):
+            sys.exit("hook daemon needs Unix domain sockets")
+        serve(path, args.idle_timeout)
+
+
+if __name__ == "__main__":
+    main()
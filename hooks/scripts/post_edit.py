@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""PostToolUse hook - formats, then validates, the edited file in one process.
+
+Parses TOOL_INPUT and resolves the project root once, then runs the two
+stages in order: post_edit_format's format stage (never blocks; its
+failures are swallowed) and post_edit_validate's validate stage (may block
+with the checker's exit code). Validation sees the formatted file, and the
+edit costs one interpreter instead of two.
+"""
+
+import sys
+
+from _daemon_client import forward_to_daemon
+from _telemetry import HookTimer
+from _utils import (
+    find_project_root,
+    get_file_path_or_exit,
+    parse_hook_payload,
+    parse_tool_input,
+    tool_input_mentions,
+)
+from post_edit_format import format_edited_file
+from post_edit_validate import exit_with, validate_edited_file
+
+
+def main():
+    tool_input = parse_tool_input()
+    if not tool_input:
+        sys.exit(0)
+
+    file_path = get_file_path_or_exit(tool_input)
+    project_root = find_project_root(file_path)
+    # PostToolUse stdin payload carries the session id (deferred formatting records per session)
+    session_id = parse_hook_payload(sys.stdin.read()).get("session_id")
+
+    try:
+        format_edited_file(project_root, file_path, session_id)
+    except Exception:
+        pass  # formatting never blocks, and never keeps validation from running
+    exit_with(validate_edited_file(project_root, file_path))
+
+
+if __name__ == "__main__":
+    # Fast path: no file in the tool input, nothing to format or validate
+    if not tool_input_mentions('"file_path"'):
+        sys.exit(0)
+    forward_to_daemon("post_edit")
+    with HookTimer("post_edit"):
+        try:
+            main()
+        except Exception:
+            sys.exit(0)
@@ -4,61 +4,95 @@
 Priority: biome > prettier. Exit code: always 0 (never blocks).
 """
 
-import json
 import os
-import subprocess
 import sys
-from pathlib import Path
 
-from _utils import find_project_root, get_file_path_or_exit, parse_tool_input
+from _daemon_client import forward_to_daemon
+from _deadline import Deadline, DeadlineExceeded
+from _telemetry import HookTimer
+from _toolchain import formatter_command, package_profile
+from _utils import (
+    find_project_root,
+    get_file_path_or_exit,
+    parse_hook_payload,
+    parse_tool_input,
+    record_dirty_file,
+    tool_input_mentions,
+)
 
 
-def main():
-    tool_input = parse_tool_input()
-    if not tool_input:
-        sys.exit(0)
+def format_edited_file(project_root: str, file_path: str, session_id: "str | None") -> None:
+    """Format stage: format file_path in place (or defer it), never blocking the edit."""
+    package = package_profile(project_root, file_path, "format")
+    if package is None:
+        return
+    package_root, profile = package
 
-    file_path = get_file_path_or_exit(tool_input)
-    project_root = find_project_root(file_path)
     dry_run = os.environ.get("DRY_RUN") == "1"
+    deferred = os.environ.get("VORBIT_FORMAT_DEFERRED") == "1"
+    use_server = profile["formatter"] == "prettier" and os.environ.get("VORBIT_FORMAT_SERVER") == "1"
+    command = formatter_command(profile, [file_path])
+
+    from _result_cache import format_cache
 
-    # Biome (highest priority)
-    if Path(project_root, "biome.json").exists() or Path(project_root, "biome.jsonc").exists():
+    cache = format_cache(package_root, profile)
+    if cache.get(cache.key(file_path)) is not None:
         if dry_run:
-            print(f"[DRY_RUN] Would run: biome format --write {file_path}")
+            print(f"[DRY_RUN] Already formatted, would skip: {' '.join(command)}")
         else:
-            try:
-                subprocess.run(["biome", "format", "--write", file_path], capture_output=True)
-            except FileNotFoundError:
-                pass
-        sys.exit(0)
+            cache.save()
+        return
 
-    # Prettier
-    prettierrc_exists = any(Path(project_root).glob(".prettierrc*"))
-    prettier_in_package = False
-    package_json = Path(project_root, "package.json")
-    if package_json.exists():
-        try:
-            pkg = json.loads(package_json.read_text())
-            prettier_in_package = "prettier" in pkg
-        except Exception:
-            pass
-
-    if prettierrc_exists or prettier_in_package:
-        if dry_run:
-            print(f"[DRY_RUN] Would run: prettier --write {file_path}")
+    if dry_run:
+        if deferred:
+            print(f"[DRY_RUN] Would defer to Stop: {' '.join(command)}")
         else:
-            try:
-                subprocess.run(["prettier", "--write", file_path], capture_output=True)
-            except FileNotFoundError:
-                pass
+            via = " (via prettier server)" if use_server else ""
+            print(f"[DRY_RUN] Would run: {' '.join(command)}{via}")
+        return
+
+    if deferred:
+        record_dirty_file(session_id, file_path)
+        return
+
+    deadline = Deadline("format")
+    if use_server:
+        from _node_worker import format_with_server
+
+        if format_with_server(package_root, file_path, deadline.remaining()):
+            cache.put(cache.key(file_path), {"formatted": True})
+            return
+
+    try:
+        result = deadline.run(command, cwd=package_root)
+    except FileNotFoundError:
+        return
+    except DeadlineExceeded as e:
+        print(e, file=sys.stderr)
+        return
+    if result.returncode == 0:
+        cache.put(cache.key(file_path), {"formatted": True})
+
+
+def main():
+    tool_input = parse_tool_input()
+    if not tool_input:
         sys.exit(0)
 
+    file_path = get_file_path_or_exit(tool_input)
+    # PostToolUse stdin payload carries the session id (deferred mode records per session)
+    session_id = parse_hook_payload(sys.stdin.read()).get("session_id")
+    format_edited_file(find_project_root(file_path), file_path, session_id)
     sys.exit(0)
 
 
 if __name__ == "__main__":
-    try:
-        main()
-    except Exception:
+    # Fast path: no file in the tool input, nothing to format
+    if not tool_input_mentions('"file_path"'):
         sys.exit(0)
+    forward_to_daemon("post_edit_format")
+    with HookTimer("post_edit_format"):
+        try:
+            main()
+        except Exception:
+            sys.exit(0)
@@ -5,13 +5,214 @@ Priority: TypeScript > Python > Go. Blocks on validation errors (exit non-zero).
 Exits 0 silently if no validator found or on unexpected errors.
 """
 
-import json
 import os
-import subprocess
 import sys
-from pathlib import Path
 
-from _utils import find_project_root, get_file_path_or_exit, parse_tool_input
+from _daemon_client import forward_to_daemon
+from _deadline import Deadline, DeadlineExceeded
+from _syntax import check_python_syntax, check_syntax, python_parses
+from _telemetry import HookTimer
+from _toolchain import CHECKER_SOURCES, binary, package_profile, tool_fingerprint, toolchain_profile
+from _utils import (
+    WORKER_IDLE_SECONDS,
+    find_project_root,
+    get_file_path_or_exit,
+    parse_tool_input,
+    project_state_path,
+    tool_input_mentions,
+)
+from _validation_jobs import finished_failures, start_job
+
+# Extensions with a validator below or a syntax check; edits to anything else exit immediately
+VALIDATED_EXTENSIONS = ("ts", "tsx", "py", "go", "json", "jsonc")
+
+# Extension → checker (a _toolchain.CHECKER_INPUTS key)
+EXTENSION_CHECKERS = {"ts": "typescript", "tsx": "typescript", "py": "python", "go": "go"}
+
+DRY_RUN_COMMANDS = {
+    "typescript": ("tsc --noEmit", " (via TypeScript server: edited file + direct and indirect importers)"),
+    "python": ("mypy or pyright {file}", " (via dmypy / pyright server)"),
+    "go": ("go build <edited package> <packages importing it>", ""),
+}
+
+
+def run_command(command: list, deadline: Deadline, cwd: "str | None" = None) -> "dict | None":
+    """Run a checker, capturing its output for replay; None if it is not installed."""
+    try:
+        result = deadline.run(command, cwd=cwd, text=True)
+    except FileNotFoundError:
+        return None
+    return {"returncode": result.returncode, "stdout": result.stdout, "stderr": result.stderr}
+
+
+def worker_result(response: "dict | None") -> "dict | None":
+    """A resident worker's verdict: its errors on stderr with exit 2, or clean. None if it gave none."""
+    if response is None or "diagnostics" not in response:
+        return None
+    if response["diagnostics"]:
+        return {"returncode": 2, "stdout": "", "stderr": "\n".join(response["diagnostics"]) + "\n"}
+    return {"returncode": 0, "stdout": "", "stderr": ""}
+
+
+def mypy_config(project_root: str) -> list:
+    """mypy options pinning the package's config (mypy only runs where pyproject.toml has [tool.mypy])."""
+    return ["--config-file", os.path.join(project_root, "pyproject.toml")]
+
+
+def mypy_targets(project_root: str, file_path: str) -> list:
+    """file_path, then the project files importing its module (just file_path if the tree cannot be read)."""
+    from _py_graph import importers_of
+
+    try:
+        importers = importers_of(project_root, file_path)
+    except (OSError, ValueError, KeyError, TypeError):
+        importers = []
+    return [os.path.abspath(file_path), *importers]
+
+
+def run_dmypy(project_root: str, files: list, dmypy: str, deadline: Deadline) -> "dict | None":
+    """Check files with the project's mypy daemon; None if dmypy is unavailable.
+
+    `dmypy run` starts the daemon on first use and re-checks incrementally
+    afterwards; --timeout shuts it down when idle. The status file lives
+    under ~/.claude so nothing is written into the project.
+    """
+    status_file = project_state_path("dmypy", project_root, ".json")
+    os.makedirs(os.path.dirname(status_file), exist_ok=True)
+    command = [
+        dmypy, "--status-file", status_file,
+        "run", "--timeout", str(WORKER_IDLE_SECONDS), "--", *mypy_config(project_root), *files,
+    ]
+    result = run_command(command, deadline, cwd=project_root)
+    # mypy reports type errors as 1; 2 means the daemon itself failed
+    return None if result is None or result["returncode"] == 2 else result
+
+
+def check_typescript(
+    project_root: str, file_path: str, profile: dict, deadline: Deadline, use_server: bool
+) -> "dict | None":
+    if use_server:
+        from _node_worker import call_worker
+
+        result = worker_result(
+            call_worker("typescript", project_root, {"file": os.path.abspath(file_path)}, timeout=deadline.remaining())
+        )
+        if result is not None:
+            return result
+    tsconfig = os.path.join(project_root, "tsconfig.json")
+    return run_command([binary(profile, "tsc"), "--noEmit", "-p", tsconfig], deadline, cwd=project_root)
+
+
+def check_python(
+    project_root: str, file_path: str, profile: dict, deadline: Deadline, use_server: bool
+) -> "dict | None":
+    result = None
+    if profile["mypy"]:
+        # A module that does not parse stops mypy before its importers are checked
+        files = mypy_targets(project_root, file_path) if python_parses(file_path) else [os.path.abspath(file_path)]
+        if use_server:
+            result = run_dmypy(project_root, files, binary(profile, "dmypy"), deadline)
+        result = result or run_command(
+            [binary(profile, "mypy"), *mypy_config(project_root), *files], deadline, cwd=project_root
+        )
+    if result is None and use_server:
+        from _node_worker import call_worker
+
+        result = worker_result(
+            call_worker("pyright", project_root, {"file": os.path.abspath(file_path)}, timeout=deadline.remaining())
+        )
+    return result or run_command([binary(profile, "pyright"), os.path.abspath(file_path)], deadline, cwd=project_root)
+
+
+def check_go(
+    project_root: str, file_path: str, profile: dict, deadline: Deadline, use_server: bool
+) -> "dict | None":
+    # Only the edited package and its reverse dependencies can break
+    import subprocess
+
+    from _go_graph import packages_to_check
+
+    go = binary(profile, "go")
+    try:
+        packages = packages_to_check(go, project_root, file_path, deadline)
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        packages = ["./..."]
+    if not packages:
+        return {"returncode": 0, "stdout": "", "stderr": ""}
+    # go build skips _test.go files; vet compiles the package's tests too
+    if file_path.endswith("_test.go"):
+        return run_command([go, "vet", packages[0]], deadline, cwd=project_root)
+    return run_command([go, "build", *packages], deadline, cwd=project_root)
+
+
+CHECKERS = {"typescript": check_typescript, "python": check_python, "go": check_go}
+
+
+def exit_with(result: "dict | None") -> None:
+    """Replay a checker's output and exit with its code (0 if there was no verdict)."""
+    if result is None:
+        sys.exit(0)
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    sys.exit(result["returncode"])
+
+
+def validate_edited_file(project_root: str, file_path: str) -> "dict | None":
+    """Validate stage: the checker verdict for file_path, None if nothing checked it.
+
+    In background mode, a verdict not in the cache is left to a background
+    job and the project's finished failures (if any) are returned instead.
+    A syntax error is returned at once, in either mode.
+    """
+    syntax_error = check_syntax(file_path)
+    if syntax_error is not None:
+        return syntax_error
+    checker = EXTENSION_CHECKERS.get(os.path.splitext(file_path)[1].lstrip("."))
+    package = package_profile(project_root, file_path, checker) if checker else None
+    if checker == "python":
+        target = (package[1] if package else toolchain_profile(project_root))["python_target"]
+        syntax_error = check_python_syntax(file_path, target)
+        if syntax_error is not None:
+            return syntax_error
+    background = os.environ.get("VORBIT_VALIDATE_ASYNC") == "1"
+    if package is None:
+        return finished_failures(project_root) if background else None
+    package_root, profile = package
+
+    from _result_cache import ResultCache
+
+    fingerprint = tool_fingerprint(profile, checker)
+    cache = ResultCache("validate", package_root, checker, fingerprint, CHECKER_SOURCES[checker])
+    key = cache.key(file_path)
+    cached = cache.get(key)
+    use_server = os.environ.get("VORBIT_VALIDATE_SERVER") == "1"
+
+    if os.environ.get("DRY_RUN") == "1":
+        if cached is not None:
+            print(f"[DRY_RUN] Would replay cached {checker} result (exit {cached['returncode']})")
+        else:
+            command, via = DRY_RUN_COMMANDS[checker]
+            where = " in the background" if background else ""
+            print(f"[DRY_RUN] Would run{where}: {command.format(file=file_path)}{via if use_server else ''}")
+        return None
+
+    if cached is not None:
+        cache.save()
+        return cached
+
+    if background:
+        start_job(project_root, file_path)
+        return finished_failures(project_root)
+
+    try:
+        result = CHECKERS[checker](package_root, file_path, profile, Deadline("validate"), use_server)
+    except DeadlineExceeded as e:
+        # Report and let the edit through; the timeout is logged for tuning VORBIT_VALIDATE_TIMEOUT
+        print(e, file=sys.stderr)
+        return None
+    if result is not None:
+        cache.put(key, result)
+    return result
 
 
 def main():
@@ -20,64 +221,16 @@ def main():
         sys.exit(0)
 
     file_path = get_file_path_or_exit(tool_input)
-    project_root = find_project_root(file_path)
-    file_ext = Path(file_path).suffix.lstrip(".")
-    dry_run = os.environ.get("DRY_RUN") == "1"
-
-    # TypeScript validation
-    if Path(project_root, "tsconfig.json").exists() and file_ext in ("ts", "tsx"):
-        if dry_run:
-            print("[DRY_RUN] Would run: tsc --noEmit")
-            sys.exit(0)
-        try:
-            result = subprocess.run(["tsc", "--noEmit"], cwd=project_root)
-            sys.exit(result.returncode)
-        except FileNotFoundError:
-            sys.exit(0)
-
-    # Python validation (mypy or pyright)
-    pyproject = Path(project_root, "pyproject.toml")
-    if pyproject.exists() and file_ext == "py":
-        try:
-            content = pyproject.read_text()
-            has_mypy = "[tool.mypy]" in content
-            has_pyright = "[tool.pyright]" in content
-        except Exception:
-            has_mypy = has_pyright = False
-
-        if has_mypy or has_pyright:
-            if dry_run:
-                print(f"[DRY_RUN] Would run: mypy or pyright {file_path}")
-                sys.exit(0)
-            if has_mypy:
-                try:
-                    result = subprocess.run(["mypy", file_path])
-                    sys.exit(result.returncode)
-                except FileNotFoundError:
-                    pass
-            try:
-                result = subprocess.run(["pyright", file_path])
-                sys.exit(result.returncode)
-            except FileNotFoundError:
-                pass
-        sys.exit(0)
-
-    # Go validation
-    if Path(project_root, "go.mod").exists() and file_ext == "go":
-        if dry_run:
-            print("[DRY_RUN] Would run: go build ./...")
-            sys.exit(0)
-        try:
-            result = subprocess.run(["go", "build", "./..."], cwd=project_root)
-            sys.exit(result.returncode)
-        except FileNotFoundError:
-            sys.exit(0)
-
-    sys.exit(0)
+    exit_with(validate_edited_file(find_project_root(file_path), file_path))
 
 
 if __name__ == "__main__":
-    try:
-        main()
-    except Exception:
+    # Fast path: the JSON-encoded file_path ends in a validated extension or we are done
+    if not tool_input_mentions(*(f'.{ext}"' for ext in VALIDATED_EXTENSIONS)):
         sys.exit(0)
+    forward_to_daemon("post_edit_validate")
+    with HookTimer("post_edit_validate"):
+        try:
+            main()
+        except Exception:
+            sys.exit(0)
@@ -1,23 +1,21 @@
 #!/usr/bin/env python3
 """PreToolUse hook - warns before git push commands. Never blocks (always exits 0)."""
 
-import json
-import os
-import re
 import sys
 
+from _daemon_client import forward_to_daemon
+from _telemetry import HookTimer
+from _utils import parse_tool_input, tool_input_mentions
 
-def main():
-    tool_input_str = os.environ.get("TOOL_INPUT", "")
-    try:
-        tool_input = json.loads(tool_input_str) if tool_input_str else {}
-    except json.JSONDecodeError:
-        sys.exit(0)
 
+def main():
+    tool_input = parse_tool_input()
     command = tool_input.get("command", "")
     if not command:
         sys.exit(0)
 
+    import re
+
     if re.match(r"^git\s+push", command):
         print("⚠️  About to push to remote repository")
         print(f"   Command: {command}")
@@ -27,7 +25,12 @@ def main():
 
 
 if __name__ == "__main__":
-    try:
-        main()
-    except Exception:
+    # Fast path: almost no Bash call is a git command — skip parsing and the daemon
+    if not tool_input_mentions("git"):
         sys.exit(0)
+    forward_to_daemon("pre_push_warning")
+    with HookTimer("pre_push_warning"):
+        try:
+            main()
+        except Exception:
+            sys.exit(0)
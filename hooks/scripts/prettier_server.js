@@ -0,0 +1,43 @@
+#!/usr/bin/env node
+// Resident prettier worker for post_edit_format.py (VORBIT_FORMAT_SERVER=1).
+//
+// Usage: node prettier_server.js <socket> <project-root> <idle-ms>
+//
+// Loads the project's own prettier once and formats files in place on
+// request: {"file": "/abs/path"} → {"ok": true} or {"error": "..."}.
+// Exits 1 before listening if prettier cannot be loaded, so the hook falls
+// back to a one-shot `prettier --write`.
+
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const { serve } = require("./_node_worker");
+
+const [socketPath, projectRoot, idleMs] = process.argv.slice(2);
+
+let prettier;
+try {
+  prettier = require(require.resolve("prettier", { paths: [projectRoot] }));
+} catch (err) {
+  process.exit(1);
+}
+
+const ignorePath = path.join(projectRoot, ".prettierignore");
+
+// Same decisions as `prettier --write <file>`: honor .prettierignore, skip
+// files with no parser, pick up config edits made since the last request
+async function formatFile(file) {
+  await prettier.clearConfigCache();
+  const info = await prettier.getFileInfo(file, { ignorePath, resolveConfig: true });
+  if (info.ignored || !info.inferredParser) return;
+  const options = (await prettier.resolveConfig(file, { editorconfig: true })) || {};
+  const source = fs.readFileSync(file, "utf8");
+  const formatted = await prettier.format(source, { ...options, filepath: file });
+  if (formatted !== source) fs.writeFileSync(file, formatted);
+}
+
+serve(socketPath, idleMs, async (request) => {
+  await formatFile(request.file);
+  return { ok: true };
+});
@@ -0,0 +1,139 @@
+#!/usr/bin/env node
+// Resident pyright worker for post_edit_validate.py (VORBIT_VALIDATE_SERVER=1).
+//
+// Usage: node pyright_server.js <socket> <project-root> <idle-ms>
+//
+// Drives one `pyright-langserver --stdio` over LSP for the project root.
+// Edited files stay open in the server, so each request only re-analyzes
+// what changed: {"file": "/abs/path.py"} → {"diagnostics": ["pkg/a.py:3:5 -
+// error: ..."]}. Uses the project's node_modules/.bin/pyright-langserver,
+// else the one on PATH. Exits 1 before listening if neither exists, and
+// exits whenever the language server does — the hook then falls back to
+// the `pyright <file>` CLI.
+
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const { spawn } = require("child_process");
+const { pathToFileURL } = require("url");
+const { serve } = require("./_node_worker");
+
+const [socketPath, projectRoot, idleMs] = process.argv.slice(2);
+
+// How long to wait for a diagnostics push after sending a file
+const ANALYSIS_TIMEOUT_MS = 60 * 1000;
+
+function findExecutable(name) {
+  const dirs = [path.join(projectRoot, "node_modules", ".bin"), ...(process.env.PATH || "").split(path.delimiter)];
+  for (const dir of dirs) {
+    const candidate = path.join(dir, name);
+    try {
+      fs.accessSync(candidate, fs.constants.X_OK);
+      return candidate;
+    } catch (err) {}
+  }
+  return null;
+}
+
+const langserver = findExecutable("pyright-langserver");
+if (!langserver) process.exit(1);
+
+const child = spawn(langserver, ["--stdio"], { cwd: projectRoot, stdio: ["pipe", "pipe", "ignore"] });
+child.on("exit", () => process.exit(1));
+child.on("error", () => process.exit(1));
+process.on("exit", () => child.kill());
+
+// --- LSP transport: Content-Length framed JSON-RPC over the child's stdio ---
+
+let nextId = 1;
+const pendingRequests = new Map(); // id → resolve
+const diagnosticWaiters = new Map(); // uri → [{version, resolve}]
+
+function send(message) {
+  const body = JSON.stringify({ jsonrpc: "2.0", ...message });
+  child.stdin.write(`Content-Length: ${Buffer.byteLength(body)}\r\n\r\n${body}`);
+}
+
+function request(method, params) {
+  const id = nextId++;
+  send({ id, method, params });
+  return new Promise((resolve) => pendingRequests.set(id, resolve));
+}
+
+function onMessage(message) {
+  if (message.id !== undefined && message.method === undefined) {
+    const resolve = pendingRequests.get(message.id);
+    pendingRequests.delete(message.id);
+    if (resolve) resolve(message.result);
+  } else if (message.id !== undefined) {
+    // Server → client requests: default settings, accept registrations
+    const result = message.method === "workspace/configuration" ? message.params.items.map(() => ({})) : null;
+    send({ id: message.id, result });
+  } else if (message.method === "textDocument/publishDiagnostics") {
+    const { uri, version, diagnostics } = message.params;
+    const waiters = diagnosticWaiters.get(uri) || [];
+    const remaining = waiters.filter((w) => version !== undefined && version < w.version);
+    for (const w of waiters) if (!remaining.includes(w)) w.resolve(diagnostics);
+    diagnosticWaiters.set(uri, remaining);
+  }
+}
+
+let buffer = Buffer.alloc(0);
+child.stdout.on("data", (chunk) => {
+  buffer = Buffer.concat([buffer, chunk]);
+  for (;;) {
+    const headerEnd = buffer.indexOf("\r\n\r\n");
+    if (headerEnd === -1) return;
+    const match = /Content-Length: (\d+)/i.exec(buffer.slice(0, headerEnd).toString());
+    const length = match ? Number(match[1]) : 0;
+    if (buffer.length < headerEnd + 4 + length) return;
+    const body = buffer.slice(headerEnd + 4, headerEnd + 4 + length).toString();
+    buffer = buffer.slice(headerEnd + 4 + length);
+    onMessage(JSON.parse(body));
+  }
+});
+
+const rootUri = pathToFileURL(projectRoot).href;
+const ready = request("initialize", {
+  processId: process.pid,
+  rootUri,
+  workspaceFolders: [{ uri: rootUri, name: path.basename(projectRoot) }],
+  capabilities: { workspace: { configuration: true }, textDocument: { publishDiagnostics: { versionSupport: true } } },
+}).then(() => send({ method: "initialized", params: {} }));
+
+// --- Requests: open or update the file, wait for its diagnostics ---
+
+const openVersions = new Map(); // uri → last version sent
+
+// Same shape as the pyright CLI, paths relative to the project root
+function describe(file, diagnostic) {
+  const { line, character } = diagnostic.range.start;
+  const rule = diagnostic.code ? ` (${diagnostic.code})` : "";
+  return `${path.relative(projectRoot, file)}:${line + 1}:${character + 1} - error: ${diagnostic.message}${rule}`;
+}
+
+async function check(file) {
+  await ready;
+  const uri = pathToFileURL(file).href;
+  const text = fs.readFileSync(file, "utf8");
+  const version = (openVersions.get(uri) || 0) + 1;
+  openVersions.set(uri, version);
+
+  const published = new Promise((resolve, reject) => {
+    const waiters = diagnosticWaiters.get(uri) || [];
+    waiters.push({ version, resolve });
+    diagnosticWaiters.set(uri, waiters);
+    setTimeout(() => reject(new Error("timed out waiting for diagnostics")), ANALYSIS_TIMEOUT_MS).unref();
+  });
+  if (version === 1) {
+    send({ method: "textDocument/didOpen", params: { textDocument: { uri, languageId: "python", version, text } } });
+  } else {
+    send({ method: "textDocument/didChange", params: { textDocument: { uri, version }, contentChanges: [{ text }] } });
+  }
+
+  const diagnostics = await published;
+  return { diagnostics: diagnostics.filter((d) => d.severity === 1).map((d) => describe(file, d)) };
+}
+
+serve(socketPath, idleMs, (request) => check(request.file));
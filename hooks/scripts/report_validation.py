@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Stop hook - reports background validation failures (VORBIT_VALIDATE_ASYNC=1).
+
+Failures that background checks finished since the last edit of the
+project are printed on stderr with exit 2, so they are fixed before the
+turn ends. Each failure is reported once (see _validation_jobs.py).
+Exit code: 0 when there is nothing to report.
+"""
+
+import os
+import sys
+
+from _daemon_client import forward_to_daemon
+from _telemetry import HookTimer
+from _utils import parse_hook_payload, resolve_project_root
+from _validation_jobs import finished_failures, mailbox_dir
+
+
+def main():
+    from post_edit_validate import exit_with
+
+    payload = parse_hook_payload(sys.stdin.read())
+    exit_with(finished_failures(resolve_project_root(payload.get("cwd") or os.getcwd())))
+
+
+if __name__ == "__main__":
+    # Fast path: no background failure waiting in any project
+    if not os.path.isdir(mailbox_dir()) or not os.listdir(mailbox_dir()):
+        sys.exit(0)
+    forward_to_daemon("report_validation")
+    with HookTimer("report_validation"):
+        try:
+            main()
+        except Exception:
+            sys.exit(0)
@@ -0,0 +1,158 @@
+#!/usr/bin/env node
+// Resident TypeScript checker for post_edit_validate.py (VORBIT_VALIDATE_SERVER=1).
+//
+// Usage: node typescript_server.js <socket> <project-root> <idle-ms>
+//
+// Keeps a LanguageService (the engine tsserver runs on) over the project's
+// tsconfig.json, built with the project's own typescript. A request
+// {"file": "/abs/path.ts"} → {"diagnostics": ["src/a.ts(3,7): error TS2322: ..."],
+// "checked": n} for the edited file and every project file importing it,
+// directly or through other project files. Unchanged
+// files keep their syntax trees between requests, so a warm check costs a
+// fraction of `tsc --noEmit`. Exits 1 before listening if typescript or
+// tsconfig.json cannot be loaded, so the hook falls back to `tsc --noEmit`.
+
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const { serve } = require("./_node_worker");
+
+const [socketPath, projectRoot, idleMs] = process.argv.slice(2);
+
+let ts;
+try {
+  ts = require(require.resolve("typescript", { paths: [projectRoot] }));
+} catch (err) {
+  process.exit(1);
+}
+
+const configPath = path.join(projectRoot, "tsconfig.json");
+
+function mtime(file) {
+  try {
+    return fs.statSync(file).mtimeMs;
+  } catch (err) {
+    return -1;
+  }
+}
+
+// Parsed tsconfig: re-read when tsconfig.json changes or an unknown file is edited
+let config;
+let configFiles = new Set();
+let configMtime = null;
+// Edited files the current parse leaves out, so editing one again does not re-read tsconfig.json
+let excludedFiles = new Set();
+const importCache = new Map(); // file → {version, imports: [resolved project files]}
+
+function loadConfig(force) {
+  const current = mtime(configPath);
+  if (!force && current === configMtime) return;
+  const parsed = ts.getParsedCommandLineOfConfigFile(configPath, {}, {
+    ...ts.sys,
+    onUnRecoverableConfigFileDiagnostic: () => {},
+  });
+  if (!parsed) throw new Error("cannot parse tsconfig.json");
+  config = parsed;
+  configFiles = new Set(parsed.fileNames.map((f) => path.resolve(f)));
+  configMtime = current;
+  excludedFiles = new Set();
+  importCache.clear();
+}
+
+try {
+  loadConfig(true);
+} catch (err) {
+  process.exit(1);
+}
+
+const host = {
+  getScriptFileNames: () => config.fileNames,
+  getScriptVersion: (file) => String(mtime(file)),
+  getScriptSnapshot: (file) => {
+    const text = ts.sys.readFile(file);
+    return text === undefined ? undefined : ts.ScriptSnapshot.fromString(text);
+  },
+  getCurrentDirectory: () => projectRoot,
+  getCompilationSettings: () => config.options,
+  getProjectReferences: () => config.projectReferences,
+  getDefaultLibFileName: (options) => ts.getDefaultLibFilePath(options),
+  fileExists: ts.sys.fileExists,
+  readFile: ts.sys.readFile,
+  readDirectory: ts.sys.readDirectory,
+  directoryExists: ts.sys.directoryExists,
+  getDirectories: ts.sys.getDirectories,
+};
+const service = ts.createLanguageService(host, ts.createDocumentRegistry());
+
+// Project files a file imports, cached per file version
+function importsOf(file) {
+  const version = host.getScriptVersion(file);
+  const cached = importCache.get(file);
+  if (cached && cached.version === version) return cached.imports;
+  const info = ts.preProcessFile(ts.sys.readFile(file) || "", true, true);
+  const imports = [];
+  for (const ref of info.importedFiles) {
+    const { resolvedModule } = ts.resolveModuleName(ref.fileName, file, config.options, ts.sys);
+    if (resolvedModule && !resolvedModule.isExternalLibraryImport) {
+      imports.push(path.resolve(resolvedModule.resolvedFileName));
+    }
+  }
+  importCache.set(file, { version, imports });
+  return imports;
+}
+
+// Project files importing target directly or through other project files
+function dependentsOf(target) {
+  const importers = new Map();
+  for (const file of configFiles) {
+    for (const imported of importsOf(file)) {
+      if (!importers.has(imported)) importers.set(imported, []);
+      importers.get(imported).push(file);
+    }
+  }
+  const found = new Set();
+  const pending = [target];
+  while (pending.length) {
+    for (const file of importers.get(pending.pop()) || []) {
+      if (file !== target && !found.has(file)) {
+        found.add(file);
+        pending.push(file);
+      }
+    }
+  }
+  return [...found];
+}
+
+// Same shape as tsc's non-pretty output, paths relative to the project root
+function describe(diagnostic) {
+  const message = ts.flattenDiagnosticMessageText(diagnostic.messageText, "\n");
+  if (!diagnostic.file) return `error TS${diagnostic.code}: ${message}`;
+  const { line, character } = diagnostic.file.getLineAndCharacterOfPosition(diagnostic.start);
+  const file = path.relative(projectRoot, diagnostic.file.fileName);
+  return `${file}(${line + 1},${character + 1}): error TS${diagnostic.code}: ${message}`;
+}
+
+function check(file) {
+  const target = path.resolve(file);
+  loadConfig(false);
+  if (!configFiles.has(target) && !excludedFiles.has(target)) loadConfig(true); // file created since the last parse
+  if (!configFiles.has(target)) {
+    excludedFiles.add(target);
+    return { diagnostics: [], checked: 0 }; // tsc would not check it either
+  }
+
+  const files = [target, ...dependentsOf(target)];
+  const diagnostics = [];
+  for (const f of files) {
+    for (const d of [...service.getSyntacticDiagnostics(f), ...service.getSemanticDiagnostics(f)]) {
+      if (d.category === ts.DiagnosticCategory.Error) diagnostics.push(describe(d));
+    }
+  }
+  return { diagnostics, checked: files.length };
+}
+
+serve(socketPath, idleMs, (request) => check(request.file));
+
+// Build the program while the first edit is still being made
+setImmediate(() => service.getProgram());
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""vorbit-hooks - inspect recorded hook latency.
+
+Usage: python3 vorbit_hooks.py stats [--hook NAME] [--project PATH]
+  stats - p50/p95/p99 wall time per hook, then per phase (root, detect,
+          syntax, subprocess, io) over the runs that spent time in it
+
+Reads ~/.claude/vorbit-hooks/timings.jsonl and its rotated predecessor
+(written by _telemetry.HookTimer). Times are in milliseconds.
+"""
+
+import argparse
+import json
+import math
+
+from _telemetry import timings_path
+
+PERCENTILES = (50, 95, 99)
+
+
+def load_records(hook: "str | None" = None, project: "str | None" = None) -> list:
+    """Timing records, oldest first, optionally for one hook and/or project."""
+    records = []
+    for path in (timings_path() + ".1", timings_path()):
+        try:
+            with open(path) as f:
+                lines = f.readlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a concurrent rotation
+            if hook and record.get("hook") != hook:
+                continue
+            if project and record.get("project") != project:
+                continue
+            records.append(record)
+    return records
+
+
+def percentile(values: list, p: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def format_stats(records: list) -> str:
+    """Table of run counts and percentiles per hook, with a row per phase under each."""
+    by_hook: dict = {}
+    for record in records:
+        by_hook.setdefault(record["hook"], []).append(record)
+
+    header = f"{'hook / phase':<24}{'runs':>6}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES)
+    lines = [header]
+
+    def row(label, values):
+        return f"{label:<24}{len(values):>6}" + "".join(f"{percentile(values, p):>10.1f}" for p in PERCENTILES)
+
+    for hook in sorted(by_hook):
+        runs = by_hook[hook]
+        lines.append(row(hook, [r["ms"] for r in runs]))
+        phases: dict = {}
+        for r in runs:
+            for phase, ms in r.get("phases", {}).items():
+                phases.setdefault(phase, []).append(ms)
+        for phase in sorted(phases):
+            lines.append(row(f"  {phase}", phases[phase]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="vorbit-hooks", description="vorbit hook latency")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    stats = subcommands.add_parser("stats", help="latency percentiles per hook and phase")
+    stats.add_argument("--hook", help="only this hook (e.g. post_edit)")
+    stats.add_argument("--project", help="only runs in this project directory")
+    args = parser.parse_args(argv)
+
+    records = load_records(args.hook, args.project)
+    if not records:
+        print(f"no hook timings recorded in {timings_path()}")
+        return
+    print(format_stats(records))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,10 @@
 
 import json
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -19,14 +21,56 @@ PLUGIN_ROOT = Path(__file__).resolve().parent.parent.parent
 # Hook script paths relative to plugin root
 SCRIPTS = {
     "pre_push_warning": PLUGIN_ROOT / "hooks" / "scripts" / "pre_push_warning.py",
+    "hook_daemon": PLUGIN_ROOT / "hooks" / "scripts" / "hook_daemon.py",
+    "post_edit": PLUGIN_ROOT / "hooks" / "scripts" / "post_edit.py",
     "post_edit_format": PLUGIN_ROOT / "hooks" / "scripts" / "post_edit_format.py",
     "post_edit_validate": PLUGIN_ROOT / "hooks" / "scripts" / "post_edit_validate.py",
+    "format_dirty_files": PLUGIN_ROOT / "hooks" / "scripts" / "format_dirty_files.py",
+    "report_validation": PLUGIN_ROOT / "hooks" / "scripts" / "report_validation.py",
     "loop_controller": PLUGIN_ROOT / "skills" / "implement-loop" / "hooks" / "loop_controller.py",
     "stop_learn_reflect": PLUGIN_ROOT / "skills" / "learn" / "hooks" / "stop_learn_reflect.py",
     "mark_voluntary_seen": PLUGIN_ROOT / "skills" / "learn" / "hooks" / "mark_voluntary_seen.py",
+    "compact_seen": PLUGIN_ROOT / "skills" / "learn" / "hooks" / "compact_seen.py",
+    "vorbit_hooks": PLUGIN_ROOT / "hooks" / "scripts" / "vorbit_hooks.py",
 }
 
 
+def global_node_package(name):
+    """Directory of a globally installed npm package, or None (no node, or not installed)."""
+    try:
+        root = subprocess.run(["npm", "root", "-g"], capture_output=True, text=True).stdout.strip()
+    except FileNotFoundError:
+        return None
+    candidate = Path(root) / name if root else None
+    return candidate if candidate and (candidate / "package.json").exists() else None
+
+
+@pytest.fixture
+def worker_home():
+    """Short temporary HOME for tests that start resident workers.
+
+    Worker sockets live under HOME, and pytest's tmp_path is long enough to
+    overflow the ~107-byte Unix socket path limit.
+    """
+    home = Path(tempfile.mkdtemp(prefix="vh-", dir="/tmp"))
+    yield home
+    # Workers outlive the hook run by design; stop the ones this test started
+    try:
+        subprocess.run(["pkill", "-f", str(home)], capture_output=True)
+    except FileNotFoundError:
+        pass
+    shutil.rmtree(home, ignore_errors=True)
+
+
+@pytest.fixture
+def node_worker(worker_home, monkeypatch):
+    """_node_worker imported in-process with HOME isolated (worker sockets live under it)."""
+    monkeypatch.setenv("HOME", str(worker_home))
+    sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+    import _node_worker
+    return _node_worker
+
+
 @pytest.fixture
 def plugin_root():
     """Path to the plugin root directory."""
@@ -45,6 +89,12 @@ def tmp_home(tmp_path):
     return home
 
 
+@pytest.fixture
+def isolated_home(tmp_home, monkeypatch):
+    """HOME pointed at tmp_home in this process, for tests importing hook modules that write state under it."""
+    monkeypatch.setenv("HOME", str(tmp_home))
+
+
 @pytest.fixture
 def test_project(tmp_path, tmp_home):
     """Temporary git repo with project slug directory in tmp_home.
@@ -83,16 +133,17 @@ def run_hook():
             stdin="",
             env_overrides={"HOME": str(tmp_home)},
             cwd=project_path,
+            args=("--flag", "value"),
         )
 
     Returns (exit_code: int, stdout: str, stderr: str).
     """
-    def _run(script_path, stdin="", env_overrides=None, cwd=None):
+    def _run(script_path, stdin="", env_overrides=None, cwd=None, args=()):
         env = os.environ.copy()
         if env_overrides:
             env.update({k: str(v) for k, v in env_overrides.items()})
         result = subprocess.run(
-            [sys.executable, str(script_path)],
+            [sys.executable, str(script_path), *args],
             input=stdin,
             capture_output=True,
             text=True,
@@ -0,0 +1,127 @@
+"""Tests for hooks/benchmarks — synthetic transcripts and baseline comparison."""
+
+import json
+import sys
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT, SCRIPTS
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "benchmarks"))
+sys.path.insert(0, str(PLUGIN_ROOT / "skills" / "learn" / "hooks"))
+
+import bench_learn_hooks  # noqa: E402
+import bench_tool_hooks  # noqa: E402
+from _bench import compare  # noqa: E402
+from _learn_utils import JsonlReader, build_keyword_matcher, find_keyword_hits  # noqa: E402
+from transcripts import LARGE_BYTES, RULES_SOURCE, write_transcript  # noqa: E402
+
+
+def _entries(path):
+    with open(path, "rb") as f:
+        return list(JsonlReader(f))
+
+
+@pytest.mark.parametrize("flow", [None, "f1", "fv"])
+def test_keyword_density_is_exact(tmp_path, flow):
+    """floor(lines * density) keyword prompts for the flow, none for any other flow."""
+    transcript = write_transcript(tmp_path / "s.jsonl", 2000, flow, density=0.01)
+
+    entries = _entries(transcript)
+    hits = find_keyword_hits(entries, build_keyword_matcher(RULES_SOURCE.read_text()))
+
+    assert len(entries) == 2000
+    assert {name: len(indices) for name, indices in hits.items()} == {
+        "f1": 20 if flow == "f1" else 0,
+        "fv": 20 if flow == "fv" else 0,
+    }
+
+
+def test_line_mix_matches_real_transcripts(tmp_path):
+    """Prompts, replies, tool_use and tool_result entries, with periodic large payloads."""
+    entries = _entries(write_transcript(tmp_path / "s.jsonl", 3000))
+
+    block_types = {
+        block["type"]
+        for e in entries if isinstance(e["message"]["content"], list)
+        for block in e["message"]["content"]
+    }
+    assert block_types == {"text", "tool_use", "tool_result"}
+    assert any(isinstance(e["message"]["content"], str) for e in entries)
+    results = [
+        block["content"]
+        for e in entries if isinstance(e["message"]["content"], list)
+        for block in e["message"]["content"] if block["type"] == "tool_result"
+    ]
+    assert sum(len(r) == LARGE_BYTES for r in results) == len(results) // 50
+
+
+def test_generated_flows_reach_the_stop_hook(tmp_path, tmp_home, run_hook):
+    """f1 transcript → correction capture; f2 transcript → self-discovered learnings written."""
+    rules_dir = tmp_home / ".claude" / "rules"
+    for flow, output in (("f1", "pending-capture.md"), ("f2", "unprocessed-corrections.md")):
+        transcript = write_transcript(tmp_path / f"{flow}.jsonl", 500, flow, density=0.01)
+        payload = json.dumps({"transcript_path": str(transcript), "cwd": str(tmp_path)})
+
+        run_hook(SCRIPTS["stop_learn_reflect"], stdin=payload, env_overrides={"HOME": str(tmp_home)}, cwd=tmp_path)
+
+        assert (rules_dir / output).exists(), flow
+    assert "VORBIT:CORRECTION-CAPTURE" in (rules_dir / "pending-capture.md").read_text()
+    assert (rules_dir / "unprocessed-corrections.md").read_text().count("**Root cause:**") == 5
+
+
+def test_scenario_reports_throughput_and_io(tmp_path):
+    summary = bench_learn_hooks.run_scenario(tmp_path, "stop_learn_reflect/f1", 200, 0.01, repeat=1)
+
+    assert summary["lines"] == 200
+    assert summary["lines_per_s"] == pytest.approx(200 / summary["seconds"])
+    assert summary["peak_rss_mb"] > 0
+    assert 0 < summary["io_ms"] < summary["ms"]
+
+
+def test_compare_flags_only_slower_scenarios():
+    baseline = {"scenarios": {"a": {"seconds": 0.1}, "b": {"seconds": 0.1}}}
+    results = {"scenarios": {"a": {"seconds": 0.2}, "b": {"seconds": 0.11}, "c": {"seconds": 1.0}}}
+
+    report, regressions = compare(results, baseline, max_ratio=1.25)
+
+    assert regressions == ["a"]
+    assert "c: no baseline" in report
+
+
+def test_import_time_counts_top_level_imports_only():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        900 | json",
+        "import time:       300 |        700 |   json.decoder",
+        "import time:        50 |         50 | _utils",
+    ])
+    assert bench_tool_hooks.import_us(stderr) == 950
+
+
+@pytest.fixture(scope="module")
+def tool_bench(tmp_path_factory):
+    work = tmp_path_factory.mktemp("bench")
+    dirs = bench_tool_hooks.make_fixtures(work)
+    startup = bench_tool_hooks.interpreter_startup(1)
+
+    def run(name):
+        return bench_tool_hooks.run_scenario(work, dirs, name, 1, startup)
+    return run
+
+
+@pytest.mark.parametrize("name", ["post_edit_validate/go.mod", "post_edit_validate/mypy", "post_edit_format/prettier"])
+def test_stubbed_tools_run_offline(tool_bench, name):
+    """Stubs answer like the real tools: the checker or formatter runs and the edit passes."""
+    summary = tool_bench(name)
+
+    assert summary["exit"] == 0
+    assert summary["subprocess_ms"] > 0
+    assert {"root_ms", "detect_ms"} <= set(summary)
+
+
+def test_pre_check_exit_reports_no_phases(tool_bench):
+    summary = tool_bench("post_edit_validate/unvalidated")
+
+    assert summary["exit"] == 0
+    assert not {"root_ms", "detect_ms", "syntax_ms", "subprocess_ms", "io_ms"} & set(summary)
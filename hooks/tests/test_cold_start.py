@@ -0,0 +1,158 @@
+"""Cold-start budget: each hook's "nothing to do" path must stay cheap.
+
+Every hook runs as a fresh interpreter on every matching event, so the
+common no-op case is checked two ways:
+  - `-X importtime`: the fast path must not import the modules named in
+    its budget (deterministic — fails on any regression)
+  - wall clock: best of several runs must stay within a fixed margin of a
+    bare `python -c pass`, timed alternately on the same machine. Load on
+    the machine makes this noisy, so it only runs with VORBIT_TIMING_TESTS=1
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from hooks.tests.conftest import SCRIPTS
+
+# Modules a fast path may never pull in; each costs milliseconds at startup
+HEAVY = {"json", "re", "pathlib", "subprocess", "socket", "typing", "datetime"}
+
+RUNS = 5
+
+timing = pytest.mark.skipif(
+    os.environ.get("VORBIT_TIMING_TESTS") != "1", reason="wall-clock budgets are opt-in (VORBIT_TIMING_TESTS=1)"
+)
+
+
+def _run(script, env, stdin="", importtime=False, cwd=None):
+    cmd = [sys.executable, *(["-X", "importtime"] if importtime else []), str(script)]
+    return subprocess.run(cmd, input=stdin, capture_output=True, text=True, env=env, cwd=cwd)
+
+
+def _imported_modules(stderr):
+    """Top-level module names from -X importtime output."""
+    names = set()
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            names.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return names
+
+
+def _best_of(cmd_runner, env):
+    """Best wall time of cmd_runner and of a bare interpreter, runs alternating so load hits both alike."""
+    best, baseline = float("inf"), float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], env=env)
+        baseline = min(baseline, time.perf_counter() - start)
+        start = time.perf_counter()
+        cmd_runner()
+        best = min(best, time.perf_counter() - start)
+    return best, baseline
+
+
+@pytest.fixture
+def hook_env(tmp_home, tmp_path):
+    """Isolated env with no daemon socket, so forwarding never kicks in."""
+    env = os.environ.copy()
+    env.update({"HOME": str(tmp_home), "VORBIT_HOOK_SOCKET": str(tmp_path / "no-daemon.sock")})
+    env.pop("TOOL_INPUT", None)
+    return env
+
+
+@pytest.fixture
+def scanned_session(test_project, correction_transcript, hook_env):
+    """Stop hook already ran to completion on this transcript → checkpoint covers it all."""
+    transcript = correction_transcript(test_project["sessions_dir"])
+    payload = json.dumps({"transcript_path": str(transcript), "cwd": str(test_project["path"])})
+    env = {**hook_env, "HOME": str(test_project["home"])}
+    # First Stop captures the correction (Flow 1 exits without a checkpoint), second saves it
+    for _ in range(2):
+        _run(SCRIPTS["stop_learn_reflect"], env, stdin=payload, cwd=test_project["path"])
+    return env, payload, test_project
+
+
+# hook → (tool input or None, forbidden modules, wall-clock margin over bare interpreter, seconds)
+TOOL_HOOK_BUDGETS = {
+    "pre_push_warning": ({"command": "ls -la"}, HEAVY, 0.020),
+    "post_edit_validate": ({"file_path": "/tmp/README.md"}, HEAVY, 0.020),
+    "post_edit": (None, HEAVY, 0.020),
+    "post_edit_format": (None, HEAVY, 0.020),
+    "format_dirty_files": (None, HEAVY, 0.020),
+    "report_validation": (None, HEAVY, 0.020),
+}
+
+
+def _tool_hook_env(hook, hook_env):
+    tool_input = TOOL_HOOK_BUDGETS[hook][0]
+    return {**hook_env, **({"TOOL_INPUT": json.dumps(tool_input)} if tool_input else {})}
+
+
+@pytest.mark.parametrize("hook", sorted(TOOL_HOOK_BUDGETS))
+def test_tool_hook_fast_path_imports(hook, hook_env):
+    """Non-matching tool event (or no dirty set at Stop) → exits 0 with only os/sys loaded."""
+    result = _run(SCRIPTS[hook], _tool_hook_env(hook, hook_env), importtime=True)
+
+    assert result.returncode == 0
+    assert _imported_modules(result.stderr) & TOOL_HOOK_BUDGETS[hook][1] == set()
+
+
+@timing
+@pytest.mark.parametrize("hook", sorted(TOOL_HOOK_BUDGETS))
+def test_tool_hook_fast_path_wall_clock(hook, hook_env):
+    env = _tool_hook_env(hook, hook_env)
+
+    elapsed, baseline = _best_of(lambda: _run(SCRIPTS[hook], env), env)
+
+    assert elapsed <= baseline + TOOL_HOOK_BUDGETS[hook][2], f"{hook}: {elapsed:.3f}s vs bare {baseline:.3f}s"
+
+
+@pytest.fixture
+def loop_payload(tmp_path):
+    return json.dumps({"cwd": str(tmp_path), "last_assistant_message": "done"})
+
+
+def test_loop_controller_fast_path_imports(hook_env, loop_payload, tmp_path):
+    """No loop state up the tree → exits 0 without git or pathlib."""
+    result = _run(SCRIPTS["loop_controller"], hook_env, stdin=loop_payload, importtime=True, cwd=tmp_path)
+
+    assert result.returncode == 0
+    assert _imported_modules(result.stderr) & {"subprocess", "pathlib", "socket"} == set()
+
+
+@timing
+def test_loop_controller_fast_path_wall_clock(hook_env, loop_payload, tmp_path):
+    elapsed, baseline = _best_of(
+        lambda: _run(SCRIPTS["loop_controller"], hook_env, stdin=loop_payload, cwd=tmp_path), hook_env
+    )
+
+    assert elapsed <= baseline + 0.030, f"loop_controller: {elapsed:.3f}s vs bare {baseline:.3f}s"
+
+
+def test_stop_learn_reflect_fast_path_imports(scanned_session):
+    """Transcript unchanged since the last checkpoint → no git, no writes."""
+    env, payload, project = scanned_session
+    rules_dir = project["home"] / ".claude" / "rules"
+    before = sorted((p.name, p.stat().st_mtime_ns) for p in rules_dir.rglob("*"))
+
+    result = _run(SCRIPTS["stop_learn_reflect"], env, stdin=payload, importtime=True, cwd=project["path"])
+
+    assert result.returncode == 0
+    assert _imported_modules(result.stderr) & {"subprocess", "datetime", "socket"} == set()
+    assert sorted((p.name, p.stat().st_mtime_ns) for p in rules_dir.rglob("*")) == before
+
+
+@timing
+def test_stop_learn_reflect_fast_path_wall_clock(scanned_session):
+    env, payload, project = scanned_session
+
+    elapsed, baseline = _best_of(
+        lambda: _run(SCRIPTS["stop_learn_reflect"], env, stdin=payload, cwd=project["path"]), env
+    )
+
+    assert elapsed <= baseline + 0.060, f"stop_learn_reflect: {elapsed:.3f}s vs bare {baseline:.3f}s"
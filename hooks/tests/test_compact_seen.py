@@ -0,0 +1,105 @@
+"""Tests for compact_seen.py — on-demand retention pass for learn-hook session state."""
+
+import os
+import shutil
+import time
+
+from hooks.tests.conftest import SCRIPTS
+
+HOOK = SCRIPTS["compact_seen"]
+
+
+def _rules_dir(project):
+    return project["home"] / ".claude" / "rules"
+
+
+def _seen_shard(project, sid):
+    return _rules_dir(project) / ".seen-correction-sessions.d" / f"{sid}.tsv"
+
+
+def _checkpoint_file(project, sid):
+    return _rules_dir(project) / ".transcript-checkpoints" / f"{sid}.json"
+
+
+def _run_compact(run_hook, project, *args):
+    env = {"HOME": str(project["home"])}
+    return run_hook(HOOK, env_overrides=env, cwd=project["path"], args=args)
+
+
+def _write_state(project, sid, age_days=0):
+    shard = _seen_shard(project, sid)
+    checkpoint = _checkpoint_file(project, sid)
+    for path, content in ((shard, "f1\t2\n"), (checkpoint, "{}")):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        past = time.time() - age_days * 86400
+        os.utime(path, (past, past))
+
+
+def test_drops_state_for_deleted_transcript(test_project, run_hook):
+    """Session whose transcript is gone → shard and checkpoint removed; live session kept."""
+    (test_project["sessions_dir"] / "live-session.jsonl").write_text("{}\n")
+    _write_state(test_project, "live-session")
+    _write_state(test_project, "gone-session")
+
+    exit_code, stdout, _ = _run_compact(run_hook, test_project)
+
+    assert exit_code == 0
+    assert "Removed 2" in stdout
+    assert _seen_shard(test_project, "live-session").exists()
+    assert _checkpoint_file(test_project, "live-session").exists()
+    assert not _seen_shard(test_project, "gone-session").exists()
+    assert not _checkpoint_file(test_project, "gone-session").exists()
+
+
+def test_keeps_old_state_while_transcript_exists(test_project, run_hook):
+    """A resumed session's state is kept however old."""
+    (test_project["sessions_dir"] / "old-session.jsonl").write_text("{}\n")
+    _write_state(test_project, "old-session", age_days=400)
+
+    exit_code, stdout, _ = _run_compact(run_hook, test_project)
+
+    assert exit_code == 0
+    assert "Removed 0" in stdout
+    assert _seen_shard(test_project, "old-session").exists()
+    assert _checkpoint_file(test_project, "old-session").exists()
+
+
+def test_keeps_everything_when_transcripts_cannot_be_listed(test_project, run_hook):
+    shutil.rmtree(test_project["home"] / ".claude" / "projects")
+    _write_state(test_project, "s-stale", age_days=400)
+
+    exit_code, stdout, _ = _run_compact(run_hook, test_project)
+
+    assert exit_code == 0
+    assert "Removed 0" in stdout
+    assert _seen_shard(test_project, "s-stale").exists()
+
+
+def test_looks_up_transcripts_under_claude_config_dir(test_project, run_hook, tmp_path):
+    sessions_dir = tmp_path / "config" / "projects" / test_project["slug"]
+    sessions_dir.mkdir(parents=True)
+    (sessions_dir / "live-session.jsonl").write_text("{}\n")
+    _write_state(test_project, "live-session")
+    env = {"HOME": str(test_project["home"]), "CLAUDE_CONFIG_DIR": str(tmp_path / "config")}
+
+    exit_code, stdout, _ = run_hook(HOOK, env_overrides=env, cwd=test_project["path"])
+
+    assert exit_code == 0
+    assert "Removed 0" in stdout
+    assert _seen_shard(test_project, "live-session").exists()
+
+
+def test_migrates_legacy_file_first(test_project, run_hook):
+    """Legacy TSV entries are migrated, then compacted like any shard."""
+    (test_project["sessions_dir"] / "live-session.jsonl").write_text("{}\n")
+    legacy = _rules_dir(test_project) / ".seen-correction-sessions"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text("live-session\tf1\t2\ngone-session\tfv\t0\n")
+
+    exit_code, _, _ = _run_compact(run_hook, test_project)
+
+    assert exit_code == 0
+    assert not legacy.exists()
+    assert _seen_shard(test_project, "live-session").read_text() == "f1\t2\n"
+    assert not _seen_shard(test_project, "gone-session").exists()
@@ -0,0 +1,100 @@
+"""Tests for _deadline.py — per-stage time budgets with process-group cleanup."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+from _deadline import STAGES, Deadline, DeadlineExceeded, timeouts_log_path  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("isolated_home")
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A killed child of ours may linger as a zombie until reaped; that is not running
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().split(")")[-1].split()[0] != "Z"
+
+
+def test_overrun_kills_whole_process_group_and_logs(tmp_path, monkeypatch):
+    """The command and the helper it forked are both gone once the budget runs out."""
+    monkeypatch.setenv("VORBIT_VALIDATE_TIMEOUT", "0.5")
+    pid_file = tmp_path / "helper.pid"
+    command = ["sh", "-c", f"sleep 60 & echo $! > {pid_file}; sleep 60"]
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded) as excinfo:
+        Deadline("validate").run(command, cwd=str(tmp_path))
+
+    assert time.monotonic() - start < 5
+    assert str(excinfo.value).startswith("validation skipped: timed out after 0.5s (sh -c ")
+    time.sleep(0.1)
+    assert not _alive(int(pid_file.read_text()))
+    with open(timeouts_log_path()) as f:
+        entry = json.loads(f.read().splitlines()[-1])
+    assert (entry["stage"], entry["timeout"], entry["command"], entry["cwd"]) == ("validate", 0.5, "sh", str(tmp_path))
+
+
+def test_budget_is_shared_by_every_command_of_a_stage(monkeypatch):
+    monkeypatch.setenv("VORBIT_FORMAT_TIMEOUT", "1")
+    deadline = Deadline("format")
+    deadline.run(["sleep", "0.7"])
+
+    with pytest.raises(DeadlineExceeded):
+        deadline.run(["sleep", "0.7"])
+
+
+def test_completed_command_returns_output():
+    result = Deadline("format").run(["sh", "-c", "echo out; echo err >&2; exit 3"], text=True)
+
+    assert (result.returncode, result.stdout, result.stderr) == (3, "out\n", "err\n")
+
+
+def test_missing_command_raises_file_not_found():
+    with pytest.raises(FileNotFoundError):
+        Deadline("format").run(["vorbit-no-such-binary"])
+
+
+def test_invalid_override_keeps_default(monkeypatch):
+    monkeypatch.setenv("VORBIT_FORMAT_BATCH_TIMEOUT", "soon")
+
+    assert Deadline("format_batch").seconds == STAGES["format_batch"][1]
+
+
+def test_stop_during_spawn_kills_the_command_once_registered(tmp_path):
+    """A stop request landing between Popen and RUNNING.add still takes the new command down."""
+    pid_file = tmp_path / "sleep.pid"
+    script = f"""
+import subprocess, sys
+sys.path.insert(0, {str(PLUGIN_ROOT / "hooks" / "scripts")!r})
+import _deadline
+
+real_popen = subprocess.Popen
+
+def popen_then_stop(*args, **kwargs):
+    proc = real_popen(*args, **kwargs)
+    open({str(pid_file)!r}, "w").write(str(proc.pid))
+    _deadline.stop_running()
+    return proc
+
+subprocess.Popen = popen_then_stop
+_deadline.Deadline("validate").run(["sleep", "60"])
+sys.exit(3)
+"""
+    result = subprocess.run([sys.executable, "-c", script], timeout=30)
+
+    assert result.returncode == 0
+    time.sleep(0.1)
+    assert not _alive(int(pid_file.read_text()))
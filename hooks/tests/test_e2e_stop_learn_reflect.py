@@ -40,8 +40,8 @@ def _pending_file(project):
     return project["home"] / ".claude" / "rules" / "pending-capture.md"
 
 
-def _seen_file(project):
-    return project["home"] / ".claude" / "rules" / ".seen-correction-sessions"
+def _seen_shard(project, sid):
+    return project["home"] / ".claude" / "rules" / ".seen-correction-sessions.d" / f"{sid}.tsv"
 
 
 def _write_jsonl(path, rows):
@@ -418,12 +418,12 @@ def test_e2e_multi_capture(test_project, run_hook):
 
 
 # ---------------------------------------------------------------------------
-# E2E-11: Seen file tab-separated format verification
+# E2E-11: Seen shard tab-separated format verification
 # ---------------------------------------------------------------------------
 
 
 def test_e2e_seen_file_format(test_project, run_hook):
-    """After capturing a correction, seen file uses tab-separated format: session_id TAB flow TAB idx."""
+    """After capturing a correction, the session's seen shard uses tab-separated format: flow TAB idx."""
     sid = "e2e11-session"
     _write_jsonl(
         test_project["sessions_dir"] / f"{sid}.jsonl",
@@ -437,10 +437,10 @@ def test_e2e_seen_file_format(test_project, run_hook):
     assert exit_code == 0
     assert _pending_file(test_project).exists()
 
-    seen = _seen_file(test_project)
+    seen = _seen_shard(test_project, sid)
     assert seen.exists()
     first_line = seen.read_text().splitlines()[0]
-    assert first_line == f"{sid}\tf1\t0"
+    assert first_line == "f1\t0"
 
 
 # ---------------------------------------------------------------------------
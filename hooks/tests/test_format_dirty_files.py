@@ -0,0 +1,148 @@
+"""Tests for deferred formatting: post_edit_format records, format_dirty_files.py formats at Stop."""
+
+import json
+import sys
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT, SCRIPTS
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+from format_dirty_files import claim_dirty_set  # noqa: E402
+
+
+@pytest.fixture
+def biome_project(tmp_path):
+    project = tmp_path / "web"
+    project.mkdir()
+    (project / "biome.json").write_text("{}")
+    for name in ("a.ts", "b.ts", "c.ts"):
+        (project / name).write_text("const x = 1;")
+    return project
+
+
+def _edit(run_hook, home, file_path, session_id="s1", dry_run=False):
+    env = {
+        "HOME": str(home),
+        "TOOL_INPUT": json.dumps({"file_path": str(file_path)}),
+        "VORBIT_FORMAT_DEFERRED": "1",
+    }
+    if dry_run:
+        env["DRY_RUN"] = "1"
+    return run_hook(
+        SCRIPTS["post_edit_format"], stdin=json.dumps({"session_id": session_id}), env_overrides=env
+    )
+
+
+def _stop(run_hook, home, session_id="s1", dry_run=False):
+    env = {"HOME": str(home), **({"DRY_RUN": "1"} if dry_run else {})}
+    return run_hook(SCRIPTS["format_dirty_files"], stdin=json.dumps({"session_id": session_id}), env_overrides=env)
+
+
+def _dirty_set(home, session_id="s1"):
+    return home / ".claude" / "vorbit-format" / "dirty" / f"{session_id}.txt"
+
+
+def test_edits_are_recorded_not_formatted(biome_project, tmp_home, run_hook):
+    """Deferred mode → each edit appends to the session's dirty set and prints nothing."""
+    exit_code, stdout, _ = _edit(run_hook, tmp_home, biome_project / "a.ts")
+    _edit(run_hook, tmp_home, biome_project / "a.ts")
+
+    assert exit_code == 0
+    assert stdout == ""
+    assert _dirty_set(tmp_home).read_text().splitlines() == [str(biome_project / "a.ts")] * 2
+
+
+def test_stop_runs_one_batch_over_unique_files(biome_project, tmp_home, run_hook):
+    """Repeated edits across files → one formatter command listing each file once, in edit order."""
+    for name in ("b.ts", "a.ts", "b.ts", "c.ts", "a.ts"):
+        _edit(run_hook, tmp_home, biome_project / name)
+
+    exit_code, stdout, _ = _stop(run_hook, tmp_home, dry_run=True)
+
+    assert exit_code == 0
+    files = " ".join(str(biome_project / n) for n in ("b.ts", "a.ts", "c.ts"))
+    assert stdout.strip().splitlines() == [f"[DRY_RUN] Would run: biome format --write {files}"]
+
+
+def test_stop_consumes_dirty_set(biome_project, tmp_home, run_hook):
+    """Real Stop → dirty set removed even if the formatter is not installed."""
+    _edit(run_hook, tmp_home, biome_project / "a.ts")
+
+    exit_code, _, _ = _stop(run_hook, tmp_home)
+
+    assert exit_code == 0
+    assert not _dirty_set(tmp_home).exists()
+    assert not _dirty_set(tmp_home).with_suffix(".txt.formatting").exists()
+
+
+def test_stop_leaves_other_sessions_alone(biome_project, tmp_home, run_hook):
+    _edit(run_hook, tmp_home, biome_project / "a.ts", session_id="other")
+
+    exit_code, stdout, _ = _stop(run_hook, tmp_home, session_id="s1")
+
+    assert exit_code == 0
+    assert stdout == ""
+    assert _dirty_set(tmp_home, "other").exists()
+
+
+def test_stop_skips_deleted_files_and_unformatted_projects(biome_project, tmp_path, tmp_home, run_hook):
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    (plain / "notes.ts").write_text("x")
+    _edit(run_hook, tmp_home, biome_project / "a.ts")
+    _edit(run_hook, tmp_home, biome_project / "b.ts")
+    (biome_project / "b.ts").unlink()
+    # Recorded directly: post_edit_format would not record a file with no formatter
+    with open(_dirty_set(tmp_home), "a") as f:
+        f.write(str(plain / "notes.ts") + "\n")
+
+    _, stdout, _ = _stop(run_hook, tmp_home, dry_run=True)
+
+    assert stdout.strip() == f"[DRY_RUN] Would run: biome format --write {biome_project / 'a.ts'}"
+
+
+def test_deferred_dry_run_records_nothing(biome_project, tmp_home, run_hook):
+    exit_code, stdout, _ = _edit(run_hook, tmp_home, biome_project / "a.ts", dry_run=True)
+
+    assert exit_code == 0
+    assert "Would defer to Stop: biome format --write" in stdout
+    assert not _dirty_set(tmp_home).exists()
+
+
+def test_no_formatter_records_nothing(tmp_path, tmp_home, run_hook):
+    test_file = tmp_path / "plain.ts"
+    test_file.write_text("x")
+
+    _edit(run_hook, tmp_home, test_file)
+
+    assert not _dirty_set(tmp_home).exists()
+
+
+def test_stop_picks_up_set_claimed_by_an_interrupted_run(biome_project, tmp_home, run_hook):
+    """A .formatting set left by a crashed Stop is formatted along with the new dirty set, not overwritten."""
+    _edit(run_hook, tmp_home, biome_project / "b.ts")
+    leftover = _dirty_set(tmp_home).with_suffix(".txt.formatting")
+    leftover.write_text(str(biome_project / "a.ts") + "\n")
+
+    _, stdout, _ = _stop(run_hook, tmp_home, dry_run=True)
+    assert stdout.strip() == f"[DRY_RUN] Would run: biome format --write {biome_project / 'a.ts'} {biome_project / 'b.ts'}"
+
+    exit_code, _, _ = _stop(run_hook, tmp_home)
+    assert exit_code == 0
+    assert not _dirty_set(tmp_home).exists()
+    assert not leftover.exists()
+
+
+def test_claim_appends_to_leftover_claimed_set(tmp_path):
+    """The new dirty set is appended to the leftover claimed set, keeping both sets of paths."""
+    dirty, claimed = tmp_path / "s1.txt", tmp_path / "s1.txt.formatting"
+    claimed.write_text("/p/a.ts")
+    dirty.write_text("/p/b.ts\n")
+
+    claim_dirty_set(str(dirty), str(claimed))
+
+    assert not dirty.exists()
+    assert claimed.read_text().split() == ["/p/a.ts", "/p/b.ts"]
+    assert [p.name for p in tmp_path.iterdir()] == ["s1.txt.formatting"]
@@ -0,0 +1,126 @@
+"""Tests for hook_daemon.py and the _daemon_client forwarding used by every hook."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from hooks.tests.conftest import SCRIPTS
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Run hook_daemon.py serve on a socket under tmp_path; yields the socket path."""
+    sock = tmp_path / "hooks.sock"
+    env = {**os.environ, "VORBIT_HOOK_SOCKET": str(sock)}
+    proc = subprocess.Popen(
+        [sys.executable, str(SCRIPTS["hook_daemon"]), "serve", "--idle-timeout", "30"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    for _ in range(100):
+        if sock.exists():
+            break
+        time.sleep(0.05)
+    yield sock
+    proc.terminate()
+    proc.wait(timeout=5)
+
+
+def _request(sock, payload):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(sock))
+        s.sendall(json.dumps(payload).encode() + b"\n")
+        s.shutdown(socket.SHUT_WR)
+        data = b""
+        while chunk := s.recv(65536):
+            data += chunk
+    return json.loads(data)
+
+
+def test_daemon_serves_hook_with_client_env(daemon, tmp_path):
+    """Request over the socket → hook runs with the request's env/cwd, output and exit code returned."""
+    env = {"PATH": os.environ["PATH"], "TOOL_INPUT": json.dumps({"command": "git push origin main"})}
+
+    response = _request(daemon, {"hook": "pre_push_warning", "env": env, "cwd": str(tmp_path), "stdin": ""})
+
+    assert response["exit_code"] == 0
+    assert "About to push" in response["stdout"]
+    assert "git push origin main" in response["stdout"]
+
+
+def test_daemon_captures_blocking_exit_code(daemon, tmp_path):
+    """Validator exit codes are relayed unchanged (loop controller exit 2 here)."""
+    state = tmp_path / ".claude" / ".loop-state.json"
+    state.parent.mkdir()
+    state.write_text(json.dumps({"active": True, "command": "next-step", "iteration": 1, "maxIterations": 5}))
+    env = {"PATH": os.environ["PATH"], "HOME": str(tmp_path)}
+
+    response = _request(
+        daemon, {"hook": "loop_controller", "env": env, "cwd": str(tmp_path), "stdin": "no signal"}
+    )
+
+    assert response["exit_code"] == 2
+    assert response["stdout"].strip() == "next-step"
+
+
+
+def test_daemon_records_hook_timing(daemon, tmp_path):
+    """Hooks served by the daemon leave the same timing record, phases included, under the client's HOME."""
+    state = tmp_path / ".claude" / ".loop-state.json"
+    state.parent.mkdir()
+    state.write_text(json.dumps({"active": True, "command": "next-step", "iteration": 1, "maxIterations": 5}))
+    env = {"PATH": os.environ["PATH"], "HOME": str(tmp_path)}
+
+    _request(daemon, {"hook": "loop_controller", "env": env, "cwd": str(tmp_path), "stdin": "no signal"})
+
+    timings = tmp_path / ".claude" / "vorbit-hooks" / "timings.jsonl"
+    [record] = [json.loads(line) for line in timings.read_text().splitlines()]
+    assert record["hook"] == "loop_controller"
+    assert record["exit"] == 2
+    assert "root" in record["phases"]
+
+def test_unknown_hook_rejected(daemon, tmp_path):
+    """Unknown hook name → error response without exit_code (client falls back in-process)."""
+    response = _request(daemon, {"hook": "nope", "env": {}, "cwd": str(tmp_path), "stdin": ""})
+    assert "exit_code" not in response
+
+
+def test_hook_script_forwards_to_daemon(daemon, run_hook):
+    """Hook script run with the daemon socket set → same observable behavior as in-process."""
+    env = {"VORBIT_HOOK_SOCKET": str(daemon), "TOOL_INPUT": json.dumps({"command": "git push"})}
+
+    exit_code, stdout, _ = run_hook(SCRIPTS["pre_push_warning"], env_overrides=env)
+
+    assert exit_code == 0
+    assert "About to push" in stdout
+
+
+def test_stale_socket_falls_back_in_process(tmp_path, run_hook):
+    """Socket file with no daemon behind it → hook runs in-process as before."""
+    stale = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.bind(str(stale))
+    env = {"VORBIT_HOOK_SOCKET": str(stale), "TOOL_INPUT": json.dumps({"command": "git push"})}
+
+    exit_code, stdout, _ = run_hook(SCRIPTS["pre_push_warning"], env_overrides=env)
+
+    assert exit_code == 0
+    assert "About to push" in stdout
+
+
+def test_status_reports_not_running(tmp_path, run_hook):
+    """No daemon → status says not running."""
+    env = {"VORBIT_HOOK_SOCKET": str(tmp_path / "none.sock")}
+    exit_code, stdout, _ = run_hook(SCRIPTS["hook_daemon"], env_overrides=env, args=("status",))
+    assert exit_code == 0
+    assert "not running" in stdout
+
+
+def test_daemon_socket_is_owner_only(daemon):
+    assert daemon.stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,199 @@
+"""Tests for _learn_utils.py — keyword matcher and seen store shared by the learn hooks."""
+
+import os
+import sys
+
+from hooks.tests.conftest import PLUGIN_ROOT
+
+sys.path.insert(0, str(PLUGIN_ROOT / "skills" / "learn" / "hooks"))
+
+import _learn_utils  # noqa: E402
+from _learn_utils import (  # noqa: E402
+    JsonlReader,
+    KeywordMatcher,
+    build_keyword_matcher,
+    compact_session_state,
+    find_keyword_hits,
+    load_seen,
+    mark_seen,
+    migrate_seen_file,
+)
+
+RULES_TEXT = (PLUGIN_ROOT / "skills" / "learn" / "vorbit-learning-rules.md").read_text()
+
+
+def _user(text):
+    return {"type": "user", "message": {"role": "user", "content": text}}
+
+
+def _asst(text):
+    return {"type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": text}]}}
+
+
+def test_builds_both_flows_from_rules_file():
+    """Matcher built from the real rules file has correction (f1) and voluntary (fv) flows."""
+    matcher = build_keyword_matcher(RULES_TEXT)
+    assert matcher is not None
+    assert matcher.flows == ["f1", "fv"]
+
+
+def test_no_keyword_comments_returns_none():
+    """Rules text without keyword comments → no matcher."""
+    assert build_keyword_matcher("# Rules\n<!-- learning-fields: A,B,C -->\n") is None
+
+
+def test_classifies_both_flows_in_one_message():
+    """One message containing a correction and a voluntary phrase → both flows."""
+    matcher = build_keyword_matcher(RULES_TEXT)
+    assert matcher.classify("Wrong again. Remember this: use const.") == {"f1", "fv"}
+
+
+def test_case_insensitive_whole_word():
+    """'NOPE' matches; 'not'/'know' do not match the 'no'-prefixed keyword."""
+    matcher = KeywordMatcher({"f1": ["nope", "no"]})
+    assert matcher.classify("NOPE, line 12") == {"f1"}
+    assert matcher.classify("I know it is not ready") == set()
+
+
+def test_overlapping_keywords_across_flows():
+    """A keyword overlapping another flow's match at the same position is still classified."""
+    matcher = KeywordMatcher({"f1": ["wrong"], "fv": ["wrong approach"]})
+    assert matcher.classify("wrong approach here") == {"f1", "fv"}
+
+
+def test_find_keyword_hits_filters_and_indexes():
+    """Only short, non-teammate user messages are classified; indices are absolute."""
+    matcher = build_keyword_matcher(RULES_TEXT)
+    messages = [
+        _asst("Wrong assumption on my side."),
+        _user("wrong, use const"),
+        _user("<teammate-message>broken</teammate-message>"),
+        _user("broken " * 100),
+        _user("save this for later"),
+    ]
+
+    hits = find_keyword_hits(messages, matcher, start_index=10)
+
+    assert hits == {"f1": [11], "fv": [14]}
+
+
+# ---------------------------------------------------------------------------
+# JsonlReader
+# ---------------------------------------------------------------------------
+
+def test_reader_streams_valid_entries_and_tracks_offset(tmp_path):
+    """Blank and invalid lines are skipped but consumed; offset ends at EOF."""
+    path = tmp_path / "t.jsonl"
+    path.write_bytes(b'{"a": 1}\n\nnot json\n{"b": 2}\n')
+
+    with open(path, "rb") as f:
+        reader = JsonlReader(f)
+        entries = list(reader)
+
+    assert entries == [{"a": 1}, {"b": 2}]
+    assert reader.offset == path.stat().st_size
+
+
+def test_reader_leaves_partial_last_line(tmp_path):
+    """A last line without newline is not consumed, even once it parses; its newline makes it read."""
+    path = tmp_path / "t.jsonl"
+    path.write_bytes(b'{"a": 1}\n{"b": ')
+
+    with open(path, "rb") as f:
+        reader = JsonlReader(f)
+        assert list(reader) == [{"a": 1}]
+    assert reader.offset == len(b'{"a": 1}\n')
+
+    path.write_bytes(b'{"a": 1}\n{"b": 2}')
+    with open(path, "rb") as f:
+        reader = JsonlReader(f, offset=len(b'{"a": 1}\n'))
+        assert list(reader) == []
+    assert reader.offset == len(b'{"a": 1}\n')
+
+    path.write_bytes(b'{"a": 1}\n{"b": 2}\n')
+    with open(path, "rb") as f:
+        reader = JsonlReader(f, offset=len(b'{"a": 1}\n'))
+        assert list(reader) == [{"b": 2}]
+    assert reader.offset == path.stat().st_size
+
+
+# ---------------------------------------------------------------------------
+# Seen store
+# ---------------------------------------------------------------------------
+
+def test_load_seen_returns_all_flows(tmp_path):
+    """All flows for a session come back from one shard read."""
+    seen_dir = tmp_path / "seen.d"
+    mark_seen(seen_dir, "sess-a", "f1", [2, 4])
+    mark_seen(seen_dir, "sess-a", "f2", [5])
+    mark_seen(seen_dir, "sess-b", "f1", [9])
+
+    assert load_seen(seen_dir, "sess-a") == {"f1": {2, 4}, "f2": {5}}
+    assert load_seen(seen_dir, "missing") == {}
+
+
+def test_migrates_legacy_file_into_shards(tmp_path):
+    """Legacy session TAB flow TAB idx file is split per session and removed."""
+    legacy = tmp_path / ".seen-correction-sessions"
+    legacy.write_text("sess-a\tf1\t2\nsess-b\tfv\t0\ngarbage\nsess-a\tf2\t5\n")
+    seen_dir = tmp_path / "seen.d"
+
+    migrate_seen_file(legacy, seen_dir)
+
+    assert not legacy.exists()
+    assert load_seen(seen_dir, "sess-a") == {"f1": {2}, "f2": {5}}
+    assert load_seen(seen_dir, "sess-b") == {"fv": {0}}
+
+
+def test_resumes_interrupted_migration(tmp_path):
+    """A leftover .migrating file from a crashed run is migrated on the next call."""
+    leftover = tmp_path / ".seen-correction-sessions.migrating"
+    leftover.write_text("sess-a\tf1\t2\n")
+    seen_dir = tmp_path / "seen.d"
+
+    migrate_seen_file(tmp_path / ".seen-correction-sessions", seen_dir)
+
+    assert not leftover.exists()
+    assert load_seen(seen_dir, "sess-a") == {"f1": {2}}
+
+
+def test_compaction_stops_at_deadline(tmp_path):
+    """Expired deadline → returns None and leaves state untouched for the next run."""
+    seen_dir = tmp_path / "seen.d"
+    mark_seen(seen_dir, "gone-session", "f1", [1])
+    (tmp_path / "projects").mkdir()
+
+    assert compact_session_state([seen_dir], tmp_path / "projects", deadline=0.0) is None
+    assert load_seen(seen_dir, "gone-session") == {"f1": {1}}
+
+
+def test_compaction_without_projects_dir_keeps_state(tmp_path):
+    """Unknown transcript set (no projects dir) → nothing can be shown gone."""
+    seen_dir = tmp_path / "seen.d"
+    mark_seen(seen_dir, "sess-a", "f1", [1])
+
+    assert compact_session_state([seen_dir], tmp_path / "missing") == 0
+    assert load_seen(seen_dir, "sess-a") == {"f1": {1}}
+
+
+def test_unreadable_project_dir_does_not_expose_other_live_sessions(tmp_path, monkeypatch):
+    """One project dir failing to list → skipped; live sessions elsewhere keep their state."""
+    seen_dir = tmp_path / "seen.d"
+    mark_seen(seen_dir, "live-session", "f1", [1])
+    mark_seen(seen_dir, "gone-session", "f1", [1])
+    projects = tmp_path / "projects"
+    (projects / "locked").mkdir(parents=True)
+    (projects / "open").mkdir()
+    (projects / "open" / "live-session.jsonl").write_text("{}\n")
+    scandir = os.scandir
+
+    def flaky_scandir(path):
+        if os.path.basename(path) == "locked":
+            raise PermissionError(path)
+        return scandir(path)
+
+    monkeypatch.setattr(_learn_utils.os, "scandir", flaky_scandir)
+
+    assert compact_session_state([seen_dir], projects) == 1
+    assert load_seen(seen_dir, "live-session") == {"f1": {1}}
+    assert load_seen(seen_dir, "gone-session") == {}
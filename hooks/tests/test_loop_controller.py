@@ -128,3 +128,73 @@ def test_no_signal_continues_loop(test_project, run_hook):
     assert exit_code == 2
     assert stdout.strip() == cmd
     assert state_file.exists()
+
+
+# ---------------------------------------------------------------------------
+# JSON Stop hook payload
+# ---------------------------------------------------------------------------
+
+def _active_state(project_path, signal="LOOP_DONE", cmd="loop-cmd"):
+    return _write_state(
+        project_path,
+        {"active": True, "command": cmd, "completionSignal": signal, "maxIterations": 50, "iteration": 1},
+    )
+
+
+def test_payload_transcript_signal_stops_loop(test_project, run_hook, tmp_path):
+    """Payload transcript_path whose last assistant message has the signal → deletes state, exits 0."""
+    state_file = _active_state(test_project["path"])
+    transcript = tmp_path / "session.jsonl"
+    transcript.write_text(
+        json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "Working..."}]}}) + "\n"
+        + json.dumps({"type": "user", "message": {"content": "LOOP_DONE is not said by the user"}}) + "\n"
+        + json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "All green. LOOP_DONE"}]}}) + "\n"
+    )
+    payload = {"session_id": "s1", "transcript_path": str(transcript), "cwd": str(test_project["path"])}
+
+    exit_code, _, _ = run_hook(HOOK, stdin=json.dumps(payload), cwd=test_project["path"])
+
+    assert exit_code == 0
+    assert not state_file.exists()
+
+
+def test_payload_transcript_without_signal_continues(test_project, run_hook, tmp_path):
+    """Signal only in a user message, not the last assistant message → loop continues (exit 2)."""
+    state_file = _active_state(test_project["path"])
+    transcript = tmp_path / "session.jsonl"
+    transcript.write_text(
+        json.dumps({"type": "user", "message": {"content": "say LOOP_DONE when finished"}}) + "\n"
+        + json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "Still working."}]}}) + "\n"
+    )
+    payload = {"session_id": "s1", "transcript_path": str(transcript), "cwd": str(test_project["path"])}
+
+    exit_code, stdout, _ = run_hook(HOOK, stdin=json.dumps(payload), cwd=test_project["path"])
+
+    assert exit_code == 2
+    assert stdout.strip() == "loop-cmd"
+    assert json.loads(state_file.read_text())["iteration"] == 2
+
+
+def test_payload_last_assistant_message(test_project, run_hook):
+    """Payload last_assistant_message with the signal → loop ends without reading a transcript."""
+    state_file = _active_state(test_project["path"])
+    payload = {"session_id": "s1", "last_assistant_message": "Done. LOOP_DONE"}
+
+    exit_code, _, _ = run_hook(HOOK, stdin=json.dumps(payload), cwd=test_project["path"])
+
+    assert exit_code == 0
+    assert not state_file.exists()
+
+
+def test_payload_cwd_locates_project(test_project, run_hook, tmp_path):
+    """Hook process started elsewhere → payload cwd is used to find the project's loop state."""
+    state_file = _active_state(test_project["path"])
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    payload = {"session_id": "s1", "cwd": str(test_project["path"])}
+
+    exit_code, stdout, _ = run_hook(HOOK, stdin=json.dumps(payload), cwd=elsewhere)
+
+    assert exit_code == 2
+    assert stdout.strip() == "loop-cmd"
+    assert state_file.exists()
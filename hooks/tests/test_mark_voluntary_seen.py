@@ -21,10 +21,15 @@ def _run_mvs(run_hook, project, plugin_root=None):
     return run_hook(HOOK, stdin="", env_overrides=env, cwd=project["path"])
 
 
-def _seen_file(project):
+def _legacy_seen_file(project):
+    """Pre-shard seen file (session_id TAB flow TAB idx) — migrated on first use."""
     return project["home"] / ".claude" / "rules" / ".seen-correction-sessions"
 
 
+def _seen_shard(project, sid):
+    return project["home"] / ".claude" / "rules" / ".seen-correction-sessions.d" / f"{sid}.tsv"
+
+
 def _write_jsonl(path, rows):
     path.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
 
@@ -42,7 +47,7 @@ def _asst(text, sid, ts):
 # ---------------------------------------------------------------------------
 
 def test_marks_voluntary_message_as_seen(test_project, run_hook):
-    """Happy path: 'remember this' in transcript → seen file written with fv entry."""
+    """Happy path: 'remember this' in transcript → seen shard written with fv entry."""
     sid = "test-mvs-happy"
     _write_jsonl(test_project["sessions_dir"] / f"{sid}.jsonl", [
         _user("We always use sqlite3. Remember this.", sid, "2026-02-22T10:00:00Z"),
@@ -52,18 +57,18 @@ def test_marks_voluntary_message_as_seen(test_project, run_hook):
     exit_code, _, _ = _run_mvs(run_hook, test_project)
 
     assert exit_code == 0
-    seen = _seen_file(test_project)
+    seen = _seen_shard(test_project, sid)
     assert seen.exists()
     content = seen.read_text()
-    assert f"{sid}\tfv\t0" in content
+    assert "fv\t0" in content.splitlines()
 
 
 def test_no_transcript_exits_0(test_project, run_hook):
-    """No transcript in sessions dir → exits 0, no seen file created."""
+    """No transcript in sessions dir → exits 0, no seen store created."""
     exit_code, _, _ = _run_mvs(run_hook, test_project)
 
     assert exit_code == 0
-    assert not _seen_file(test_project).exists()
+    assert not _seen_shard(test_project, "any").parent.exists()
 
 
 def test_no_voluntary_keywords_exits_0(test_project, run_hook):
@@ -77,27 +82,29 @@ def test_no_voluntary_keywords_exits_0(test_project, run_hook):
     exit_code, _, _ = _run_mvs(run_hook, test_project)
 
     assert exit_code == 0
-    assert not _seen_file(test_project).exists()
+    assert not _seen_shard(test_project, sid).exists()
 
 
 def test_already_seen_not_duplicated(test_project, run_hook):
-    """Index already in seen file → not written again."""
+    """Index already in legacy seen file → migrated to the shard, not written again."""
     sid = "test-mvs-dedup"
     _write_jsonl(test_project["sessions_dir"] / f"{sid}.jsonl", [
         _user("Save this: always use RS256 for JWT.", sid, "2026-02-22T10:00:00Z"),
         _asst("Noted.", sid, "2026-02-22T10:01:00Z"),
     ])
 
-    seen = _seen_file(test_project)
-    seen.parent.mkdir(parents=True, exist_ok=True)
-    seen.write_text(f"{sid}\tfv\t0\n")
+    legacy = _legacy_seen_file(test_project)
+    legacy.parent.mkdir(parents=True, exist_ok=True)
+    legacy.write_text(f"{sid}\tfv\t0\nother-session\tf1\t3\n")
 
     exit_code, _, _ = _run_mvs(run_hook, test_project)
 
     assert exit_code == 0
+    assert not legacy.exists()
     # Still only one entry — no duplicate written
-    lines = [ln for ln in seen.read_text().splitlines() if ln.strip()]
-    assert len(lines) == 1
+    lines = [ln for ln in _seen_shard(test_project, sid).read_text().splitlines() if ln.strip()]
+    assert lines == ["fv\t0"]
+    assert _seen_shard(test_project, "other-session").read_text() == "f1\t3\n"
 
 
 def test_invalid_plugin_root_exits_0(test_project, run_hook):
@@ -124,4 +131,4 @@ def test_teammate_message_not_marked(test_project, run_hook):
     exit_code, _, _ = _run_mvs(run_hook, test_project)
 
     assert exit_code == 0
-    assert not _seen_file(test_project).exists()
+    assert not _seen_shard(test_project, sid).exists()
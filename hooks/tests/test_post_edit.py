@@ -0,0 +1,77 @@
+"""Tests for post_edit.py — format stage then validate stage in one process."""
+
+import json
+import shutil
+
+import pytest
+
+from hooks.tests.conftest import SCRIPTS
+
+
+@pytest.fixture
+def py_project(tmp_path):
+    """Project with biome (format stage) and [tool.mypy] (validate stage)."""
+    project = tmp_path / "proj"
+    project.mkdir()
+    (project / "biome.json").write_text("{}")
+    (project / "pyproject.toml").write_text("[tool.mypy]\n")
+    return project
+
+
+def _env(home, file_path, **extra):
+    return {"HOME": str(home), "TOOL_INPUT": json.dumps({"file_path": str(file_path)}), **extra}
+
+
+def test_dry_run_formats_then_validates(py_project, tmp_home, run_hook):
+    """Both stages run, format first."""
+    app = py_project / "app.py"
+    app.write_text("x: int = 1\n")
+
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit"], env_overrides=_env(tmp_home, app, DRY_RUN="1"))
+
+    assert exit_code == 0
+    lines = stdout.splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith("[DRY_RUN] Would run: biome format --write")
+    assert lines[1].startswith("[DRY_RUN] Would run: mypy or pyright")
+
+
+def test_unvalidated_file_is_only_formatted(py_project, tmp_home, run_hook):
+    notes = py_project / "notes.ts"
+    notes.write_text("const x = 1;\n")
+
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit"], env_overrides=_env(tmp_home, notes, DRY_RUN="1"))
+
+    assert exit_code == 0
+    assert stdout.splitlines() == [f"[DRY_RUN] Would run: biome format --write {notes}"]
+
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_validator_blocks_after_formatter_fails(py_project, tmp_home, run_hook):
+    """biome missing → format stage gives up silently; mypy's exit code and errors still come through."""
+    if shutil.which("biome"):
+        pytest.skip("biome installed")
+    app = py_project / "app.py"
+    app.write_text("p: str = 8080\n")
+
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit"], env_overrides=_env(tmp_home, app), cwd=py_project)
+
+    assert exit_code == 1
+    assert "app.py:1: error: Incompatible types in assignment" in stdout
+
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_deferred_format_records_and_validation_still_runs(py_project, tmp_home, run_hook):
+    """Deferred mode reads the session id from stdin once and records the file; mypy still gates the edit."""
+    app = py_project / "app.py"
+    app.write_text("p: str = 8080\n")
+    env = _env(tmp_home, app, VORBIT_FORMAT_DEFERRED="1")
+
+    exit_code, stdout, _ = run_hook(
+        SCRIPTS["post_edit"], stdin=json.dumps({"session_id": "s1"}), env_overrides=env, cwd=py_project
+    )
+
+    assert exit_code == 1
+    assert "app.py:1: error" in stdout
+    dirty = tmp_home / ".claude" / "vorbit-format" / "dirty" / "s1.txt"
+    assert dirty.read_text().splitlines() == [str(app)]
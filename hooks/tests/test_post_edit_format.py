@@ -1,7 +1,15 @@
 """Tests for post_edit_format.py hook — migrated from test-post-edit-format.sh."""
 
 import json
-from hooks.tests.conftest import SCRIPTS
+import os
+import shutil
+import socket
+import time
+from pathlib import Path
+
+import pytest
+
+from hooks.tests.conftest import SCRIPTS, global_node_package
 
 
 def test_detects_biome_json(tmp_path, run_hook):
@@ -77,3 +85,103 @@ def test_formatter_failure_exits_zero(tmp_path, run_hook):
     exit_code, stdout, _ = run_hook(SCRIPTS["post_edit_format"], env_overrides=env)
 
     assert exit_code == 0
+
+
+# ---------------------------------------------------------------------------
+# Prettier server mode (VORBIT_FORMAT_SERVER=1)
+# ---------------------------------------------------------------------------
+
+def test_server_mode_dry_run(tmp_path, run_hook):
+    (tmp_path / ".prettierrc").write_text("{}")
+    test_file = tmp_path / "test.ts"
+    test_file.write_text("const x = 1;")
+
+    env = {
+        "TOOL_INPUT": json.dumps({"file_path": str(test_file)}),
+        "DRY_RUN": "1",
+        "VORBIT_FORMAT_SERVER": "1",
+    }
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit_format"], env_overrides=env)
+
+    assert exit_code == 0
+    assert "prettier --write" in stdout
+    assert "via prettier server" in stdout
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_server_falls_back_without_project_prettier(tmp_path, node_worker):
+    """Project has no prettier in node_modules → worker exits, caller must fall back."""
+    (tmp_path / ".prettierrc").write_text("{}")
+    test_file = tmp_path / "test.ts"
+    test_file.write_text("const   x=1")
+
+    assert node_worker.format_with_server(str(tmp_path), str(test_file), 30.0) is False
+    assert test_file.read_text() == "const   x=1"
+    assert not Path(node_worker.worker_socket("prettier", str(tmp_path))).exists()
+
+
+def test_busy_worker_is_not_restarted(tmp_path, node_worker, monkeypatch):
+    """Worker listening but not answering in time → fall back within the timeout, socket left alone."""
+    path = node_worker.worker_socket("prettier", str(tmp_path))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    started = []
+    monkeypatch.setattr(node_worker, "_start_worker", lambda *args: started.append(args) or True)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as busy:
+        busy.bind(path)
+        busy.listen()
+        start = time.monotonic()
+        assert node_worker.call_worker("prettier", str(tmp_path), {"file": "a.ts"}, timeout=0.3) is None
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 1.0
+    assert started == []
+    assert os.path.exists(path)
+
+
+@pytest.mark.skipif(
+    shutil.which("node") is None or global_node_package("prettier") is None, reason="node/prettier not installed"
+)
+def test_server_formats_and_stays_resident(tmp_path, node_worker, monkeypatch):
+    """Project prettier → file formatted in place; the second edit reuses the same worker."""
+    monkeypatch.setattr(node_worker, "IDLE_TIMEOUT_MS", 2000)
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "prettier").symlink_to(global_node_package("prettier"))
+    (tmp_path / ".prettierrc").write_text('{"semi": false}')
+    first, second = tmp_path / "a.ts", tmp_path / "b.ts"
+    first.write_text("const   x=1;\n")
+    second.write_text("let  y =  2;\n")
+
+    assert node_worker.format_with_server(str(tmp_path), str(first), 30.0) is True
+    sock = Path(node_worker.worker_socket("prettier", str(tmp_path)))
+    inode = sock.stat().st_ino
+    assert node_worker.format_with_server(str(tmp_path), str(second), 30.0) is True
+
+    assert first.read_text() == "const x = 1\n"
+    assert second.read_text() == "let y = 2\n"
+    assert sock.stat().st_ino == inode
+
+    # Idle timeout → worker exits and removes its socket
+    deadline = time.monotonic() + 10
+    while sock.exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not sock.exists()
+
+
+def test_monorepo_package_formatter_wins_over_root(tmp_path, run_hook):
+    """Package with its own biome.json → biome there; a package without one → the root's prettier."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".prettierrc").write_text("{}")
+    (tmp_path / "packages" / "web" / "src").mkdir(parents=True)
+    (tmp_path / "packages" / "web" / "biome.json").write_text("{}")
+    (tmp_path / "packages" / "docs" / "src").mkdir(parents=True)
+    (tmp_path / "packages" / "docs" / "package.json").write_text("{}")
+
+    def dry_run(package):
+        test_file = tmp_path / "packages" / package / "src" / "app.ts"
+        test_file.write_text("const x = 1;")
+        env = {"TOOL_INPUT": json.dumps({"file_path": str(test_file)}), "DRY_RUN": "1"}
+        return run_hook(SCRIPTS["post_edit_format"], env_overrides=env, cwd=tmp_path)[1]
+
+    assert "biome format --write" in dry_run("web")
+    assert "prettier --write" in dry_run("docs")
@@ -2,10 +2,12 @@
 
 import json
 import shutil
+import subprocess
+from pathlib import Path
 
 import pytest
 
-from hooks.tests.conftest import SCRIPTS
+from hooks.tests.conftest import SCRIPTS, global_node_package
 
 
 def test_detects_tsconfig(tmp_path, run_hook):
@@ -79,3 +81,525 @@ def test_validation_success_passes(tmp_path, run_hook):
     exit_code, _, _ = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)
 
     assert exit_code == 0
+
+
+# ---------------------------------------------------------------------------
+# TypeScript server mode (VORBIT_VALIDATE_SERVER=1)
+# ---------------------------------------------------------------------------
+
+def test_ts_server_mode_dry_run(tmp_path, run_hook):
+    (tmp_path / "tsconfig.json").write_text("{}")
+    test_file = tmp_path / "test.ts"
+    test_file.write_text("const x: number = 42;")
+
+    env = {
+        "TOOL_INPUT": json.dumps({"file_path": str(test_file)}),
+        "DRY_RUN": "1",
+        "VORBIT_VALIDATE_SERVER": "1",
+    }
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)
+
+    assert exit_code == 0
+    assert "tsc --noEmit (via TypeScript server" in stdout
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_ts_server_unavailable_without_project_typescript(tmp_path, node_worker):
+    """No typescript in the project → worker exits, hook falls back to tsc --noEmit."""
+    (tmp_path / "tsconfig.json").write_text("{}")
+    test_file = tmp_path / "test.ts"
+    test_file.write_text("const x: number = 42;")
+
+    assert node_worker.call_worker("typescript", str(tmp_path), {"file": str(test_file)}, timeout=5) is None
+    assert not Path(node_worker.worker_socket("typescript", str(tmp_path))).exists()
+
+
+@pytest.mark.skipif(
+    shutil.which("node") is None or global_node_package("typescript") is None,
+    reason="node/typescript not installed",
+)
+def test_ts_server_checks_edited_file_and_importers(tmp_path, worker_home, run_hook):
+    """Changing an export's type → the importer's error is reported; unrelated files are not checked."""
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "typescript").symlink_to(global_node_package("typescript"))
+    (tmp_path / "tsconfig.json").write_text('{"compilerOptions": {"strict": true, "noEmit": true}}')
+    lib, app, other = tmp_path / "lib.ts", tmp_path / "app.ts", tmp_path / "other.ts"
+    lib.write_text("export const port: number = 8080;\n")
+    app.write_text('import { port } from "./lib";\nconst p: number = port;\n')
+    other.write_text('const broken: number = "unrelated";\n')
+    env = {
+        "HOME": str(worker_home),
+        "VORBIT_VALIDATE_SERVER": "1",
+        "TOOL_INPUT": json.dumps({"file_path": str(lib)}),
+    }
+
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)
+    assert exit_code == 0, stderr
+
+    lib.write_text('export const port: string = "8080";\n')
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)
+
+    assert exit_code == 2
+    assert "app.ts(2,7): error TS2322" in stderr
+    assert "other.ts" not in stderr
+
+
+@pytest.mark.skipif(
+    shutil.which("node") is None or global_node_package("typescript") is None,
+    reason="node/typescript not installed",
+)
+def test_ts_server_checks_indirect_importers(tmp_path, worker_home, run_hook):
+    """main.ts uses lib's type only through app.ts's re-export → its error is still reported."""
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "typescript").symlink_to(global_node_package("typescript"))
+    (tmp_path / "tsconfig.json").write_text('{"compilerOptions": {"strict": true, "noEmit": true}}')
+    lib = tmp_path / "lib.ts"
+    lib.write_text("export const port: number = 8080;\n")
+    (tmp_path / "app.ts").write_text('import { port } from "./lib";\nexport const p = port;\n')
+    (tmp_path / "main.ts").write_text('import { p } from "./app";\nconst n: number = p;\n')
+    env = {
+        "HOME": str(worker_home),
+        "VORBIT_VALIDATE_SERVER": "1",
+        "TOOL_INPUT": json.dumps({"file_path": str(lib)}),
+    }
+    assert run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)[0] == 0
+
+    lib.write_text('export const port: string = "8080";\n')
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)
+
+    assert exit_code == 2
+    assert "main.ts(2,7): error TS2322" in stderr
+
+
+# ---------------------------------------------------------------------------
+# Resident Python checkers (VORBIT_VALIDATE_SERVER=1): dmypy, pyright langserver
+# ---------------------------------------------------------------------------
+
+def test_python_server_mode_dry_run(tmp_path, run_hook):
+    (tmp_path / "pyproject.toml").write_text("[tool.pyright]\n")
+    test_file = tmp_path / "test.py"
+    test_file.write_text("x: int = 1\n")
+
+    env = {
+        "TOOL_INPUT": json.dumps({"file_path": str(test_file)}),
+        "DRY_RUN": "1",
+        "VORBIT_VALIDATE_SERVER": "1",
+    }
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)
+
+    assert exit_code == 0
+    assert "via dmypy / pyright server" in stdout
+
+
+@pytest.fixture
+def mypy_project(tmp_path, tmp_home):
+    """pyproject with [tool.mypy]; stops the dmypy daemon the test started."""
+    project = tmp_path / "proj"
+    project.mkdir()
+    (project / "pyproject.toml").write_text("[tool.mypy]\n")
+    (project / "lib.py").write_text("def port() -> int:\n    return 8080\n")
+    yield project
+    for status_file in (tmp_home / ".claude" / "vorbit-workers").glob("dmypy-*.json"):
+        subprocess.run(["dmypy", "--status-file", str(status_file), "stop"], capture_output=True)
+
+
+@pytest.mark.skipif(shutil.which("dmypy") is None, reason="dmypy not installed")
+def test_dmypy_checks_and_reuses_daemon(mypy_project, tmp_home, run_hook):
+    """mypy project → dmypy reports the error; the re-check reuses the same daemon."""
+    app = mypy_project / "app.py"
+    app.write_text("from lib import port\np: str = port()\n")
+    env = {
+        "HOME": str(tmp_home),
+        "VORBIT_VALIDATE_SERVER": "1",
+        "TOOL_INPUT": json.dumps({"file_path": str(app)}),
+    }
+
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=mypy_project)
+    assert exit_code == 1
+    assert "app.py:2: error: Incompatible types in assignment" in stdout
+    status_files = list((tmp_home / ".claude" / "vorbit-workers").glob("dmypy-*.json"))
+    assert len(status_files) == 1
+    daemon_pid = json.loads(status_files[0].read_text())["pid"]
+
+    app.write_text("from lib import port\np: int = port()\n")
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=mypy_project)
+
+    assert exit_code == 0
+    assert json.loads(status_files[0].read_text())["pid"] == daemon_pid
+    assert not (mypy_project / ".dmypy.json").exists()
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_pyright_server_unavailable_without_langserver(tmp_path, node_worker, monkeypatch):
+    """No pyright-langserver in the project or on PATH → worker exits, hook falls back to the CLI."""
+    monkeypatch.setenv("PATH", str(Path(shutil.which("node")).parent))
+    if shutil.which("pyright-langserver"):
+        pytest.skip("pyright-langserver installed next to node")
+    (tmp_path / "pyproject.toml").write_text("[tool.pyright]\n")
+    test_file = tmp_path / "test.py"
+    test_file.write_text("x: int = 1\n")
+
+    assert node_worker.call_worker("pyright", str(tmp_path), {"file": str(test_file)}, timeout=5) is None
+
+
+@pytest.mark.skipif(
+    shutil.which("node") is None or shutil.which("pyright-langserver") is None,
+    reason="node/pyright-langserver not installed",
+)
+def test_pyright_server_reports_and_clears_errors(tmp_path, worker_home, run_hook):
+    """pyright project → error on stderr with exit 2; after the fix the same worker reports clean."""
+    (tmp_path / "pyproject.toml").write_text("[tool.pyright]\n")
+    test_file = tmp_path / "app.py"
+    test_file.write_text("p: str = 8080\n")
+    env = {
+        "HOME": str(worker_home),
+        "VORBIT_VALIDATE_SERVER": "1",
+        "TOOL_INPUT": json.dumps({"file_path": str(test_file)}),
+    }
+
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)
+    assert exit_code == 2
+    assert "app.py:1:10 - error:" in stderr
+
+    test_file.write_text("p: int = 8080\n")
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env)
+
+    assert exit_code == 0, stderr
+
+
+# ---------------------------------------------------------------------------
+# Package-scoped Go validation
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def go_module(tmp_path, tmp_home):
+    """Module with lib, app (imports lib) and a broken package nobody imports."""
+    module = tmp_path / "mod"
+    for pkg, source in {
+        "lib": "package lib\n\nfunc Port() int { return 8080 }\n",
+        "app": 'package app\n\nimport "example.com/mod/lib"\n\nvar P int = lib.Port()\n',
+        "broken": "package broken\n\nvar X int = \"not an int\"\n",
+    }.items():
+        (module / pkg).mkdir(parents=True)
+        (module / pkg / f"{pkg}.go").write_text(source)
+    (module / "go.mod").write_text("module example.com/mod\n\ngo 1.21\n")
+    subprocess.run(["git", "init", "--quiet"], cwd=module, check=True)
+    go_cache = subprocess.run(["go", "env", "GOCACHE"], capture_output=True, text=True).stdout.strip()
+
+    def edit(pkg, source=None):
+        path = module / pkg / f"{pkg}.go"
+        if source is not None:
+            path.write_text(source)
+        env = {"HOME": str(tmp_home), "GOCACHE": go_cache, "TOOL_INPUT": json.dumps({"file_path": str(path)})}
+        return env
+
+    return module, edit
+
+
+@pytest.mark.skipif(shutil.which("go") is None, reason="go not installed")
+def test_go_builds_only_edited_package_and_importers(go_module, run_hook):
+    """Edit lib → lib and app are built; the unrelated broken package is not."""
+    module, edit = go_module
+
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("lib"), cwd=module)
+    assert exit_code == 0, stderr
+
+    breaking = "package lib\n\nfunc Port() string { return \"8080\" }\n"
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("lib", breaking), cwd=module)
+
+    assert exit_code != 0
+    assert "app/app.go" in stderr
+    assert "broken" not in stderr
+
+
+@pytest.mark.skipif(shutil.which("go") is None, reason="go not installed")
+def test_go_graph_picks_up_new_importer(go_module, run_hook, tmp_home):
+    """A package that starts importing lib after the graph was cached is rebuilt on lib edits."""
+    module, edit = go_module
+    run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("lib"), cwd=module)
+    assert list((tmp_home / ".claude" / "vorbit-workers").glob("golist-*.json"))
+
+    # broken now imports lib (and compiles) — its own edit refreshes its graph entry
+    fixed = 'package broken\n\nimport "example.com/mod/lib"\n\nvar X int = lib.Port()\n'
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("broken", fixed), cwd=module)
+    assert exit_code == 0, stderr
+
+    breaking = "package lib\n\nfunc Port() string { return \"8080\" }\n"
+    _, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("lib", breaking), cwd=module)
+
+    assert "broken/broken.go" in stderr
+    assert "app/app.go" in stderr
+
+
+@pytest.mark.skipif(shutil.which("go") is None, reason="go not installed")
+def test_go_rebuilds_packages_reaching_the_edit_through_a_new_import(go_module, run_hook):
+    """c imports b; b later starts importing lib → a lib edit rebuilds c as well."""
+    module, edit = go_module
+    for pkg, source in {
+        "b": "package b\n\nfunc F() int { return 1 }\n",
+        "c": 'package c\n\nimport "example.com/mod/b"\n\nvar X int = b.F()\n',
+    }.items():
+        (module / pkg).mkdir()
+        (module / pkg / f"{pkg}.go").write_text(source)
+    run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("lib"), cwd=module)
+    reexport = 'package b\n\nimport "example.com/mod/lib"\n\nvar F = lib.Port\n'
+    assert run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("b", reexport), cwd=module)[0] == 0
+
+    breaking = "package lib\n\nfunc Port() string { return \"8080\" }\n"
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("lib", breaking), cwd=module)
+
+    assert exit_code != 0
+    assert "c/c.go" in stderr
+
+
+@pytest.mark.skipif(shutil.which("go") is None, reason="go not installed")
+def test_go_graph_picks_up_package_created_outside_the_hook(go_module, run_hook):
+    module, edit = go_module
+    run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("lib"), cwd=module)
+    (module / "d").mkdir()
+    (module / "d" / "d.go").write_text('package d\n\nimport "example.com/mod/lib"\n\nvar P int = lib.Port()\n')
+
+    breaking = "package lib\n\nfunc Port() string { return \"8080\" }\n"
+    _, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=edit("lib", breaking), cwd=module)
+
+    assert "d/d.go" in stderr
+
+
+# ---------------------------------------------------------------------------
+# Content-hash result cache
+# ---------------------------------------------------------------------------
+
+def _validate(run_hook, project, home, file_path, dry_run=False):
+    env = {"HOME": str(home), "TOOL_INPUT": json.dumps({"file_path": str(file_path)})}
+    if dry_run:
+        env["DRY_RUN"] = "1"
+    return run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=project)
+
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_reverted_content_replays_cached_verdict(mypy_project, tmp_home, run_hook):
+    """Bad → fixed → bad again: the revert replays the first run's errors and exit code."""
+    app = mypy_project / "app.py"
+    bad = "from lib import port\np: str = port()\n"
+    app.write_text(bad)
+    exit_code, first_stdout, _ = _validate(run_hook, mypy_project, tmp_home, app)
+    assert exit_code == 1
+    assert "app.py:2: error: Incompatible types in assignment" in first_stdout
+
+    app.write_text("from lib import port\np: int = port()\n")
+    _, stdout, _ = _validate(run_hook, mypy_project, tmp_home, app, dry_run=True)
+    assert "Would run: mypy or pyright" in stdout
+    assert _validate(run_hook, mypy_project, tmp_home, app)[0] == 0
+
+    app.write_text(bad)
+    _, stdout, _ = _validate(run_hook, mypy_project, tmp_home, app, dry_run=True)
+    assert "Would replay cached python result (exit 1)" in stdout
+    exit_code, stdout, _ = _validate(run_hook, mypy_project, tmp_home, app)
+
+    assert exit_code == 1
+    assert stdout == first_stdout
+
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_config_change_invalidates_cached_verdicts(mypy_project, tmp_home, run_hook):
+    """Editing [tool.mypy] can change the verdict, so the same content is checked again."""
+    app = mypy_project / "app.py"
+    app.write_text("def f(x):\n    return x\n")
+    assert _validate(run_hook, mypy_project, tmp_home, app)[0] == 0
+    _, stdout, _ = _validate(run_hook, mypy_project, tmp_home, app, dry_run=True)
+    assert "Would replay cached python result (exit 0)" in stdout
+
+    (mypy_project / "pyproject.toml").write_text("[tool.mypy]\ndisallow_untyped_defs = true\n")
+    _, stdout, _ = _validate(run_hook, mypy_project, tmp_home, app, dry_run=True)
+    assert "Would run: mypy or pyright" in stdout
+    exit_code, stdout, _ = _validate(run_hook, mypy_project, tmp_home, app)
+
+    assert exit_code == 1
+    assert "Function is missing a type annotation" in stdout
+
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_other_file_change_invalidates_cached_verdict(mypy_project, tmp_home, run_hook):
+    """app.py passed, then lib.py changed the type it imports → app.py is checked again."""
+    app = mypy_project / "app.py"
+    app.write_text("from lib import port\np: int = port()\n")
+    lib = mypy_project / "lib.py"
+    assert _validate(run_hook, mypy_project, tmp_home, app)[0] == 0
+    assert _validate(run_hook, mypy_project, tmp_home, lib)[0] == 0
+
+    lib.write_text("def port() -> str:\n    return '8080'\n")
+    assert _validate(run_hook, mypy_project, tmp_home, lib)[0] == 1  # lib.py's run checks its importer too
+    _, stdout, _ = _validate(run_hook, mypy_project, tmp_home, app, dry_run=True)
+    assert "Would run: mypy or pyright" in stdout
+    exit_code, stdout, _ = _validate(run_hook, mypy_project, tmp_home, app)
+
+    assert exit_code == 1
+    assert "app.py:2: error: Incompatible types in assignment" in stdout
+
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_file_changed_outside_the_hook_invalidates_cached_verdict(mypy_project, tmp_home, run_hook):
+    """lib.py passed; an importer never validated is then broken by a Bash write → lib.py is checked again."""
+    lib = mypy_project / "lib.py"
+    assert _validate(run_hook, mypy_project, tmp_home, lib)[0] == 0
+
+    (mypy_project / "app.py").write_text("from lib import port\np: str = port()\n")
+    _, stdout, _ = _validate(run_hook, mypy_project, tmp_home, lib, dry_run=True)
+    assert "Would run: mypy or pyright" in stdout
+    exit_code, stdout, _ = _validate(run_hook, mypy_project, tmp_home, lib)
+
+    assert exit_code == 1
+    assert "app.py:2: error: Incompatible types in assignment" in stdout
+
+
+# ---------------------------------------------------------------------------
+# Validation deadline
+# ---------------------------------------------------------------------------
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_hung_checker_is_skipped_not_blocking(tmp_path, tmp_home, run_hook):
+    """mypy stuck loading a plugin → killed at VORBIT_VALIDATE_TIMEOUT, edit allowed, nothing cached."""
+    (tmp_path / "pyproject.toml").write_text('[tool.mypy]\nplugins = ["slow_plugin.py"]\n')
+    (tmp_path / "slow_plugin.py").write_text("import time\ntime.sleep(60)\n")
+    app = tmp_path / "app.py"
+    app.write_text("p: str = 8080\n")
+    env = {"HOME": str(tmp_home), "VORBIT_VALIDATE_TIMEOUT": "1", "TOOL_INPUT": json.dumps({"file_path": str(app)})}
+
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=tmp_path)
+
+    assert exit_code == 0
+    assert "validation skipped: timed out after 1s (mypy " in stderr
+    log = (tmp_home / ".claude" / "vorbit-hooks" / "timeouts.jsonl").read_text().splitlines()
+    assert json.loads(log[-1])["stage"] == "validate"
+    _, stdout, _ = run_hook(SCRIPTS["post_edit_validate"], env_overrides={**env, "DRY_RUN": "1"}, cwd=tmp_path)
+    assert "Would run: mypy or pyright" in stdout
+
+
+# ---------------------------------------------------------------------------
+# Syntax tier
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def stub_mypy(tmp_path, tmp_home):
+    """mypy stub recording its arguments; returns (env for editing app.py, args file)."""
+    args = tmp_path / "mypy-args"
+    stub_bin = tmp_path / "bin"
+    stub_bin.mkdir()
+    (stub_bin / "mypy").write_text(f'#!/bin/sh\necho "$@" > {args}\necho "app.py:1: error: invalid syntax"\nexit 2\n')
+    (stub_bin / "mypy").chmod(0o755)
+    env = {
+        "HOME": str(tmp_home),
+        "PATH": f"{stub_bin}:/usr/bin:/bin",
+        "TOOL_INPUT": json.dumps({"file_path": str(tmp_path / "app.py")}),
+    }
+    return env, args
+
+
+def test_python_syntax_error_blocks_before_checker_runs(tmp_path, stub_mypy, run_hook):
+    """Hook interpreter at least the project's target → exit 2 with the parse error; mypy is never started."""
+    env, args = stub_mypy
+    (tmp_path / "pyproject.toml").write_text('[project]\nrequires-python = ">=3.9"\n\n[tool.mypy]\n')
+    app = tmp_path / "app.py"
+    app.write_text("def port(:\n    return 8080\n")
+
+    exit_code, stdout, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=tmp_path)
+
+    assert exit_code == 2
+    assert stdout == ""
+    assert stderr.startswith(f"{app}:1:10: error: ")
+    assert not args.exists()
+
+
+def test_python_syntax_error_blocks_without_a_checker(tmp_path, tmp_home, run_hook):
+    (tmp_path / "pyproject.toml").write_text('[project]\nrequires-python = ">=3.9"\n')
+    app = tmp_path / "app.py"
+    app.write_text("def port(:\n    return 8080\n")
+    env = {"HOME": str(tmp_home), "TOOL_INPUT": json.dumps({"file_path": str(app)})}
+
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=tmp_path)
+
+    assert exit_code == 2
+    assert stderr.startswith(f"{app}:1:10: error: ")
+
+
+@pytest.mark.parametrize("pyproject", ["[tool.mypy]\n", '[tool.mypy]\npython_version = "3.99"\n'])
+def test_python_syntax_error_is_left_to_the_checker(tmp_path, stub_mypy, run_hook, pyproject):
+    """No target, or one newer than the hook's interpreter → mypy checks the file alone and gives the verdict."""
+    env, args = stub_mypy
+    (tmp_path / "pyproject.toml").write_text(pyproject)
+    app = tmp_path / "app.py"
+    app.write_text("def port(:\n    return 8080\n")
+    (tmp_path / "main.py").write_text("import app\n")
+
+    exit_code, stdout, _ = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=tmp_path)
+
+    assert exit_code == 2
+    assert "app.py:1: error: invalid syntax" in stdout
+    assert args.read_text().split()[-1] == str(app)
+    assert "main.py" not in args.read_text()
+
+
+def test_python_syntax_error_passes_without_a_target(tmp_path, tmp_home, run_hook):
+    """No checker and no target version → nothing to judge the file's grammar by."""
+    app = tmp_path / "app.py"
+    app.write_text("def port(:\n    return 8080\n")
+    env = {"HOME": str(tmp_home), "TOOL_INPUT": json.dumps({"file_path": str(app)})}
+
+    assert run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=tmp_path) == (0, "", "")
+
+
+@pytest.mark.parametrize("name, content, code, diagnostic", [
+    ("package.json", '{"name": "app",}\n', 2, ":1:16: error:"),
+    ("tsconfig.json", '{\n  // strict\n  "compilerOptions": {"strict": true,},\n}\n', 0, None),
+    (".eslintrc.json", '{"rules": {}, extends: []}\n', 1, ":1:15: warning:"),
+])
+def test_json_edit_is_syntax_checked_without_a_toolchain(tmp_path, tmp_home, run_hook, name, content, code, diagnostic):
+    config = tmp_path / name
+    config.write_text(content)
+    env = {"HOME": str(tmp_home), "TOOL_INPUT": json.dumps({"file_path": str(config)})}
+
+    exit_code, _, stderr = run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=tmp_path)
+
+    assert exit_code == code
+    assert stderr.startswith(f"{config}{diagnostic}") if diagnostic else stderr == ""
+
+
+# ---------------------------------------------------------------------------
+# Monorepo packages
+# ---------------------------------------------------------------------------
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_mypy_runs_with_nearest_package_config(tmp_path, tmp_home, run_hook):
+    """Git root without mypy config: each package is checked under its own [tool.mypy]."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'workspace'\n")
+    untyped = "def port(value):\n    return value\n"
+    for package, config in (("strict", "disallow_untyped_defs = true\n"), ("lax", "")):
+        (tmp_path / package / "src").mkdir(parents=True)
+        (tmp_path / package / "pyproject.toml").write_text(f"[tool.mypy]\n{config}")
+        (tmp_path / package / "src" / "app.py").write_text(untyped)
+
+    def validate(package):
+        app = tmp_path / package / "src" / "app.py"
+        env = {"HOME": str(tmp_home), "TOOL_INPUT": json.dumps({"file_path": str(app)})}
+        return run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=tmp_path)
+
+    exit_code, stdout, _ = validate("strict")
+    assert exit_code == 1
+    assert "app.py:1: error: Function is missing a type annotation" in stdout
+    assert validate("lax")[0] == 0
+
+
+@pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+def test_mypy_checks_direct_importers_of_edited_module(mypy_project, tmp_home, run_hook):
+    """Changing lib.port's return type blocks on the importer it breaks; a non-importer is not checked."""
+    (mypy_project / "app.py").write_text("from lib import port\np: int = port()\n")
+    (mypy_project / "other.py").write_text("q: int = 'not checked with lib.py'\n")
+    lib = mypy_project / "lib.py"
+    lib.write_text("def port() -> str:\n    return '8080'\n")
+
+    exit_code, stdout, _ = _validate(run_hook, mypy_project, tmp_home, lib)
+
+    assert exit_code == 1
+    assert "app.py:2: error: Incompatible types in assignment" in stdout
+    assert "other.py" not in stdout
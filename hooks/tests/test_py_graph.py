@@ -0,0 +1,92 @@
+"""Tests for _py_graph.py — cached Python import graph for importer-scoped mypy runs."""
+
+import json
+import os
+import sys
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+from _py_graph import importers_of, module_name  # noqa: E402
+from _utils import project_state_path  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("isolated_home")
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    files = {
+        "src/shop/__init__.py": "",
+        "src/shop/models.py": "class Order: ...\n",
+        "src/shop/api.py": "from .models import Order\n",
+        "src/shop/cli.py": "from shop import models\n",
+        "src/shop/views/__init__.py": "",
+        "src/shop/views/list.py": "from ..models import Order\n",
+        "src/shop/report.py": "import shop.api\n\ndef run():\n    import shop.models\n",
+        "src/shop/unrelated.py": "import os\n",
+        "scripts/a/tool.py": "import shop.models\n",
+        "scripts/b/tool.py": "import shop.models\n",
+        ".venv/lib/dep.py": "import shop.models\n",
+    }
+    for relative, content in files.items():
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative).write_text(content)
+    return root
+
+
+def _importers(root, relative):
+    return [os.path.relpath(path, root) for path in importers_of(str(root), str(root / relative))]
+
+
+def test_module_names_follow_init_files():
+    packages = {"src/shop", "src/shop/views"}
+
+    assert module_name("src/shop/views/list.py", packages) == "shop.views.list"
+    assert module_name("src/shop/__init__.py", packages) == "shop"
+    assert module_name("scripts/a/tool.py", packages) == "tool"
+
+
+def test_direct_importers_in_every_import_form(project):
+    """Relative, `from pkg import module` and function-level imports; not report (imports shop.api only)."""
+    assert _importers(project, "src/shop/models.py") == [
+        "src/shop/api.py",
+        "src/shop/cli.py",
+        "src/shop/report.py",
+        "src/shop/views/list.py",
+    ]
+
+
+def test_ambiguous_module_names_and_hidden_dirs_are_skipped(project):
+    """scripts/a/tool.py and scripts/b/tool.py are both `tool`; .venv is never scanned."""
+    assert "scripts/a/tool.py" not in _importers(project, "src/shop/models.py")
+    assert not any(p.startswith(".venv") for p in _importers(project, "src/shop/models.py"))
+
+
+def test_only_changed_files_are_reparsed(project):
+    _importers(project, "src/shop/models.py")
+    cache_file = project_state_path("pyimports", str(project), ".json")
+    with open(cache_file) as f:
+        cached = json.load(f)
+    cached["files"]["src/shop/unrelated.py"]["imports"] = [["shop.models", 0]]
+    with open(cache_file, "w") as f:
+        json.dump(cached, f)
+
+    assert "src/shop/unrelated.py" in _importers(project, "src/shop/models.py")  # stored entry reused
+
+    (project / "src/shop/api.py").write_text("import os\n")
+    (project / "src/shop/new.py").write_text("from . import models\n")
+    importers = _importers(project, "src/shop/models.py")
+
+    assert "src/shop/api.py" not in importers
+    assert "src/shop/new.py" in importers
+
+
+def test_unparsable_importer_is_ignored(project):
+    (project / "src/shop/api.py").write_text("from .models import (Order\n")
+
+    assert "src/shop/api.py" not in _importers(project, "src/shop/models.py")
@@ -0,0 +1,123 @@
+"""Tests for _result_cache.py — content-keyed format/validate results."""
+
+import sys
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+import _result_cache  # noqa: E402
+import _toolchain  # noqa: E402
+from _result_cache import ResultCache, format_cache  # noqa: E402
+from _toolchain import toolchain_profile  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("isolated_home")
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    root.mkdir()
+    return root
+
+
+def test_result_follows_content_not_mtime(project):
+    """Same bytes written again → hit; different bytes → miss."""
+    source = project / "a.ts"
+    source.write_text("const x = 1;\n")
+    cache = ResultCache("format", str(project), "biome", "fp")
+    cache.put(cache.key(str(source)), {"formatted": True})
+
+    source.write_text("const x = 2;\n")
+    assert ResultCache("format", str(project), "biome", "fp").get(cache.key(str(source))) is None
+    source.write_text("const x = 1;\n")
+    assert ResultCache("format", str(project), "biome", "fp").get(cache.key(str(source))) == {"formatted": True}
+
+
+def test_least_recently_used_entry_is_evicted(project, monkeypatch):
+    """Over MAX_ENTRIES → the entry neither stored nor read most recently goes first."""
+    monkeypatch.setattr(_result_cache, "MAX_ENTRIES", 2)
+    files = []
+    for name in ("a.ts", "b.ts", "c.ts"):
+        files.append(project / name)
+        files[-1].write_text(f"// {name}\n")
+    cache = ResultCache("format", str(project), "biome", "fp")
+    keys = [cache.key(str(f)) for f in files]
+
+    cache.put(keys[0], {"formatted": True})
+    cache.put(keys[1], {"formatted": True})
+    assert cache.get(keys[0]) is not None  # a.ts is now the most recently used
+    cache.put(keys[2], {"formatted": True})
+
+    reloaded = ResultCache("format", str(project), "biome", "fp")
+    assert reloaded.get(keys[0]) is not None
+    assert reloaded.get(keys[1]) is None
+    assert reloaded.get(keys[2]) is not None
+
+
+def test_fingerprint_change_drops_only_that_tools_entries(project):
+    source = project / "a.ts"
+    source.write_text("const x = 1;\n")
+    biome = ResultCache("format", str(project), "biome", "fp-1")
+    biome.put(biome.key(str(source)), {"formatted": True})
+    prettier = ResultCache("format", str(project), "prettier", "fp-1")
+    prettier.put(prettier.key(str(source)), {"formatted": True})
+
+    biome = ResultCache("format", str(project), "biome", "fp-2")
+    biome.save()
+
+    assert biome.get(biome.key(str(source))) is None
+    assert ResultCache("format", str(project), "biome", "fp-1").get(biome.key(str(source))) is None
+    prettier = ResultCache("format", str(project), "prettier", "fp-1")
+    assert prettier.get(prettier.key(str(source))) == {"formatted": True}
+
+
+def test_format_cache_invalidated_by_prettier_config(project, monkeypatch):
+    """Adding or editing a .prettierrc* changes what prettier writes → formatted content is stale."""
+    def fresh_cache():
+        monkeypatch.setattr(_toolchain, "_PROFILES", {})
+        return format_cache(str(project), toolchain_profile(str(project)))
+
+    (project / "package.json").write_text('{"prettier": {}}')
+    source = project / "a.ts"
+    source.write_text("const x = 1;\n")
+    cache = fresh_cache()
+    cache.put(cache.key(str(source)), {"formatted": True})
+    assert fresh_cache().get(cache.key(str(source))) is not None
+
+    (project / ".prettierrc.json").write_text('{"semi": false}')
+
+    assert fresh_cache().get(cache.key(str(source))) is None
+
+
+def test_corrupt_cache_file_starts_empty(project):
+    cache = ResultCache("format", str(project), "biome", "fp")
+    cache.save()
+    with open(cache.path, "w") as f:
+        f.write("[1, 2")
+
+    source = project / "a.ts"
+    source.write_text("const x = 1;\n")
+    assert ResultCache("format", str(project), "biome", "fp").get(cache.key(str(source))) is None
+
+
+def test_sources_cache_follows_every_other_source_file(project):
+    """A validate entry is replayed only while no other file of the checker's sources changed."""
+    source = project / "a.py"
+    source.write_text("x = 1\n")
+    (project / "notes.txt").write_text("")
+    cache = ResultCache("validate", str(project), "python", "fp", (".py", ".pyi"))
+    cache.put(cache.key(str(source)), {"returncode": 0})
+
+    def cached():
+        fresh = ResultCache("validate", str(project), "python", "fp", (".py", ".pyi"))
+        return fresh.get(fresh.key(str(source)))
+
+    (project / "notes.txt").write_text("unrelated\n")
+    assert cached() == {"returncode": 0}
+    (project / "pkg").mkdir()
+    (project / "pkg" / "b.py").write_text("import a\n")
+    assert cached() is None
@@ -5,6 +5,7 @@ is never touched. HOME override in subprocess env routes all file I/O to tmp dir
 """
 
 import json
+import os
 from pathlib import Path
 
 from hooks.tests.conftest import PLUGIN_ROOT, SCRIPTS
@@ -37,10 +38,15 @@ def _pending_file(project):
     return _rules_dir(project) / "pending-capture.md"
 
 
-def _seen_file(project):
+def _legacy_seen_file(project):
+    """Pre-shard seen file (session_id TAB flow TAB idx) — migrated on first use."""
     return _rules_dir(project) / ".seen-correction-sessions"
 
 
+def _seen_shard(project, sid):
+    return _rules_dir(project) / ".seen-correction-sessions.d" / f"{sid}.tsv"
+
+
 def _rules_file(project):
     return _rules_dir(project) / "vorbit-learning.md"
 
@@ -246,7 +252,7 @@ def test_word_boundary_not_triggered(test_project, run_hook):
     exit_code, _, _ = _run_slr(run_hook, test_project)
 
     assert exit_code == 0
-    assert not _seen_file(test_project).exists()
+    assert not _seen_shard(test_project, sid).exists()
 
 
 # ============================================================================
@@ -315,7 +321,7 @@ def test_per_learning_dedup_correction(test_project, run_hook, correction_transc
     correction_transcript(test_project["sessions_dir"])
 
     # "Wrong, this project uses SQLite" is at index 2 in the correction_transcript
-    seen = _seen_file(test_project)
+    seen = _legacy_seen_file(test_project)
     seen.parent.mkdir(parents=True, exist_ok=True)
     seen.write_text("test-session-abc123\tf1\t2\n")
 
@@ -334,7 +340,7 @@ def test_correction_retrigger_dedup(test_project, run_hook, correction_transcrip
     exit_code, _, _ = _run_slr(run_hook, test_project)
     assert exit_code == 0
     assert not _output_file(test_project).exists()
-    assert _seen_file(test_project).exists()
+    assert _seen_shard(test_project, "test-session-abc123").exists()
     assert _pending_file(test_project).exists()
 
     # Second run: same session, index already in seen file → exits 0, no new pending write
@@ -360,9 +366,9 @@ def test_multi_capture_new_index(test_project, run_hook):
     # First run: correction at index 2 → exits 0, pending file written, seen file has tab-separated entry
     exit_code, _, _ = _run_slr(run_hook, test_project)
     assert exit_code == 0
-    seen = _seen_file(test_project)
+    seen = _seen_shard(test_project, sid)
     assert seen.exists()
-    assert f"{sid}\tf1\t2" in seen.read_text()
+    assert "f1\t2" in seen.read_text().splitlines()
     pending = _pending_file(test_project)
     assert pending.exists()
     assert "Wrong, use const" in pending.read_text()
@@ -393,7 +399,7 @@ def test_flow2_per_learning_dedup(test_project, run_hook, self_discovery_transcr
     self_discovery_transcript(test_project["sessions_dir"])
 
     # Assistant message with labels is at index 1 in self_discovery_transcript
-    seen = _seen_file(test_project)
+    seen = _legacy_seen_file(test_project)
     seen.parent.mkdir(parents=True, exist_ok=True)
     seen.write_text("test-session-self123\tf2\t1\n")
 
@@ -553,7 +559,7 @@ def test_voluntary_keyword_dedup(test_project, run_hook):
     # First run: voluntary keyword found → exits 0, seen file written with fv entry
     exit_code, _, _ = _run_slr(run_hook, test_project)
     assert exit_code == 0
-    seen = _seen_file(test_project)
+    seen = _seen_shard(test_project, sid)
     assert seen.exists()
     assert "fv" in seen.read_text()
     pending = _pending_file(test_project)
@@ -564,3 +570,238 @@ def test_voluntary_keyword_dedup(test_project, run_hook):
     exit_code, _, _ = _run_slr(run_hook, test_project)
     assert exit_code == 0
     assert pending.read_text() == content_before
+
+
+# ============================================================================
+# Section 9: Incremental Scanning (per-session byte-offset checkpoints)
+# ============================================================================
+
+def _checkpoint_file(project, sid):
+    return _rules_dir(project) / ".transcript-checkpoints" / f"{sid}.json"
+
+
+def test_checkpoint_records_offset(test_project, run_hook, clean_transcript):
+    """9a: Clean run → checkpoint stores byte offset at EOF and next message index."""
+    transcript = clean_transcript(test_project["sessions_dir"])
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+
+    assert exit_code == 0
+    checkpoint = json.loads(_checkpoint_file(test_project, "test-session-def456").read_text())
+    assert checkpoint["offset"] == transcript.stat().st_size
+    assert checkpoint["next_index"] == 3
+    assert checkpoint["last_assistant"] == "I'll fix the login page styling now."
+
+
+def test_appended_correction_uses_carried_context(test_project, run_hook):
+    """9b: Correction appended after a checkpoint → captured at its absolute index with carried-over A: context."""
+    sid = "test-session-incr"
+    transcript = test_project["sessions_dir"] / f"{sid}.jsonl"
+    _write_jsonl(transcript, [
+        _user("Add caching.", sid, "2026-02-22T10:00:00Z"),
+        _asst("Added Redis caching layer.", sid, "2026-02-22T10:01:00Z"),
+    ])
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+    assert exit_code == 0
+    assert not _pending_file(test_project).exists()
+
+    with transcript.open("a") as f:
+        f.write(json.dumps(_user("Wrong, no Redis here.", sid, "2026-02-22T10:02:00Z")) + "\n")
+        f.write(json.dumps(_asst("Removed Redis.", sid, "2026-02-22T10:03:00Z")) + "\n")
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+
+    assert exit_code == 0
+    content = _pending_file(test_project).read_text()
+    assert "A: [Added Redis caching layer.]" in content
+    assert "USER: Wrong, no Redis here." in content
+    assert "A: [Removed Redis.]" in content
+    assert "f1\t2" in _seen_shard(test_project, sid).read_text().splitlines()
+
+
+def test_rewritten_transcript_full_rescan(test_project, run_hook):
+    """9c: Transcript shrinks after a checkpoint → rescanned from the start, indices restart at 0."""
+    sid = "test-session-rewrite"
+    transcript = test_project["sessions_dir"] / f"{sid}.jsonl"
+    _write_jsonl(transcript, [
+        _user("Set up the project.", sid, "2026-02-22T10:00:00Z"),
+        _asst("Project set up with a long explanation of every step taken.", sid, "2026-02-22T10:01:00Z"),
+        _user("Thanks.", sid, "2026-02-22T10:02:00Z"),
+    ])
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+    assert exit_code == 0
+
+    _write_jsonl(transcript, [
+        _user("Nope, start over.", sid, "2026-02-22T10:03:00Z"),
+    ])
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+
+    assert exit_code == 0
+    assert "Nope, start over." in _pending_file(test_project).read_text()
+    assert "f1\t0" in _seen_shard(test_project, sid).read_text().splitlines()
+
+
+def test_partial_trailing_line_deferred(test_project, run_hook):
+    """9d: A last line is not consumed until its newline lands, even once it parses; then it is scanned."""
+    sid = "test-session-partial"
+    transcript = test_project["sessions_dir"] / f"{sid}.jsonl"
+    _write_jsonl(transcript, [
+        _asst("Using var everywhere.", sid, "2026-02-22T10:00:00Z"),
+    ])
+    complete_size = transcript.stat().st_size
+    line = json.dumps(_user("Wrong, use const.", sid, "2026-02-22T10:01:00Z"))
+    with transcript.open("a") as f:
+        f.write(line[:20])
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+    assert exit_code == 0
+    assert not _pending_file(test_project).exists()
+    assert json.loads(_checkpoint_file(test_project, sid).read_text())["offset"] == complete_size
+
+    with transcript.open("a") as f:
+        f.write(line[20:])
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+    assert exit_code == 0
+    assert not _pending_file(test_project).exists()
+    assert json.loads(_checkpoint_file(test_project, sid).read_text())["offset"] == complete_size
+
+    with transcript.open("a") as f:
+        f.write("\n")
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+
+    assert exit_code == 0
+    content = _pending_file(test_project).read_text()
+    assert "USER: Wrong, use const." in content
+    assert "A: [Using var everywhere.]" in content
+
+
+# ============================================================================
+# Section 10: Opportunistic Compaction of Session State
+# ============================================================================
+
+def test_stop_compacts_state_of_deleted_sessions(test_project, run_hook, clean_transcript):
+    """10a: Stop run drops seen shards of sessions whose transcript is gone and stamps the pass."""
+    clean_transcript(test_project["sessions_dir"])
+    stale = _seen_shard(test_project, "deleted-session")
+    stale.parent.mkdir(parents=True)
+    stale.write_text("f1\t2\n")
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+
+    assert exit_code == 0
+    assert not stale.exists()
+    assert (_rules_dir(test_project) / ".last-session-compaction").exists()
+
+
+def test_stop_skips_compaction_within_interval(test_project, run_hook, clean_transcript):
+    """10b: Recent compaction stamp → no compaction pass on this Stop."""
+    clean_transcript(test_project["sessions_dir"])
+    stale = _seen_shard(test_project, "deleted-session")
+    stale.parent.mkdir(parents=True)
+    stale.write_text("f1\t2\n")
+    (_rules_dir(test_project) / ".last-session-compaction").touch()
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+
+    assert exit_code == 0
+    assert stale.exists()
+
+
+def test_stop_compaction_follows_the_transcript_location(test_project, run_hook, tmp_path):
+    """10c: Transcripts outside ~/.claude (CLAUDE_CONFIG_DIR) → live sessions there keep their state."""
+    sessions_dir = tmp_path / "config" / "projects" / test_project["slug"]
+    sessions_dir.mkdir(parents=True)
+    transcript = sessions_dir / "live-session.jsonl"
+    _write_jsonl(transcript, [_user("hello", "live-session", "2026-01-01T00:00:00Z")])
+    live, gone = _seen_shard(test_project, "live-session"), _seen_shard(test_project, "gone-session")
+    live.parent.mkdir(parents=True)
+    live.write_text("f1\t2\n")
+    gone.write_text("f1\t2\n")
+    payload = json.dumps({"transcript_path": str(transcript), "cwd": str(test_project["path"])})
+    env = {"HOME": str(test_project["home"]), "CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT)}
+
+    exit_code, _, _ = run_hook(HOOK, stdin=payload, env_overrides=env, cwd=test_project["path"])
+
+    assert exit_code == 0
+    assert live.exists()
+    assert not gone.exists()
+
+
+# ============================================================================
+# Section 11: Streaming Context (rolling previous slot, pending next queue)
+# ============================================================================
+
+def test_consecutive_hits_share_following_assistant(test_project, run_hook):
+    """11a: Two corrections in a row → both get the same preceding and following assistant context."""
+    sid = "test-session-stream"
+    _write_jsonl(test_project["sessions_dir"] / f"{sid}.jsonl", [
+        _asst("Using MySQL.", sid, "2026-02-22T10:00:00Z"),
+        _user("Wrong database.", sid, "2026-02-22T10:01:00Z"),
+        {"type": "progress", "sessionId": sid, "timestamp": "2026-02-22T10:01:30Z"},
+        _user("Still broken too.", sid, "2026-02-22T10:02:00Z"),
+        _asst("Switched to PostgreSQL.", sid, "2026-02-22T10:03:00Z"),
+    ])
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+
+    assert exit_code == 0
+    content = _pending_file(test_project).read_text()
+    assert content.count("A: [Using MySQL.]") == 2
+    assert content.count("A: [Switched to PostgreSQL.]") == 2
+    assert "f1\t1" in _seen_shard(test_project, sid).read_text().splitlines()
+    assert "f1\t3" in _seen_shard(test_project, sid).read_text().splitlines()
+
+
+def test_hit_without_surrounding_assistant(test_project, run_hook):
+    """11b: Correction as the only message → USER line only, no A: context."""
+    sid = "test-session-alone"
+    _write_jsonl(test_project["sessions_dir"] / f"{sid}.jsonl", [
+        _user("Wrong file.", sid, "2026-02-22T10:00:00Z"),
+    ])
+
+    exit_code, _, _ = _run_slr(run_hook, test_project)
+
+    assert exit_code == 0
+    content = _pending_file(test_project).read_text()
+    assert "USER: Wrong file." in content
+    assert "A: [" not in content
+
+
+# ============================================================================
+# Section 12: Stop Hook Payload (transcript_path instead of sessions-dir glob)
+# ============================================================================
+
+def test_payload_transcript_path_used_over_newest(test_project, run_hook, correction_transcript, clean_transcript):
+    """12a: Payload transcript_path names the session → that transcript is scanned, not the newest file."""
+    target = correction_transcript(test_project["sessions_dir"])
+    newer = clean_transcript(test_project["sessions_dir"])
+    os.utime(target, (1_000_000, 1_000_000))
+    assert newer.stat().st_mtime > target.stat().st_mtime
+
+    payload = {
+        "session_id": "test-session-abc123",
+        "transcript_path": str(target),
+        "cwd": str(test_project["path"]),
+        "hook_event_name": "Stop",
+    }
+    env = {"HOME": str(test_project["home"]), "CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT)}
+    exit_code, _, _ = run_hook(HOOK, stdin=json.dumps(payload), env_overrides=env, cwd=test_project["path"])
+
+    assert exit_code == 0
+    assert "Wrong, this project uses SQLite" in _pending_file(test_project).read_text()
+    assert _seen_shard(test_project, "test-session-abc123").exists()
+
+
+def test_payload_missing_transcript_falls_back_to_glob(test_project, run_hook, correction_transcript):
+    """12b: Payload transcript_path that does not exist → falls back to newest transcript in sessions dir."""
+    correction_transcript(test_project["sessions_dir"])
+    payload = {"session_id": "gone", "transcript_path": str(test_project["path"] / "gone.jsonl")}
+    env = {"HOME": str(test_project["home"]), "CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT)}
+
+    exit_code, _, _ = run_hook(HOOK, stdin=json.dumps(payload), env_overrides=env, cwd=test_project["path"])
+
+    assert exit_code == 0
+    assert "Wrong, this project uses SQLite" in _pending_file(test_project).read_text()
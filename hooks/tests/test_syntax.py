@@ -0,0 +1,125 @@
+"""Tests for _syntax.py — the in-process syntax tier of the validate stage."""
+
+import json
+import sys
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+from _syntax import check_python_syntax, check_syntax, python_parses, strip_jsonc  # noqa: E402
+
+
+def _error(tmp_path, name, content):
+    path = tmp_path / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    result = check_syntax(str(path))
+    return None if result is None else result["stderr"]
+
+
+def test_python_error_points_at_line_and_column(tmp_path):
+    path = tmp_path / "app.py"
+    path.write_text("x = 1\nif x == 1\n    pass\n")
+
+    first, text, caret = check_python_syntax(str(path), [3, 9])["stderr"].splitlines()
+    assert first.startswith(f"{path}:2:10: error: ")
+    assert text == "    if x == 1"
+    assert caret == "             ^"
+
+
+def test_python_verdict_needs_a_target_this_interpreter_knows(tmp_path):
+    path = tmp_path / "app.py"
+    path.write_text("x = 1\nif x == 1\n    pass\n")
+
+    assert _error(tmp_path, "app.py", path.read_text()) is None
+    assert check_python_syntax(str(path), None) is None
+    assert check_python_syntax(str(path), [sys.version_info[0], sys.version_info[1] + 1]) is None
+    assert check_python_syntax(str(path), list(sys.version_info[:2]))["returncode"] == 2
+
+
+@pytest.mark.parametrize("content, parses", [
+    ("x = 1\nif x == 1\n    pass\n", False),
+    ("return 1\n", False),  # past the parser
+    ('path = "C:\\d"\nok = path is "x"\n', True),  # warnings are the checker's business
+    ("\ufeffx = 1\n", True),
+])
+def test_python_parses(tmp_path, content, parses):
+    path = tmp_path / "app.py"
+    path.write_text(content)
+
+    assert python_parses(str(path)) is parses
+    assert python_parses(str(tmp_path / "missing.py")) is True
+
+
+@pytest.mark.parametrize(
+    "name", ["tsconfig.json", ".eslintrc.json", ".devcontainer/devcontainer.json", ".vscode/settings.json", "x.jsonc"]
+)
+def test_json_accepts_comments_and_trailing_commas(tmp_path, name):
+    content = '{\n  // target\n  "a": "http://x", /* inline */\n  "b": [1, 2,],\n}\n'
+
+    assert _error(tmp_path, name, content) is None
+
+
+def test_strict_json_rejects_comments(tmp_path):
+    stderr = _error(tmp_path, "package.json", '{\n  "name": "app",\n  // no comments here\n}\n')
+
+    assert ":3:3: error: Expecting property name enclosed in double quotes" in stderr
+
+
+def test_other_json_that_does_not_parse_only_warns(tmp_path):
+    """Tools outside the strict set may read JSON5 and the like → exit 1, not a blocking 2."""
+    path = tmp_path / ".eslintrc.json"
+    path.write_text("{\n  rules: {},\n}\n")
+    result = check_syntax(str(path))
+
+    assert result["returncode"] == 1
+    assert ":2:3: warning: Expecting property name enclosed in double quotes" in result["stderr"]
+
+
+@pytest.mark.parametrize("name", ["tsconfig.json", "package.json"])
+def test_json_may_start_with_a_bom(tmp_path, name):
+    (tmp_path / name).write_text('\ufeff{"compilerOptions": {}}\n', encoding="utf-8")
+
+    assert check_syntax(str(tmp_path / name)) is None
+
+
+def test_strip_jsonc_keeps_positions():
+    source = '{"a": 1, // c\n "b": "/*not a comment*/",\n}'
+    stripped = strip_jsonc(source)
+
+    assert len(stripped) == len(source)
+    assert json.loads(stripped) == {"a": 1, "b": "/*not a comment*/"}
+
+
+@pytest.mark.parametrize("content, location, message", [
+    ("package main\n\nfunc main() {\n\tif true {\n\t}\n", "3:13", "{ is never closed"),
+    ("package main\n\nfunc main() {\n\tx := f(1]\n}\n", "4:10", "unexpected ]"),
+    ('package main\n\nvar s = "open\n', "3:9", "string literal not terminated"),
+    ("package main\n\n/* open\n", "3:1", "comment not terminated"),
+])
+def test_go_tokenizer_errors(tmp_path, content, location, message):
+    assert f"main.go:{location}: error: {message}" in _error(tmp_path, "main.go", content)
+
+
+def test_go_brackets_in_strings_runes_and_comments_are_ignored(tmp_path):
+    content = (
+        "package main\n\n"
+        "// ) stray (\n"
+        "var a = \"}\\\"{\"\n"
+        "var b = '}'\n"
+        "var c = `\n{ raw\n`\n"
+        "/* [ */\n"
+        "func main() { _ = []int{1} }\n"
+    )
+
+    assert _error(tmp_path, "main.go", content) is None
+
+
+def test_unparsed_or_unreadable_files_pass(tmp_path):
+    assert _error(tmp_path, "app.ts", "const x = ;") is None
+    (tmp_path / "latin.json").write_bytes(b'"\xe9"\n')
+    assert check_syntax(str(tmp_path / "latin.json")) is None
+    assert check_syntax(str(tmp_path / "missing.json")) is None
@@ -0,0 +1,106 @@
+"""Tests for _telemetry.py timing records and the vorbit_hooks.py stats report."""
+
+import json
+import sys
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT, SCRIPTS
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+import _telemetry  # noqa: E402
+from _telemetry import HookTimer, timed  # noqa: E402
+
+
+def _records(home):
+    path = home / ".claude" / "vorbit-hooks" / "timings.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_hook_run_records_event_exit_and_phases(tmp_path, tmp_home, run_hook):
+    """post_edit past its pre-check → one record with root lookup and toolchain detection timed."""
+    project = tmp_path / "proj"
+    project.mkdir()
+    (project / "pyproject.toml").write_text("[tool.mypy]\n")
+    app = project / "app.py"
+    app.write_text("x: int = 1\n")
+    env = {
+        "HOME": str(tmp_home),
+        "CLAUDE_PROJECT_DIR": str(project),
+        "TOOL_INPUT": json.dumps({"file_path": str(app)}),
+        "DRY_RUN": "1",
+    }
+
+    exit_code, _, _ = run_hook(SCRIPTS["post_edit"], env_overrides=env, cwd=project)
+
+    assert exit_code == 0
+    [record] = _records(tmp_home)
+    assert record["hook"] == "post_edit"
+    assert record["event"] == "PostToolUse"
+    assert record["project"] == str(project)
+    assert record["exit"] == 0
+    assert {"root", "detect"} <= set(record["phases"])
+    assert record["ms"] >= sum(record["phases"].values())
+
+
+def test_fast_path_exit_is_not_recorded(tmp_home, run_hook):
+    env = {"HOME": str(tmp_home), "TOOL_INPUT": json.dumps({"command": "ls -la"})}
+
+    run_hook(SCRIPTS["pre_push_warning"], env_overrides=env)
+
+    assert _records(tmp_home) == []
+
+
+def test_timer_records_exit_code_and_reraises(tmp_home, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_home))
+    read_state = timed("io")(lambda: None)
+
+    with pytest.raises(SystemExit):
+        with HookTimer("loop_controller"):
+            read_state()
+            sys.exit(2)
+
+    [record] = _records(tmp_home)
+    assert record["event"] == "Stop"
+    assert record["exit"] == 2
+    assert set(record["phases"]) == {"io"}
+
+
+def test_log_rotates_past_max_bytes(tmp_home, monkeypatch):
+    """Over MAX_BYTES → current log moves to .1, so at most two files are kept."""
+    monkeypatch.setenv("HOME", str(tmp_home))
+    monkeypatch.setattr(_telemetry, "MAX_BYTES", 1)
+
+    for _ in range(3):
+        with HookTimer("post_edit"):
+            pass
+
+    log_dir = tmp_home / ".claude" / "vorbit-hooks"
+    assert sorted(p.name for p in log_dir.iterdir()) == ["timings.jsonl", "timings.jsonl.1"]
+    assert len(_records(tmp_home)) == 1
+
+
+def test_stats_prints_percentiles_per_hook_and_phase(tmp_home, run_hook):
+    """Runs of 1..100 ms → nearest-rank p50/p95/p99 of 50/95/99; phases only count runs that used them."""
+    log = tmp_home / ".claude" / "vorbit-hooks" / "timings.jsonl"
+    log.parent.mkdir(parents=True)
+    records = [
+        {"hook": "post_edit", "project": "/p", "exit": 0, "ms": float(ms), "phases": {"subprocess": ms / 2}}
+        for ms in range(1, 101)
+    ]
+    records.append({"hook": "loop_controller", "project": "/q", "exit": 0, "ms": 3.0, "phases": {}})
+    log.write_text("".join(json.dumps(r) + "\n" for r in records) + '{"hook": "post_e')
+
+    exit_code, stdout, _ = run_hook(SCRIPTS["vorbit_hooks"], env_overrides={"HOME": str(tmp_home)}, args=("stats",))
+
+    assert exit_code == 0
+    rows = {line.split()[0]: line.split()[1:] for line in stdout.splitlines()[1:]}
+    assert rows["post_edit"] == ["100", "50.0", "95.0", "99.0"]
+    assert rows["subprocess"] == ["100", "25.0", "47.5", "49.5"]
+    assert rows["loop_controller"] == ["1", "3.0", "3.0", "3.0"]
+
+    _, stdout, _ = run_hook(
+        SCRIPTS["vorbit_hooks"], env_overrides={"HOME": str(tmp_home)}, args=("stats", "--project", "/q")
+    )
+    assert "post_edit" not in stdout
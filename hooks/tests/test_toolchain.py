@@ -0,0 +1,154 @@
+"""Tests for _toolchain.py — persisted per-project formatter/checker/binary detection."""
+
+import json
+import os
+import sys
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+import _toolchain  # noqa: E402
+from _toolchain import formatter_command, toolchain_profile  # noqa: E402
+from _utils import project_state_path  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("isolated_home")
+
+
+@pytest.fixture
+def profile_of(monkeypatch):
+    """toolchain_profile as a fresh hook process sees it (no in-process memo)."""
+    def _profile(root):
+        monkeypatch.setattr(_toolchain, "_PROFILES", {})
+        return toolchain_profile(str(root))
+    return _profile
+
+
+def _persisted(root):
+    return project_state_path("toolchain", str(root), ".json")
+
+
+def test_detects_formatter_and_checkers(tmp_path, profile_of):
+    (tmp_path / "biome.json").write_text("{}")
+    (tmp_path / ".prettierrc").write_text("{}")
+    (tmp_path / "tsconfig.json").write_text("{}")
+    (tmp_path / "pyproject.toml").write_text("[tool.pyright]\n")
+
+    profile = profile_of(tmp_path)
+
+    assert profile["formatter"] == "biome"
+    assert (profile["typescript"], profile["mypy"], profile["pyright"], profile["go"]) == (True, False, True, False)
+    assert profile["configs"] == ["biome.json", "pyproject.toml", "tsconfig.json", ".prettierrc"]
+
+
+@pytest.mark.parametrize("files, target", [
+    ({"pyproject.toml": '[project]\nrequires-python = ">=3.10"\n'}, [3, 10]),
+    ({"pyproject.toml": '[project]\nrequires-python = ">=3.9"\n\n[tool.mypy]\npython_version = "3.12"\n'}, [3, 12]),
+    ({"mypy.ini": "[mypy]\npython_version = 3.11\n"}, [3, 11]),
+    ({"pyproject.toml": '[project]\nrequires-python = "<4"\n'}, None),
+])
+def test_detects_python_target(tmp_path, profile_of, files, target):
+    for name, content in files.items():
+        (tmp_path / name).write_text(content)
+
+    assert profile_of(tmp_path)["python_target"] == target
+
+
+def test_unchanged_project_reuses_persisted_profile(tmp_path, profile_of):
+    """Nothing watched moved → the stored profile is returned as-is, without re-detection."""
+    (tmp_path / "package.json").write_text('{"prettier": {}}')
+    assert profile_of(tmp_path)["formatter"] == "prettier"
+
+    with open(_persisted(tmp_path)) as f:
+        stored = json.load(f)
+    stored["formatter"] = "stored-profile"
+    with open(_persisted(tmp_path), "w") as f:
+        json.dump(stored, f)
+
+    assert profile_of(tmp_path)["formatter"] == "stored-profile"
+
+
+def test_config_edit_and_new_config_file_trigger_redetection(tmp_path, profile_of):
+    (tmp_path / "pyproject.toml").write_text("[project]\n")
+    assert profile_of(tmp_path)["mypy"] is False
+
+    (tmp_path / "pyproject.toml").write_text("[project]\n\n[tool.mypy]\n")
+    assert profile_of(tmp_path)["mypy"] is True
+
+    (tmp_path / "go.mod").write_text("module example.com/m\n")
+    assert profile_of(tmp_path)["go"] is True
+
+
+def test_project_node_modules_bin_wins_over_path(tmp_path, profile_of, monkeypatch):
+    (tmp_path / "biome.json").write_text("{}")
+    path_dir = tmp_path / "path-bin"
+    local_dir = tmp_path / "node_modules" / ".bin"
+    for directory in (path_dir, local_dir):
+        directory.mkdir(parents=True)
+        biome = directory / "biome"
+        biome.write_text("#!/bin/sh\n")
+        biome.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{path_dir}{os.pathsep}{os.environ['PATH']}")
+
+    profile = profile_of(tmp_path)
+    assert formatter_command(profile, ["a.ts"]) == [str(local_dir / "biome"), "format", "--write", "a.ts"]
+
+    (local_dir / "biome").unlink()
+    profile = profile_of(tmp_path)
+    assert formatter_command(profile, ["a.ts"]) == [str(path_dir / "biome"), "format", "--write", "a.ts"]
+
+
+def test_missing_binary_runs_by_bare_name(tmp_path, profile_of, monkeypatch):
+    (tmp_path / "biome.json").write_text("{}")
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+
+    assert formatter_command(profile_of(tmp_path), ["a.ts"]) == ["biome", "format", "--write", "a.ts"]
+
+
+@pytest.fixture
+def monorepo(tmp_path, monkeypatch):
+    """Root with biome; packages/web (tsconfig), packages/api (mypy), packages/docs (package.json only)."""
+    monkeypatch.setattr(_toolchain, "_PROFILES", {})
+    monkeypatch.setattr(_toolchain, "_PACKAGE_ROOTS", {})
+    (tmp_path / "biome.json").write_text("{}")
+    (tmp_path / "package.json").write_text("{}")
+    for package, config, content in (
+        ("web", "tsconfig.json", "{}"),
+        ("api", "pyproject.toml", "[tool.mypy]\n"),
+        ("docs", "package.json", "{}"),
+    ):
+        (tmp_path / "packages" / package / "src").mkdir(parents=True)
+        (tmp_path / "packages" / package / config).write_text(content)
+    return tmp_path
+
+
+@pytest.mark.parametrize("edited, tool, expected", [
+    ("packages/web/src/app.ts", "typescript", "packages/web"),
+    ("packages/api/src/app.py", "python", "packages/api"),
+    ("packages/docs/src/app.ts", "format", "."),  # docs/package.json sets up no formatter: root's biome
+    ("packages/web/src/app.ts", "format", "."),
+])
+def test_package_profile_finds_nearest_package_configuring_tool(monorepo, edited, tool, expected):
+    root, profile = _toolchain.package_profile(str(monorepo), str(monorepo / edited), tool)
+
+    assert os.path.normpath(root) == os.path.normpath(monorepo / expected)
+    assert _toolchain.configures(profile, tool)
+
+
+def test_package_profile_is_none_when_no_package_configures_tool(monorepo):
+    assert _toolchain.package_profile(str(monorepo), str(monorepo / "packages/web/src/main.go"), "go") is None
+
+
+def test_hoisted_workspace_binary_is_found_above_package(monorepo, monkeypatch):
+    monkeypatch.setenv("PATH", str(monorepo / "empty"))
+    hoisted = monorepo / "node_modules" / ".bin" / "tsc"
+    hoisted.parent.mkdir(parents=True)
+    hoisted.write_text("#!/bin/sh\n")
+    hoisted.chmod(0o755)
+
+    _, profile = _toolchain.package_profile(str(monorepo), str(monorepo / "packages/web/src/app.ts"), "typescript")
+
+    assert _toolchain.binary(profile, "tsc") == str(hoisted)
@@ -0,0 +1,96 @@
+"""Tests for _utils.py — project-root resolution shared by every hook."""
+
+import subprocess
+import sys
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+import _utils  # noqa: E402
+from _utils import find_git_root, find_project_root, resolve_project_root  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    """Each test starts with an empty root cache and no CLAUDE_PROJECT_DIR."""
+    monkeypatch.setattr(_utils, "_GIT_ROOT_CACHE", {})
+    monkeypatch.delenv("CLAUDE_PROJECT_DIR", raising=False)
+
+
+def _rev_parse(cwd):
+    return subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True, cwd=cwd
+    ).stdout.strip()
+
+
+def test_matches_git_rev_parse_from_subdirectory(test_project):
+    """Nested directory in a repo → same root git reports."""
+    nested = test_project["path"] / "src" / "pkg"
+    nested.mkdir(parents=True)
+
+    assert find_git_root(str(nested)) == _rev_parse(nested)
+
+
+def test_worktree_gitfile_is_its_own_root(test_project):
+    """Linked worktree (.git is a gitfile) → the worktree directory, like git."""
+    repo = test_project["path"]
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run([*git, "commit", "--allow-empty", "-qm", "init"], cwd=repo, check=True)
+    worktree = repo.parent / "wt"
+    subprocess.run(["git", "worktree", "add", "-q", str(worktree)], cwd=repo, check=True)
+    (worktree / "docs").mkdir()
+
+    assert (worktree / ".git").is_file()
+    assert find_git_root(str(worktree / "docs")) == _rev_parse(worktree / "docs")
+
+
+def test_stray_git_file_is_not_a_marker(tmp_path):
+    """A .git file that is not a gitfile → keep walking up."""
+    (tmp_path / ".git").mkdir()
+    child = tmp_path / "child"
+    child.mkdir()
+    (child / ".git").write_text("not a gitdir pointer")
+
+    assert find_git_root(str(child)) == str(tmp_path.resolve())
+
+
+def test_outside_any_repo_falls_back_to_directory(tmp_path):
+    """No .git up the tree → resolve_project_root returns the directory itself."""
+    if find_git_root(str(tmp_path)) is not None:
+        pytest.skip("tmp dir lives inside a git repo")
+    assert resolve_project_root(str(tmp_path)) == str(tmp_path)
+
+
+def test_claude_project_dir_wins_inside_it(test_project, monkeypatch):
+    """CLAUDE_PROJECT_DIR set and directory under it → env value, even past a nested repo."""
+    nested_repo = test_project["path"] / "vendor" / "lib"
+    (nested_repo / ".git").mkdir(parents=True)
+    monkeypatch.setenv("CLAUDE_PROJECT_DIR", str(test_project["path"]))
+
+    assert resolve_project_root(str(nested_repo)) == str(test_project["path"])
+
+
+def test_claude_project_dir_ignored_outside_it(test_project, tmp_path, monkeypatch):
+    """Edited file outside CLAUDE_PROJECT_DIR → that file's own git root."""
+    other = tmp_path / "other"
+    (other / ".git").mkdir(parents=True)
+    monkeypatch.setenv("CLAUDE_PROJECT_DIR", str(test_project["path"]))
+    edited = other / "main.py"
+    edited.write_text("")
+
+    assert find_project_root(str(edited)) == str(other.resolve())
+
+
+def test_lookups_are_memoized_per_directory(test_project):
+    """Second lookup from any visited directory is served from the cache."""
+    nested = test_project["path"] / "a" / "b"
+    nested.mkdir(parents=True)
+    root = find_git_root(str(nested))
+
+    (test_project["path"] / ".git").rename(test_project["path"] / ".git-moved")
+
+    assert find_git_root(str(nested)) == root
+    assert find_git_root(str(test_project["path"] / "a")) == root
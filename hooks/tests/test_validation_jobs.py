@@ -0,0 +1,207 @@
+"""Tests for background validation (VORBIT_VALIDATE_ASYNC=1): _validation_jobs.py and report_validation.py."""
+
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from hooks.tests.conftest import PLUGIN_ROOT, SCRIPTS
+
+sys.path.insert(0, str(PLUGIN_ROOT / "hooks" / "scripts"))
+
+from _validation_jobs import job_name  # noqa: E402
+
+pytestmark = pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy not installed")
+
+BAD = "p: str = 8080\n"
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "pyproject.toml").write_text("[tool.mypy]\n")
+    return root
+
+
+def _edit(run_hook, home, file_path, **extra):
+    env = {
+        "HOME": str(home),
+        "VORBIT_VALIDATE_ASYNC": "1",
+        "TOOL_INPUT": json.dumps({"file_path": str(file_path)}),
+        **extra,
+    }
+    return run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=file_path.parent)
+
+
+def _stop(run_hook, home, project):
+    return run_hook(
+        SCRIPTS["report_validation"], stdin=json.dumps({"cwd": str(project)}), env_overrides={"HOME": str(home)}
+    )
+
+
+def _wait_for(predicate, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def _mailbox(home):
+    mailbox = home / ".claude" / "vorbit-validate" / "mailbox"
+    return sorted(mailbox.glob("*.json")) if mailbox.is_dir() else []
+
+
+def _jobs(home):
+    jobs = home / ".claude" / "vorbit-validate" / "jobs"
+    return sorted(jobs.glob("*.json")) if jobs.is_dir() else []
+
+
+def _locks(home):
+    return sorted((home / ".claude" / "vorbit-validate" / "jobs").glob("*.lock"))
+
+
+def test_edit_returns_before_checker_and_stop_reports_failure_once(project, tmp_home, run_hook):
+    app = project / "app.py"
+    app.write_text(BAD)
+
+    exit_code, stdout, stderr = _edit(run_hook, tmp_home, app)
+
+    assert (exit_code, stdout, stderr) == (0, "", "")
+    assert _wait_for(lambda: _mailbox(tmp_home) and not _jobs(tmp_home))
+    assert _locks(tmp_home) == []
+    exit_code, _, stderr = _stop(run_hook, tmp_home, project)
+    assert exit_code == 2
+    assert f"Background validation of {app} failed:" in stderr
+    assert "app.py:1: error: Incompatible types in assignment" in stderr
+    assert _stop(run_hook, tmp_home, project)[0] == 0
+
+
+def test_next_edit_reports_finished_failure(project, tmp_home, run_hook):
+    """A failure finished in the background surfaces on the next edit, even to another file."""
+    app = project / "app.py"
+    app.write_text(BAD)
+    _edit(run_hook, tmp_home, app)
+    assert _wait_for(lambda: _mailbox(tmp_home))
+
+    lib = project / "lib.py"
+    lib.write_text("x: int = 1\n")
+    exit_code, _, stderr = _edit(run_hook, tmp_home, lib)
+
+    assert exit_code == 2
+    assert "app.py:1: error" in stderr
+    assert _wait_for(lambda: not _jobs(tmp_home))
+    assert _stop(run_hook, tmp_home, project)[0] == 0  # lib.py passed, app.py already reported
+
+
+def test_stop_reports_failure_in_a_nested_repo(tmp_path, tmp_home, run_hook):
+    """Edit in a nested repo from the session's root → its failure is reported at that root's Stop."""
+    outer = tmp_path / "outer"
+    nested = outer / "vendor" / "lib"
+    nested.mkdir(parents=True)
+    (outer / ".git").mkdir()
+    (nested / ".git").mkdir()
+    (nested / "pyproject.toml").write_text("[tool.mypy]\n")
+    app = nested / "app.py"
+    app.write_text(BAD)
+    env = {"HOME": str(tmp_home), "VORBIT_VALIDATE_ASYNC": "1", "TOOL_INPUT": json.dumps({"file_path": str(app)})}
+
+    run_hook(SCRIPTS["post_edit_validate"], env_overrides=env, cwd=outer)
+    assert _wait_for(lambda: _mailbox(tmp_home) and not _jobs(tmp_home))
+    exit_code, _, stderr = _stop(run_hook, tmp_home, outer)
+
+    assert exit_code == 2
+    assert f"Background validation of {app} failed:" in stderr
+
+
+def test_failure_for_content_edited_since_is_dropped(project, tmp_home, run_hook):
+    app = project / "app.py"
+    app.write_text(BAD)
+    _edit(run_hook, tmp_home, app)
+    assert _wait_for(lambda: _mailbox(tmp_home))
+
+    app.write_text("p: int = 8080\n")
+
+    assert _stop(run_hook, tmp_home, project) == (0, "", "")
+    assert _mailbox(tmp_home) == []
+
+
+def test_cached_verdict_is_returned_synchronously(project, tmp_home, run_hook):
+    """Content already validated (here by the background job) → its verdict blocks the edit directly."""
+    app = project / "app.py"
+    app.write_text(BAD)
+    _edit(run_hook, tmp_home, app)
+    assert _wait_for(lambda: not _jobs(tmp_home))
+    _stop(run_hook, tmp_home, project)
+
+    exit_code, stdout, _ = _edit(run_hook, tmp_home, app)
+
+    assert exit_code == 1
+    assert "app.py:1: error" in stdout
+
+
+@pytest.mark.skipif(not Path("/proc/self/cmdline").exists(), reason="needs /proc")
+def test_newer_edit_cancels_running_job(project, tmp_home, run_hook):
+    """Second edit while mypy hangs → the first job and its mypy are killed; only the new run is left."""
+    (project / "pyproject.toml").write_text('[tool.mypy]\nplugins = ["slow_plugin.py"]\n')
+    (project / "slow_plugin.py").write_text("import time\ntime.sleep(60)\n")
+    app = project / "app.py"
+
+    def checker_pids():
+        pids = []
+        for entry in Path("/proc").iterdir():
+            try:
+                argv = (entry / "cmdline").read_bytes().split(b"\0")
+            except OSError:
+                continue
+            if str(app).encode() in argv and not any(b"_validation_jobs" in arg for arg in argv):
+                pids.append(int(entry.name))
+        return pids
+
+    app.write_text(BAD)
+    _edit(run_hook, tmp_home, app)
+    [job_file] = _jobs(tmp_home)
+    first_job = json.loads(job_file.read_text())["pid"]
+    assert _wait_for(lambda: len(checker_pids()) == 1, timeout=10)
+    [first_checker] = checker_pids()
+
+    app.write_text("p: int = 8080\n")
+    _edit(run_hook, tmp_home, app)
+
+    try:
+        assert _wait_for(lambda: not Path(f"/proc/{first_job}").exists(), timeout=10)
+        assert _wait_for(lambda: first_checker not in checker_pids(), timeout=10)
+        assert _wait_for(lambda: len(checker_pids()) == 1, timeout=10)
+        assert _mailbox(tmp_home) == []
+    finally:
+        os.kill(json.loads(job_file.read_text())["pid"], signal.SIGTERM)
+
+
+def test_finished_job_pid_is_never_signalled(project, tmp_home, run_hook):
+    """The recorded job has exited and its pid is reused → the new edit leaves that process alone."""
+    app = project / "app.py"
+    app.write_text("p: int = 8080\n")
+    _edit(run_hook, tmp_home, app)
+    assert _wait_for(lambda: not _jobs(tmp_home))
+    reused = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    jobs = tmp_home / ".claude" / "vorbit-validate" / "jobs"
+    job_file = jobs / f"{job_name(str(project), str(app))}.json"
+    job_file.write_text(json.dumps({"token": "finished", "pid": reused.pid}))
+
+    try:
+        app.write_text("p: int = 8081\n")
+        _edit(run_hook, tmp_home, app)
+        assert _wait_for(lambda: not _jobs(tmp_home))
+
+        assert reused.poll() is None
+    finally:
+        reused.kill()
+        reused.wait()
@@ -3,39 +3,75 @@
 
 Exit codes: 0 = end session, 2 = inject stdout and continue loop.
 Reads loop state from .claude/.loop-state.json at project root.
+Claude's last output comes from the JSON stdin payload (last_assistant_message,
+else the tail of transcript_path); non-JSON stdin is treated as the output itself.
 """
 
 import json
 import os
-import subprocess
 import sys
-from pathlib import Path
 
+# Shared hook helpers live in <plugin root>/hooks/scripts (os.path, not pathlib: import cost)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "..", "hooks", "scripts"))
 
-def main():
+from _daemon_client import forward_to_daemon  # noqa: E402
+from _telemetry import HookTimer, timed  # noqa: E402
+from _utils import has_ancestor_path, parse_hook_payload, resolve_project_root  # noqa: E402
+
+LOOP_STATE = os.path.join(".claude", ".loop-state.json")
+
+# Bytes read from the end of the transcript to find the last assistant message
+TRANSCRIPT_TAIL_BYTES = 256 * 1024
+
+
+@timed("io")
+def read_last_assistant_text(transcript_path: str) -> str:
+    """Text of the last assistant message, read from the transcript tail only."""
     try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True, text=True
-        )
-        project_root = result.stdout.strip() if result.returncode == 0 else os.getcwd()
-    except Exception:
-        project_root = os.getcwd()
+        with open(transcript_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - TRANSCRIPT_TAIL_BYTES))
+            lines = f.read().splitlines()
+    except OSError:
+        return ""
+    for line in reversed(lines):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(entry, dict) or entry.get("type") != "assistant":
+            continue
+        content = entry.get("message", {}).get("content", "")
+        if isinstance(content, list):
+            return "\n".join(b.get("text", "") for b in content if b.get("type") == "text")
+        return content if isinstance(content, str) else ""
+    return ""
 
-    state_file = Path(project_root) / ".claude" / ".loop-state.json"
+
+def main():
+    raw_stdin = sys.stdin.read()
+    payload = parse_hook_payload(raw_stdin)
+    session_cwd = payload.get("cwd") or os.getcwd()
+
+    # Fast path: the project root is cwd or one of its parents, so no loop
+    # state anywhere up the tree means no loop — skip root resolution entirely
+    if not has_ancestor_path(session_cwd, LOOP_STATE):
+        sys.exit(0)
+
+    from pathlib import Path
+
+    project_root = resolve_project_root(session_cwd)
+    state_file = Path(project_root) / LOOP_STATE
 
     if not state_file.exists():
-        sys.stdin.read()
         sys.exit(0)
 
     try:
         state = json.loads(state_file.read_text())
     except Exception:
-        sys.stdin.read()
         sys.exit(0)
 
     if not state.get("active"):
-        sys.stdin.read()
         sys.exit(0)
 
     completion_signal = state.get("completionSignal", "")
@@ -43,8 +79,13 @@ def main():
     current_iteration = state.get("iteration", 1)
     command = state.get("command", "")
 
-    # Read Claude's last output (only after confirming loop is active)
-    claude_output = sys.stdin.read()
+    # Claude's last output (only resolved after confirming loop is active)
+    if payload:
+        claude_output = payload.get("last_assistant_message") or ""
+        if not claude_output and payload.get("transcript_path"):
+            claude_output = read_last_assistant_text(payload["transcript_path"])
+    else:
+        claude_output = raw_stdin
 
     # Check for completion signal
     if completion_signal and completion_signal in claude_output:
@@ -65,7 +106,9 @@ def main():
 
 
 if __name__ == "__main__":
-    try:
-        main()
-    except Exception:
-        sys.exit(0)
+    forward_to_daemon("loop_controller")
+    with HookTimer("loop_controller"):
+        try:
+            main()
+        except Exception:
+            sys.exit(0)
@@ -0,0 +1,275 @@
+"""Shared transcript helpers for the learn hooks (stop_learn_reflect, mark_voluntary_seen)."""
+
+import functools
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+# Flow id → rules comment holding its comma-separated keyword list
+KEYWORD_FLOWS = (("f1", "correction-keywords"), ("fv", "voluntary-keywords"))
+
+
+def extract_text(content: Any) -> str:
+    """Extract plain text from message content (string or array of blocks)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            block.get("text", "") for block in content if block.get("type") == "text"
+        )
+    return ""
+
+
+def read_comment(rules_source_text: str, comment_name: str) -> str:
+    """Read value from <!-- name: value --> comment in file text."""
+    match = re.search(rf"<!--\s*{re.escape(comment_name)}:\s*(.*?)\s*-->", rules_source_text)
+    return match.group(1) if match else ""
+
+
+class KeywordMatcher:
+    """One compiled pattern with a named group per flow (f1, fv).
+
+    Case-insensitive, whole-word. A message is classified for every flow in
+    a single regex pass; only when a match was found and some flow is still
+    missing (its keyword may overlap another flow's match) is that flow's own
+    pattern checked.
+    """
+
+    def __init__(self, flows: dict[str, list[str]]):
+        self.flows = list(flows)
+        self.patterns = {
+            flow: re.compile(self._alternation(phrases), re.IGNORECASE)
+            for flow, phrases in flows.items()
+        }
+        self.combined = re.compile(
+            "|".join(f"(?P<{flow}>{self._alternation(phrases)})" for flow, phrases in flows.items()),
+            re.IGNORECASE,
+        )
+
+    @staticmethod
+    def _alternation(phrases: list[str]) -> str:
+        return r"\b(?:" + "|".join(re.escape(p) for p in phrases) + r")\b"
+
+    def classify(self, text: str) -> set[str]:
+        """Return the flows whose keywords appear in text."""
+        found: set[str] = set()
+        for match in self.combined.finditer(text):
+            found.add(match.lastgroup)
+            if len(found) == len(self.flows):
+                return found
+        if found:
+            for flow in self.flows:
+                if flow not in found and self.patterns[flow].search(text):
+                    found.add(flow)
+        return found
+
+
+@functools.lru_cache(maxsize=4)
+def build_keyword_matcher(rules_text: str) -> Optional[KeywordMatcher]:
+    """Build the shared matcher from the rules file keyword comments. None if no keywords.
+
+    Cached per rules text, so a long-lived process (hook daemon) compiles it once.
+    """
+    flows: dict[str, list[str]] = {}
+    for flow, comment_name in KEYWORD_FLOWS:
+        csv = read_comment(rules_text, comment_name)
+        phrases = [p.strip() for p in csv.split(",") if p.strip()]
+        if phrases:
+            flows[flow] = phrases
+    return KeywordMatcher(flows) if flows else None
+
+
+def keyword_candidate(msg: dict[str, Any]) -> str:
+    """Text of a user message eligible for keyword matching, or "" if filtered.
+
+    Skips non-user entries, empty messages, messages over 500 chars
+    (session-continuation summaries) and <teammate-message> audit output.
+    """
+    if msg.get("type") != "user":
+        return ""
+    text = extract_text(msg.get("message", {}).get("content", ""))
+    if len(text) > 500 or "<teammate-message" in text:
+        return ""
+    return text
+
+
+def find_keyword_hits(
+    messages: Iterable[dict[str, Any]], matcher: KeywordMatcher, start_index: int = 0
+) -> dict[str, list[int]]:
+    """Classify user messages for every flow in one pass → {flow: [msg_index, ...]}."""
+    hits: dict[str, list[int]] = {flow: [] for flow in matcher.flows}
+    for idx, msg in enumerate(messages, start_index):
+        text = keyword_candidate(msg)
+        if not text:
+            continue
+        for flow in matcher.classify(text):
+            hits[flow].append(idx)
+    return hits
+
+
+class JsonlReader:
+    """Stream decoded JSONL entries from a binary file, one line in memory at a time.
+
+    Invalid or blank lines are skipped. A final line without newline is left
+    unread, even if it parses: the transcript may be mid-write, and it is
+    read once its newline lands. offset is the absolute byte position
+    consumed so far.
+    """
+
+    def __init__(self, f: BinaryIO, offset: int = 0):
+        self.f = f
+        self.offset = offset
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        self.f.seek(self.offset)
+        for line in self.f:
+            if not line.endswith(b"\n"):
+                return
+            self.offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                yield entry
+
+
+# ---------------------------------------------------------------------------
+# Seen store: one shard per session, SEEN_DIR/<session_id>.tsv of flow TAB msg_index
+# ---------------------------------------------------------------------------
+
+def seen_shard(seen_dir: Path, session_id: str) -> Path:
+    """Path of the seen shard for a session."""
+    return Path(seen_dir) / f"{session_id}.tsv"
+
+
+def migrate_seen_file(legacy_file: Path, seen_dir: Path) -> None:
+    """Split the legacy session_id TAB flow TAB msg_index file into per-session shards.
+
+    The legacy file is renamed first so concurrent hooks never migrate it
+    twice; a leftover .migrating file (interrupted run) is picked up again.
+    Re-appending an entry is harmless — shards are read into sets.
+    """
+    legacy = Path(legacy_file)
+    migrating = legacy.with_name(legacy.name + ".migrating")
+    try:
+        os.rename(legacy, migrating)
+    except OSError:
+        if not migrating.exists():
+            return
+
+    by_session: dict[str, list[str]] = {}
+    with open(migrating) as f:
+        for line in f:
+            parts = line.strip().split("\t")
+            if len(parts) == 3:
+                by_session.setdefault(parts[0], []).append(f"{parts[1]}\t{parts[2]}\n")
+
+    Path(seen_dir).mkdir(parents=True, exist_ok=True)
+    for session_id, entries in by_session.items():
+        with open(seen_shard(seen_dir, session_id), "a") as f:
+            f.writelines(entries)
+    migrating.unlink()
+
+
+def load_seen(seen_dir: Path, session_id: str) -> dict[str, set[int]]:
+    """Return {flow: message indices already captured} for a session, in one read."""
+    seen: dict[str, set[int]] = {}
+    try:
+        with open(seen_shard(seen_dir, session_id)) as f:
+            for line in f:
+                parts = line.strip().split("\t")
+                if len(parts) == 2:
+                    try:
+                        seen.setdefault(parts[0], set()).add(int(parts[1]))
+                    except ValueError:
+                        pass
+    except FileNotFoundError:
+        pass
+    return seen
+
+
+def mark_seen(seen_dir: Path, session_id: str, flow: str, indices: list[int]) -> None:
+    """Append new seen entries to the session's shard."""
+    Path(seen_dir).mkdir(parents=True, exist_ok=True)
+    with open(seen_shard(seen_dir, session_id), "a") as f:
+        for idx in indices:
+            f.write(f"{flow}\t{idx}\n")
+
+
+def _live_session_ids(projects_dir: Path) -> Optional[set[str]]:
+    """Session ids with a transcript under projects_dir/<slug>/. None if projects_dir cannot be listed.
+
+    Runs to completion: a time-boxed scan would restart from scratch on
+    every Stop and never finish on a large projects dir. A project dir that
+    cannot be read is skipped, not taken as proof its sessions are gone.
+    """
+    try:
+        projects = list(os.scandir(projects_dir))
+    except OSError:
+        return None
+    live: set[str] = set()
+    for project in projects:
+        try:
+            if project.is_dir():
+                live.update(e.name[:-6] for e in os.scandir(project.path) if e.name.endswith(".jsonl"))
+        except OSError:
+            continue
+    return live
+
+
+def projects_dir_of(transcript_path: Optional[str]) -> Path:
+    """Directory holding <project slug>/<session_id>.jsonl transcripts.
+
+    Taken from a transcript's path when there is one, so a relocated config
+    dir (CLAUDE_CONFIG_DIR) is honoured; else $CLAUDE_CONFIG_DIR/projects,
+    defaulting to ~/.claude/projects.
+    """
+    if transcript_path:
+        return Path(transcript_path).parent.parent
+    return Path(os.environ.get("CLAUDE_CONFIG_DIR") or Path.home() / ".claude") / "projects"
+
+
+def compact_session_state(
+    state_dirs: list[Path], projects_dir: Path, deadline: Optional[float] = None
+) -> Optional[int]:
+    """Delete per-session state of sessions whose transcript is gone.
+
+    state_dirs hold <session_id>.<ext> files (seen shards, scan checkpoints).
+    A session's transcript existing under projects_dir is the only retention
+    rule: its state is kept however old, since a resumed session would
+    otherwise rescan its transcript from byte 0 and capture old hits again.
+    The store therefore shrinks as transcripts are cleaned up, and nothing
+    is removed while projects_dir cannot be listed. Each drop is a single
+    unlink, so the store is never left half-written.
+
+    deadline is a time.monotonic() value bounding the deletion pass. Returns
+    the number of files removed, or None if the deadline passed first (the
+    next run continues where this one stopped).
+    """
+    live = _live_session_ids(projects_dir)
+    if live is None:
+        return 0
+    removed = 0
+    for state_dir in state_dirs:
+        try:
+            entries = list(os.scandir(state_dir))
+        except OSError:
+            continue
+        for entry in entries:
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+            if os.path.splitext(entry.name)[0] in live:
+                continue
+            try:
+                os.unlink(entry.path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
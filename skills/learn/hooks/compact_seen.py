@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Compact the learn hooks' per-session state on demand.
+
+Drops seen shards and scan checkpoints under ~/.claude/rules/ for sessions
+whose transcript is gone; a session with a transcript keeps its state.
+Transcripts are looked up under $CLAUDE_CONFIG_DIR/projects (default
+~/.claude/projects). The Stop hook runs the same pass opportunistically
+(time-boxed, at most daily); this runs it to completion.
+
+Usage: python3 compact_seen.py
+Exit codes: 0 always.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from _learn_utils import compact_session_state, migrate_seen_file, projects_dir_of
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+
+    rules_dir = Path.home() / ".claude" / "rules"
+    seen_dir = rules_dir / ".seen-correction-sessions.d"
+    checkpoint_dir = rules_dir / ".transcript-checkpoints"
+
+    migrate_seen_file(rules_dir / ".seen-correction-sessions", seen_dir)
+    removed = compact_session_state([seen_dir, checkpoint_dir], projects_dir_of(None))
+    if rules_dir.is_dir():
+        (rules_dir / ".last-session-compaction").touch()
+    print(f"Removed {removed} session state file(s)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception:
+        sys.exit(0)
@@ -8,23 +8,22 @@ at session end for capture that was already handled during the session.
 Exit codes: 0 always (non-blocking helper).
 """
 
-import json
 import os
-import re
-import subprocess
 import sys
 from pathlib import Path
-from typing import Any
 
+# Shared hook helpers live in <plugin root>/hooks/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "hooks" / "scripts"))
 
-def extract_text(content: Any) -> str:
-    if isinstance(content, str):
-        return content
-    if isinstance(content, list):
-        return "\n".join(
-            block.get("text", "") for block in content if block.get("type") == "text"
-        )
-    return ""
+from _learn_utils import (  # noqa: E402
+    JsonlReader,
+    build_keyword_matcher,
+    find_keyword_hits,
+    load_seen,
+    mark_seen,
+    migrate_seen_file,
+)
+from _utils import resolve_project_root  # noqa: E402
 
 
 def main():
@@ -42,27 +41,12 @@ def main():
     except Exception:
         sys.exit(0)
 
-    # Read voluntary keywords from HTML comment
-    match = re.search(r"<!--\s*voluntary-keywords:\s*(.*?)\s*-->", rules_text)
-    if not match:
-        sys.exit(0)
-
-    assert match is not None  # narrowing for type checker; guarded by sys.exit above
-    phrases = [p.strip() for p in match.group(1).split(",") if p.strip()]
-    if not phrases:
+    # Same matcher the stop hook uses; only the voluntary (fv) flow matters here
+    matcher = build_keyword_matcher(rules_text)
+    if matcher is None or "fv" not in matcher.flows:
         sys.exit(0)
 
-    voluntary_pattern = r"\b(" + "|".join(re.escape(p) for p in phrases) + r")\b"
-
-    # Get project root
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True, text=True,
-        )
-        project_root = result.stdout.strip() if result.returncode == 0 else os.getcwd()
-    except Exception:
-        project_root = os.getcwd()
+    project_root = resolve_project_root(os.getcwd())
 
     # Find the current session transcript
     project_slug = project_root.replace("/", "-")
@@ -82,60 +66,30 @@ def main():
 
     transcript_path = transcripts[0]
     session_id = transcript_path.stem
-    seen_file = Path.home() / ".claude" / "rules" / ".seen-correction-sessions"
+    rules_dir = Path.home() / ".claude" / "rules"
+    seen_dir = rules_dir / ".seen-correction-sessions.d"
 
-    # Load transcript
-    messages = []
+    # Stream the transcript and find all voluntary-keyword user messages
     try:
-        with open(transcript_path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    messages.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
+        with open(transcript_path, "rb") as f:
+            matching_indices = find_keyword_hits(JsonlReader(f), matcher)["fv"]
     except Exception:
         sys.exit(0)
 
-    # Find all voluntary-keyword user messages
-    matching_indices = []
-    for idx, msg in enumerate(messages):
-        if msg.get("type") != "user":
-            continue
-        text = extract_text(msg.get("message", {}).get("content", ""))
-        if not text or len(text) > 500:
-            continue
-        if "<teammate-message" in text:
-            continue
-        if re.search(voluntary_pattern, text, re.IGNORECASE):
-            matching_indices.append(idx)
-
     if not matching_indices:
         sys.exit(0)
 
     # Load already-seen fv entries for this session
-    seen = set()
     try:
-        with open(seen_file) as f:
-            for line in f:
-                parts = line.strip().split("\t")
-                if len(parts) == 3 and parts[0] == session_id and parts[1] == "fv":
-                    try:
-                        seen.add(int(parts[2]))
-                    except ValueError:
-                        pass
-    except FileNotFoundError:
+        migrate_seen_file(rules_dir / ".seen-correction-sessions", seen_dir)
+    except Exception:
         pass
+    seen = load_seen(seen_dir, session_id).get("fv", set())
 
     # Mark unseen voluntary messages as seen
     new_indices = [i for i in matching_indices if i not in seen]
     if new_indices:
-        seen_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(seen_file, "a") as f:
-            for idx in new_indices:
-                f.write(f"{session_id}\tfv\t{idx}\n")
+        mark_seen(seen_dir, session_id, "fv", new_indices)
 
 
 if __name__ == "__main__":
@@ -3,111 +3,217 @@
 
 Exit codes: 0 = end session normally (always).
 Reads all config from vorbit-learning-rules.md — nothing hardcoded.
-Per-learning dedup: SEEN_FILE stores session_id TAB flow TAB msg_index.
+Per-learning dedup: SEEN_DIR/<session_id>.tsv stores flow TAB msg_index.
+Incremental scan: CHECKPOINT_DIR/<session_id>.json stores the byte offset and
+message index reached, so each Stop parses only lines appended since the last.
 Flows 1 and 1b write context to pending-capture.md for the next session to process.
 Flow 2 writes classified learnings directly to unprocessed-corrections.md.
 """
 
+import hashlib
 import json
 import os
-import re
-import subprocess
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
-from typing import Any
-
-
-def extract_text(content: Any) -> str:
-    """Extract plain text from message content (string or array of blocks)."""
-    if isinstance(content, str):
-        return content
-    if isinstance(content, list):
-        return "\n".join(
-            block.get("text", "") for block in content if block.get("type") == "text"
-        )
-    return ""
-
-
-def read_comment(rules_source_text: str, comment_name: str) -> str:
-    """Read value from <!-- name: value --> comment in file text."""
-    match = re.search(rf"<!--\s*{re.escape(comment_name)}:\s*(.*?)\s*-->", rules_source_text)
-    return match.group(1) if match else ""
-
-
-def load_transcript(transcript_path) -> list[dict[str, Any]]:
-    """Load JSONL transcript, skip invalid lines."""
-    messages: list[dict[str, Any]] = []
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+# Shared hook helpers live in <plugin root>/hooks/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "hooks" / "scripts"))
+
+from _daemon_client import forward_to_daemon  # noqa: E402
+from _learn_utils import (  # noqa: E402
+    JsonlReader,
+    KeywordMatcher,
+    build_keyword_matcher,
+    compact_session_state,
+    extract_text,
+    keyword_candidate,
+    load_seen,
+    mark_seen,
+    migrate_seen_file,
+    projects_dir_of,
+    read_comment,
+)
+from _telemetry import HookTimer, timed  # noqa: E402
+from _utils import parse_hook_payload, resolve_project_root  # noqa: E402
+
+# Bytes hashed before the checkpoint offset to detect a rewritten transcript
+FINGERPRINT_BYTES = 256
+
+# Opportunistic compaction of per-session state (seen shards, checkpoints)
+COMPACT_INTERVAL_SECONDS = 24 * 60 * 60
+COMPACT_BUDGET_SECONDS = 0.2
+
+
+@timed("io")
+def load_checkpoint(checkpoint_file: Path) -> dict[str, Any]:
+    """Return the saved scan position for a transcript, or {} if none/corrupt."""
     try:
-        with open(transcript_path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    messages.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
+        checkpoint = json.loads(Path(checkpoint_file).read_text())
     except Exception:
-        pass
-    return messages
+        return {}
+    return checkpoint if isinstance(checkpoint, dict) else {}
 
 
-def load_seen(seen_file: Path, session_id: str, flow: str) -> set[int]:
-    """Return set of message indices already captured for this session+flow."""
-    seen = set()
+@timed("io")
+def save_checkpoint(checkpoint_file: Path, checkpoint: dict[str, Any]) -> None:
+    """Atomically write the scan position (tmp file + rename)."""
+    p = Path(checkpoint_file)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint))
+    os.replace(tmp, p)
+
+
+def _fingerprint(f, offset: int) -> str:
+    """Hash of the bytes just before offset — detects a rewritten prefix."""
+    start = max(0, offset - FINGERPRINT_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def resume_offset(f: BinaryIO, checkpoint: dict[str, Any]) -> int:
+    """Byte offset to resume from, or 0 if the transcript shrank or was rewritten.
+
+    Resuming requires the same inode, a file at least as long as the
+    checkpoint offset, and unchanged bytes just before it.
+    """
+    offset = checkpoint.get("offset", 0)
+    st = os.fstat(f.fileno())
+    if (
+        isinstance(offset, int)
+        and 0 < offset <= st.st_size
+        and checkpoint.get("inode") == st.st_ino
+        and checkpoint.get("fingerprint") == _fingerprint(f, offset)
+    ):
+        return offset
+    return 0
+
+
+@timed("io")
+def fully_scanned(transcript_path: Path, checkpoint: dict[str, Any]) -> bool:
+    """True if the checkpoint already covers the whole transcript (nothing appended)."""
     try:
-        with open(seen_file) as f:
-            for line in f:
-                parts = line.strip().split("\t")
-                if len(parts) == 3 and parts[0] == session_id and parts[1] == flow:
-                    try:
-                        seen.add(int(parts[2]))
-                    except ValueError:
-                        pass
-    except FileNotFoundError:
-        pass
-    return seen
+        with open(transcript_path, "rb") as f:
+            offset = resume_offset(f, checkpoint)
+            return offset > 0 and offset == os.fstat(f.fileno()).st_size
+    except OSError:
+        return False
 
 
-def mark_seen(seen_file: Path, session_id: str, flow: str, indices: list[int]) -> None:
-    """Append new seen entries."""
-    Path(seen_file).parent.mkdir(parents=True, exist_ok=True)
-    with open(seen_file, "a") as f:
-        for idx in indices:
-            f.write(f"{session_id}\t{flow}\t{idx}\n")
-
-
-def build_context(messages: list[dict[str, Any]], indices: list[int]) -> str:
+def _learning_fields(content: Any, labels: list[str]) -> Optional[list[str]]:
+    """Values of the three learning labels from the first text block holding all of them."""
+    if isinstance(content, list):
+        texts = [block.get("text", "") for block in content if block.get("type") == "text"]
+    elif isinstance(content, str):
+        texts = [content]
+    else:
+        return None
+    for text in texts:
+        if all(label in text for label in labels):
+            return [text.split(label)[1].split("\n")[0].strip() for label in labels]
+    return None
+
+
+def iter_captures(
+    messages: Iterable[dict[str, Any]],
+    start_index: int,
+    matcher: Optional[KeywordMatcher],
+    labels: Optional[list[str]],
+    state: dict[str, Any],
+) -> Iterator[dict[str, Any]]:
+    """Single streaming pass over transcript entries → keyword hits and learnings.
+
+    Nothing but the rolling context is kept per message: the last assistant
+    text (for a hit's preceding context) and a queue of hits still waiting
+    for their following assistant message. Hits are emitted once that
+    message arrives, or at the end of the stream.
+
+    state["last_assistant"] seeds the preceding context (None = no assistant
+    yet); on exit it holds the last assistant text and state["next_index"]
+    the index after the final entry.
+
+    Yields {"kind": "hit", "idx", "flows", "prev", "text", "next"} and
+    {"kind": "learning", "idx", "root_cause", "rule", "dest"}.
+    """
+    last_assistant: Optional[str] = state.get("last_assistant")
+    pending: list[dict[str, Any]] = []
+    next_index = start_index
+    for idx, msg in enumerate(messages, start_index):
+        next_index = idx + 1
+        if msg.get("type") == "assistant":
+            content = msg.get("message", {}).get("content", "")
+            last_assistant = extract_text(content)[:200]
+            for hit in pending:
+                hit["next"] = last_assistant
+                yield hit
+            pending.clear()
+            if labels:
+                fields = _learning_fields(content, labels)
+                if fields:
+                    root_cause, rule, dest = fields
+                    yield {"kind": "learning", "idx": idx, "root_cause": root_cause, "rule": rule, "dest": dest}
+            continue
+        text = keyword_candidate(msg) if matcher else ""
+        flows = matcher.classify(text) if text else set()
+        if flows:
+            pending.append({"kind": "hit", "idx": idx, "flows": flows, "prev": last_assistant, "text": text, "next": None})
+    yield from pending
+    state["last_assistant"] = last_assistant
+    state["next_index"] = next_index
+
+
+@timed("io")
+def scan_transcript(
+    transcript_path: Path,
+    checkpoint: dict[str, Any],
+    matcher: Optional[KeywordMatcher],
+    labels: Optional[list[str]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], dict[str, Any]]:
+    """Run iter_captures over what was appended since checkpoint → (hits, learnings, next checkpoint).
+
+    Raises OSError if the transcript cannot be read.
+    """
+    hits: list[dict[str, Any]] = []
+    learnings: list[dict[str, Any]] = []
+    with open(transcript_path, "rb") as f:
+        reader = JsonlReader(f, resume_offset(f, checkpoint))
+        if reader.offset == 0:
+            checkpoint = {}
+        start_index = checkpoint.get("next_index", 0)
+        state = {"last_assistant": checkpoint.get("last_assistant")}
+        for capture in iter_captures(reader, start_index, matcher, labels, state):
+            (hits if capture["kind"] == "hit" else learnings).append(capture)
+        next_checkpoint = {
+            "offset": reader.offset,
+            "inode": os.fstat(f.fileno()).st_ino,
+            "fingerprint": _fingerprint(f, reader.offset),
+            "next_index": state["next_index"],
+            "last_assistant": state["last_assistant"],
+        }
+    return hits, learnings, next_checkpoint
+
+
+def build_context(hits: list[dict[str, Any]]) -> str:
     """Build context block: preceding assistant + user message + following assistant."""
     lines: list[str] = []
-    for idx in indices:
-        # Search backward for nearest assistant message (skip progress/tool entries)
-        for i in range(idx - 1, -1, -1):
-            entry: dict[str, Any] = messages[i]
-            if entry.get("type") == "assistant":
-                full: str = extract_text(entry.get("message", {}).get("content", ""))
-                lines.append(f"A: [{full[:200]}]")
-                break
-        user_entry: dict[str, Any] = messages[idx]
-        text: str = extract_text(user_entry.get("message", {}).get("content", ""))
-        lines.append(f"USER: {text}")
-        # Search forward for nearest assistant message (skip progress/tool entries)
-        for i in range(idx + 1, len(messages)):
-            entry = messages[i]
-            if entry.get("type") == "assistant":
-                full = extract_text(entry.get("message", {}).get("content", ""))
-                lines.append(f"A: [{full[:200]}]")
-                break
+    for hit in hits:
+        if hit["prev"] is not None:
+            lines.append(f"A: [{hit['prev']}]")
+        lines.append(f"USER: {hit['text']}")
+        if hit["next"] is not None:
+            lines.append(f"A: [{hit['next']}]")
         lines.append("")
     return "\n".join(lines)
 
 
+@timed("io")
 def write_pending(pending_file: Path, project_root: str, directive_tag: str, directive_msg: str, context: str) -> None:
     """Append a capture block to pending-capture.md for the next session to process."""
     p = Path(pending_file)
     p.parent.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime("%d %b %Y")
+    timestamp = time.strftime("%d %b %Y")
     block = (
         f"## [{directive_tag}] | Project: {project_root} | {timestamp}\n"
         f"{directive_msg}\n\n"
@@ -126,8 +232,8 @@ def write_pending(pending_file: Path, project_root: str, directive_tag: str, dir
 
 
 def main():
-    # Consume stdin (stop hook protocol)
-    sys.stdin.read()
+    # Stop hook payload: transcript_path, cwd (session_id = transcript stem)
+    payload = parse_hook_payload(sys.stdin.read())
 
     rules_dir = Path.home() / ".claude" / "rules"
     rules_file = rules_dir / "vorbit-learning.md"
@@ -140,7 +246,17 @@ def main():
 
     rules_source = Path(plugin_root) / "skills" / "learn" / "vorbit-learning-rules.md"
     pending_file = rules_dir / "pending-capture.md"
-    seen_file = rules_dir / ".seen-correction-sessions"
+    seen_dir = rules_dir / ".seen-correction-sessions.d"
+    checkpoint_dir = rules_dir / ".transcript-checkpoints"
+
+    # --- Fast path: nothing appended since the last fully handled Stop ---
+    # The checkpoint is only saved once every flow ran, so setup, housekeeping
+    # and root lookup can all be skipped.
+    payload_transcript = payload.get("transcript_path")
+    if payload_transcript:
+        checkpoint_file = checkpoint_dir / f"{Path(payload_transcript).stem}.json"
+        if fully_scanned(Path(payload_transcript), load_checkpoint(checkpoint_file)):
+            sys.exit(0)
 
     if not rules_source.exists():
         sys.exit(0)
@@ -153,8 +269,10 @@ def main():
 
     # --- One-Time Setup: symlink rules file into ~/.claude/rules/ ---
     try:
-        content = rules_file.read_text() if rules_file.exists() else ""
-        if rules_marker not in content:
+        # A symlink already pointing at rules_source needs no read
+        linked = rules_file.is_symlink() and os.readlink(rules_file) == str(rules_source)
+        content = "" if linked or not rules_file.exists() else rules_file.read_text()
+        if not linked and rules_marker not in content:
             rules_dir.mkdir(parents=True, exist_ok=True)
             if rules_file.exists() or rules_file.is_symlink():
                 rules_file.unlink()
@@ -162,15 +280,26 @@ def main():
     except Exception:
         pass
 
-    # --- Get project root ---
+    # --- Housekeeping: migrate legacy seen file, compact per-session state ---
+    # Compaction runs at most once per COMPACT_INTERVAL_SECONDS. Its deletions are
+    # time-boxed and the stamp is only touched once a pass completes, so a large
+    # backlog is worked off across several Stops.
     try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True, text=True
-        )
-        project_root = result.stdout.strip() if result.returncode == 0 else os.getcwd()
+        migrate_seen_file(rules_dir / ".seen-correction-sessions", seen_dir)
+        stamp = rules_dir / ".last-session-compaction"
+        if not stamp.exists() or time.time() - stamp.stat().st_mtime > COMPACT_INTERVAL_SECONDS:
+            removed = compact_session_state(
+                [seen_dir, checkpoint_dir],
+                projects_dir_of(payload_transcript),
+                deadline=time.monotonic() + COMPACT_BUDGET_SECONDS,
+            )
+            if removed is not None:
+                stamp.touch()
     except Exception:
-        project_root = os.getcwd()
+        pass
+
+    # --- Get project root ---
+    project_root = resolve_project_root(payload.get("cwd") or os.getcwd())
 
     # --- Skip during active loop ---
     loop_state_path = Path(project_root) / ".claude" / ".loop-state.json"
@@ -183,142 +312,96 @@ def main():
         pass
 
     # --- Locate transcript ---
-    project_slug = project_root.replace("/", "-")
-    sessions_dir = Path.home() / ".claude" / "projects" / project_slug
-
-    try:
-        transcripts = sorted(
-            sessions_dir.glob("*.jsonl"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True
-        )
-    except Exception:
-        sys.exit(0)
+    # The payload names this session's transcript; guessing the newest file in
+    # the project's sessions dir is only a fallback (slow with many sessions,
+    # wrong when two sessions run at once).
+    if payload_transcript and Path(payload_transcript).is_file():
+        transcript_path = Path(payload_transcript)
+    else:
+        project_slug = project_root.replace("/", "-")
+        sessions_dir = projects_dir_of(None) / project_slug
+
+        try:
+            transcripts = sorted(
+                sessions_dir.glob("*.jsonl"),
+                key=lambda p: p.stat().st_mtime,
+                reverse=True
+            )
+        except Exception:
+            sys.exit(0)
 
-    if not transcripts:
-        sys.exit(0)
+        if not transcripts:
+            sys.exit(0)
 
-    transcript_path = transcripts[0]
+        transcript_path = transcripts[0]
     session_id = transcript_path.stem
 
-    messages = load_transcript(transcript_path)
-    if not messages:
+    # --- Scan: one streaming pass feeds Flows 1, 1b and 2 ---
+    # Keyword matcher for Flows 1/1b, learning labels for Flow 2
+    matcher = build_keyword_matcher(rules_text)
+    field_names = [f.strip() for f in read_comment(rules_text, "learning-fields").split(",")]
+    labels = [name + ": " for name in field_names[:3]] if len(field_names) >= 3 else None
+
+    # Parse only what was appended since the last Stop. The checkpoint is
+    # saved only once every flow has handled this chunk — Flows 1/1b exit
+    # early, so their chunk is rescanned next time and dedup skips the repeats.
+    checkpoint_file = checkpoint_dir / f"{session_id}.json"
+    checkpoint = load_checkpoint(checkpoint_file)
+    try:
+        hits, learnings, next_checkpoint = scan_transcript(transcript_path, checkpoint, matcher, labels)
+    except OSError:
         sys.exit(0)
 
-    # --- FLOW 1: Correction keyword detection ---
-    # Per-learning dedup: session_id TAB f1 TAB msg_index
-    keywords_csv = read_comment(rules_text, "correction-keywords")
-    if keywords_csv:
-        keywords = [k.strip() for k in keywords_csv.split(",") if k.strip()]
-        keyword_pattern = r"\b(" + "|".join(re.escape(k) for k in keywords) + r")\b"
-
-        all_matching: list[int] = []
-        for idx, msg in enumerate(messages):
-            if msg.get("type") != "user":
-                continue
-            text = extract_text(msg.get("message", {}).get("content", ""))
-            if not text or len(text) > 500:
-                continue
-            if "<teammate-message" in text:
-                continue
-            if re.search(keyword_pattern, text, re.IGNORECASE):
-                all_matching.append(idx)
-
-        seen_f1 = load_seen(seen_file, session_id, "f1")
-        new_indices = [i for i in all_matching if i not in seen_f1]
-
-        if new_indices:
-            context = build_context(messages, new_indices)
-            write_pending(
-                pending_file,
-                project_root,
-                "VORBIT:CORRECTION-CAPTURE",
-                "Stop hook found correction keywords. "
-                "Run the Stop-Hook Correction Flow from vorbit-learning-rules.md.",
-                context,
-            )
-            mark_seen(seen_file, session_id, "f1", new_indices)
-            sys.exit(0)
+    if not hits and not learnings:
+        save_checkpoint(checkpoint_file, next_checkpoint)
+        sys.exit(0)
 
-    # --- FLOW 1b: Voluntary keyword detection ---
-    # Per-learning dedup: session_id TAB fv TAB msg_index
-    voluntary_csv = read_comment(rules_text, "voluntary-keywords")
-    if voluntary_csv:
-        phrases = [p.strip() for p in voluntary_csv.split(",") if p.strip()]
-        voluntary_pattern = r"\b(" + "|".join(re.escape(p) for p in phrases) + r")\b"
-
-        all_voluntary: list[int] = []
-        for idx, msg in enumerate(messages):
-            if msg.get("type") != "user":
-                continue
-            text = extract_text(msg.get("message", {}).get("content", ""))
-            if not text or len(text) > 500:
-                continue
-            if "<teammate-message" in text:
-                continue
-            if re.search(voluntary_pattern, text, re.IGNORECASE):
-                all_voluntary.append(idx)
-
-        seen_fv = load_seen(seen_file, session_id, "fv")
-        new_voluntary = [i for i in all_voluntary if i not in seen_fv]
-
-        if new_voluntary:
-            context = build_context(messages, new_voluntary)
-            write_pending(
-                pending_file,
-                project_root,
-                "VORBIT:VOLUNTARY-CAPTURE",
-                "Stop hook found voluntary capture keywords. "
-                "Run the Stop-Hook Voluntary Capture Flow from vorbit-learning-rules.md.",
-                context,
-            )
-            mark_seen(seen_file, session_id, "fv", new_voluntary)
-            sys.exit(0)
+    # --- Seen entries for every flow of this session, read once ---
+    seen = load_seen(seen_dir, session_id)
 
-    # --- FLOW 2: Self-discovered learning extraction ---
-    # Per-learning dedup: session_id TAB f2 TAB msg_index
-    fields_def = read_comment(rules_text, "learning-fields")
-    if not fields_def:
+    # --- FLOW 1: Correction keyword detection ---
+    # Per-learning dedup: f1 TAB msg_index
+    seen_f1 = seen.get("f1", set())
+    new_corrections = [h for h in hits if "f1" in h["flows"] and h["idx"] not in seen_f1]
+    if new_corrections:
+        write_pending(
+            pending_file,
+            project_root,
+            "VORBIT:CORRECTION-CAPTURE",
+            "Stop hook found correction keywords. "
+            "Run the Stop-Hook Correction Flow from vorbit-learning-rules.md.",
+            build_context(new_corrections),
+        )
+        mark_seen(seen_dir, session_id, "f1", [h["idx"] for h in new_corrections])
         sys.exit(0)
 
-    field_names = [f.strip() for f in fields_def.split(",")]
-    if len(field_names) < 3:
+    # --- FLOW 1b: Voluntary keyword detection ---
+    # Per-learning dedup: fv TAB msg_index
+    seen_fv = seen.get("fv", set())
+    new_voluntary = [h for h in hits if "fv" in h["flows"] and h["idx"] not in seen_fv]
+    if new_voluntary:
+        write_pending(
+            pending_file,
+            project_root,
+            "VORBIT:VOLUNTARY-CAPTURE",
+            "Stop hook found voluntary capture keywords. "
+            "Run the Stop-Hook Voluntary Capture Flow from vorbit-learning-rules.md.",
+            build_context(new_voluntary),
+        )
+        mark_seen(seen_dir, session_id, "fv", [h["idx"] for h in new_voluntary])
         sys.exit(0)
 
-    f1_label = field_names[0] + ": "
-    f2_label = field_names[1] + ": "
-    f3_label = field_names[2] + ": "
-
-    seen_f2 = load_seen(seen_file, session_id, "f2")
-    learnings = []
-
-    for idx, msg in enumerate(messages):
-        if msg.get("type") != "assistant":
-            continue
-        if idx in seen_f2:
-            continue
-        content = msg.get("message", {}).get("content", "")
-        texts = []
-        if isinstance(content, list):
-            for block in content:
-                if block.get("type") == "text":
-                    texts.append(block.get("text", ""))
-        elif isinstance(content, str):
-            texts = [content]
-
-        for text in texts:
-            if f1_label in text and f2_label in text and f3_label in text:
-                root_cause = text.split(f1_label)[1].split("\n")[0].strip()
-                rule = text.split(f2_label)[1].split("\n")[0].strip()
-                dest = text.split(f3_label)[1].split("\n")[0].strip()
-                learnings.append({"idx": idx, "root_cause": root_cause, "rule": rule, "dest": dest})
-                break
+    # --- FLOW 2: Self-discovered learning extraction ---
+    # Per-learning dedup: f2 TAB msg_index
+    seen_f2 = seen.get("f2", set())
+    learnings = [entry for entry in learnings if entry["idx"] not in seen_f2]
 
     if not learnings:
+        save_checkpoint(checkpoint_file, next_checkpoint)
         sys.exit(0)
 
     output_file = rules_dir / "unprocessed-corrections.md"
-    mark_seen(seen_file, session_id, "f2", [entry["idx"] for entry in learnings])
+    mark_seen(seen_dir, session_id, "f2", [entry["idx"] for entry in learnings])
 
     learning_blocks = []
     for entry in learnings:
@@ -332,7 +415,7 @@ def main():
         learning_blocks.append(block)
 
     learnings_text = "\n\n".join(learning_blocks)
-    timestamp = datetime.now().strftime("%d %b %Y")
+    timestamp = time.strftime("%d %b %Y")
 
     rules_dir.mkdir(parents=True, exist_ok=True)
     if not output_file.exists():
@@ -352,11 +435,14 @@ def main():
             "---\n\n"
         )
 
+    save_checkpoint(checkpoint_file, next_checkpoint)
     sys.exit(0)
 
 
 if __name__ == "__main__":
-    try:
-        main()
-    except Exception:
-        sys.exit(0)
+    forward_to_daemon("stop_learn_reflect")
+    with HookTimer("stop_learn_reflect"):
+        try:
+            main()
+        except Exception:
+            sys.exit(0)